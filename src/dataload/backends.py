@@ -0,0 +1,204 @@
+"""
+Created: 16 Oct 2026
+Pluggable storage backends behind db_connect. A backend is a pair of factories: a client
+(built from the mongo config, in place of MongoClient) and a store (built from the client,
+in place of Arctic). The "local" backend keeps libraries in memory, or in a local directory,
+with the read/write/append/list semantics of an Arctic VersionStore, so the helpers in
+database.py can be unit tested and benchmarked without a MongoDB cluster.
+
+Select it with the config keys "backend" and (optionally) "local_path":
+>>> mongo_config = {"backend": "local", "local_path": "/tmp/arctic"}
+>>> db_arctic_read(mongo_config=mongo_config, library="security_data", symbol="TSLA")
+"""
+import os
+import pickle
+import threading
+from typing import Callable, Dict, List, Tuple
+from urllib.parse import quote, unquote
+
+import pandas as pd
+from arctic import VERSION_STORE
+from arctic.store.versioned_item import VersionedItem
+
+
+class LocalClient:
+    """
+    Stand-in for MongoClient: holds the storage of the local backend, a dict in memory
+    (shared by every store opened on this client) or a directory on disk.
+
+    Args:
+        path: Directory to persist libraries in, default None keeps them in memory
+        storage: Existing in-memory storage (library -> symbol -> (version, frame)) to share
+    """
+
+    def __init__(self, path: str = None, storage: dict = None):
+        self.path = path
+        self.storage = {} if storage is None else storage
+        self.PORT = None
+        if path is not None:
+            os.makedirs(path, exist_ok=True)
+
+    @classmethod
+    def from_config(cls, mongo_config: dict, **kwargs):
+        return cls(path=mongo_config.get("local_path"))
+
+    def close(self) -> None:
+        pass
+
+
+class LocalLibrary:
+    """Library with VersionStore semantics, only the latest version of a symbol is kept
+    (as with Arctic's default prune_previous_version=True)"""
+
+    def __init__(self, name: str, client: LocalClient):
+        self.name = name
+        self._client = client
+        self._lock = threading.RLock()
+        self._path = None if client.path is None \
+            else os.path.join(client.path, quote(name, safe=""))
+        self._symbols = None if self._path is not None else client.storage[name]
+
+    def _symbol_path(self, symbol: str) -> str:
+        return os.path.join(self._path, quote(symbol, safe="") + ".pkl")
+
+    def _load(self, symbol: str) -> Tuple[int, pd.DataFrame]:
+        if self._path is None:
+            return self._symbols[symbol]
+        with open(self._symbol_path(symbol), "rb") as fp:
+            return pickle.load(fp)
+
+    def _save(self, symbol: str, version: int, data: pd.DataFrame) -> None:
+        if self._path is None:
+            self._symbols[symbol] = (version, data)
+            return
+        path = self._symbol_path(symbol)
+        with open(path + ".tmp", "wb") as fp:
+            pickle.dump((version, data), fp, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(path + ".tmp", path)
+
+    def has_symbol(self, symbol: str) -> bool:
+        if self._path is None:
+            return symbol in self._symbols
+        return os.path.exists(self._symbol_path(symbol))
+
+    def list_symbols(self) -> List[str]:
+        if self._path is None:
+            return sorted(self._symbols)
+        return sorted(unquote(f[:-len(".pkl")]) for f in os.listdir(self._path)
+                      if f.endswith(".pkl"))
+
+    def read(self, symbol: str, as_of: int = None, date_range=None, **kwargs) -> VersionedItem:
+        """Read the latest version, optionally restricted to a DateRange"""
+        with self._lock:
+            version, data = self._load(symbol)
+        assert as_of is None or as_of == version, \
+            f"Only the latest version ({version}) of {symbol} is kept by the local backend"
+        if date_range is not None:
+            data = data.loc[date_range.start:date_range.end]
+        return VersionedItem(symbol=symbol, library=self.name, data=data.copy(),
+                             version=version, metadata=None)
+
+    def read_metadata(self, symbol: str, **kwargs) -> VersionedItem:
+        with self._lock:
+            version, _ = self._load(symbol)
+        return VersionedItem(symbol=symbol, library=self.name, data=None, version=version,
+                             metadata=None)
+
+    def get_info(self, symbol: str) -> dict:
+        """Row count and date range of the latest version"""
+        with self._lock:
+            version, data = self._load(symbol)
+        has_dates = isinstance(data.index, pd.DatetimeIndex) and len(data) > 0
+        return {"rows": len(data),
+                "start": data.index.min() if has_dates else None,
+                "end": data.index.max() if has_dates else None}
+
+    def write(self, symbol: str, data: pd.DataFrame, **kwargs) -> VersionedItem:
+        with self._lock:
+            version = self._load(symbol)[0] + 1 if self.has_symbol(symbol) else 1
+            self._save(symbol, version, data.copy())
+        return VersionedItem(symbol=symbol, library=self.name, data=None, version=version,
+                             metadata=None)
+
+    def append(self, symbol: str, data: pd.DataFrame, upsert: bool = True,
+               **kwargs) -> VersionedItem:
+        with self._lock:
+            if not self.has_symbol(symbol):
+                assert upsert, f"{symbol} does not exist in library: {self.name}"
+                return self.write(symbol, data)
+            version, stored = self._load(symbol)
+            self._save(symbol, version + 1, pd.concat([stored, data]))
+        return VersionedItem(symbol=symbol, library=self.name, data=None,
+                             version=version + 1, metadata=None)
+
+    def delete(self, symbol: str) -> None:
+        with self._lock:
+            if self._path is None:
+                self._symbols.pop(symbol, None)
+            elif self.has_symbol(symbol):
+                os.remove(self._symbol_path(symbol))
+
+
+class LocalArctic:
+    """Stand-in for the Arctic store over a LocalClient"""
+    library_class = LocalLibrary
+
+    def __init__(self, client: LocalClient):
+        self._client = client
+        self._libraries: Dict[str, LocalLibrary] = {}
+        self._lock = threading.Lock()
+
+    def list_libraries(self) -> List[str]:
+        if self._client.path is None:
+            return sorted(self._client.storage)
+        return sorted(unquote(d) for d in os.listdir(self._client.path)
+                      if os.path.isdir(os.path.join(self._client.path, d)))
+
+    def library_exists(self, library: str) -> bool:
+        if self._client.path is None:
+            return library in self._client.storage
+        return os.path.isdir(os.path.join(self._client.path, quote(library, safe="")))
+
+    def initialize_library(self, library: str, lib_type: str = VERSION_STORE,
+                           **kwargs) -> None:
+        if self._client.path is None:
+            self._client.storage.setdefault(library, {})
+        else:
+            os.makedirs(os.path.join(self._client.path, quote(library, safe="")),
+                        exist_ok=True)
+
+    def reload_cache(self) -> None:
+        pass
+
+    def __getitem__(self, library: str) -> LocalLibrary:
+        assert self.library_exists(library), \
+            f"\n Library: '{library}' does not exist in local store"
+        with self._lock:
+            if library not in self._libraries:
+                self._libraries[library] = self.library_class(name=library,
+                                                               client=self._client)
+            return self._libraries[library]
+
+
+# backend name -> (client factory taking the mongo config, store factory taking the client)
+_BACKENDS: Dict[str, Tuple[Callable, Callable]] = {
+    "local": (LocalClient.from_config, LocalArctic),
+}
+
+
+def register_backend(name: str, client_factory: Callable, store_factory: Callable) -> None:
+    """Register a backend selectable with mongo_config["backend"] = name
+
+    Args:
+        name: Name of the backend
+        client_factory: Called as client_factory(mongo_config, maxPoolSize=, minPoolSize=)
+        store_factory: Called as store_factory(client), returning an Arctic-like store
+    """
+    _BACKENDS[name] = (client_factory, store_factory)
+
+
+def get_backend(name: str) -> Tuple[Callable, Callable]:
+    """Client and store factories of a registered backend"""
+    if name not in _BACKENDS:
+        raise KeyError(f"Unknown backend '{name}', registered backends: {sorted(_BACKENDS)}")
+    return _BACKENDS[name]
@@ -0,0 +1,254 @@
+"""
+Created: 16 Oct 2026
+Local on-disk read-through cache for Arctic reads: frames are stored column by column as
+uncompressed numpy arrays (.npz, read back without pickle), keyed by store, library,
+symbol, Arctic version and read query, with size-bounded LRU eviction and hit/miss counters
+"""
+import hashlib
+import json
+import os
+import threading
+import weakref
+from time import time
+from typing import Dict, List, Optional, Union
+
+import numpy as np
+import pandas as pd
+
+DEFAULT_MAX_BYTES = 2 * 1024 ** 3  # 2GB
+_MANIFEST = "manifest.json"
+
+# every live cache, so writes/appends through database.py can invalidate them
+_CACHES = weakref.WeakSet()
+
+
+def _query_key(store: str, library: str, symbol: str, start=None, end=None,
+               columns: List[str] = None) -> str:
+    """Identifier for a (store, library, symbol, read query), independent of version"""
+    query = [store, library, symbol,
+             None if start is None else str(pd.Timestamp(start)),
+             None if end is None else str(pd.Timestamp(end)),
+             None if columns is None else list(columns)]
+    return hashlib.sha1(json.dumps(query).encode()).hexdigest()
+
+
+def _to_array(values: Union[pd.Series, pd.Index]) -> Optional[np.ndarray]:
+    """
+    Values as an array np.load reads back without pickle: numpy dtypes as they are, object
+    values only if they are all strings. None for anything else (extension dtypes such as
+    categorical or tz-aware datetimes, mixed objects), which the cache cannot restore exactly
+    """
+    if not isinstance(values.dtype, np.dtype):
+        return None
+    if values.dtype != object:
+        return values.to_numpy()
+    if pd.api.types.infer_dtype(values, skipna=False) in ("string", "empty"):
+        return values.to_numpy(dtype=str)
+    return None
+
+
+def _encode_label(label):
+    """Column label as JSON (tuples as lists), TypeError if it would not come back as is"""
+    if isinstance(label, tuple):
+        return [_encode_label(level) for level in label]
+    if isinstance(label, np.generic):
+        label = label.item()
+    if label is None or isinstance(label, (str, int, float, bool)):
+        return label
+    raise TypeError(f"column label {label!r} of type {type(label).__name__} is not cacheable")
+
+
+def _decode_columns(entry: dict) -> pd.Index:
+    labels = [tuple(label) if isinstance(label, list) else label
+              for label in entry["columns"]]
+    if entry["columns_multi"]:
+        return pd.MultiIndex.from_tuples(labels, names=entry["column_names"])
+    return pd.Index(labels, name=entry["column_names"][0], tupleize_cols=False)
+
+
+class FrameCache:
+    """
+    Persistent cache of dataframes read from Arctic. An entry records the Arctic version
+    it was read at, a read for the same query is served from local disk until the symbol is
+    written/appended through database.py (or invalidated explicitly), when the entry is
+    dropped and the next read goes back to Mongo. Frames with columns or labels that would
+    not round-trip exactly (see put) are not cached. Entries are keyed by store, the
+    identifier of the store read from (see dataload.connection.store_key).
+
+    Args:
+        cache_dir: Directory holding the cached frames and the manifest
+        max_bytes: Size bound of the cache on disk, least recently used entries are evicted
+            once it is exceeded
+    """
+
+    def __init__(self, cache_dir: str, max_bytes: int = DEFAULT_MAX_BYTES):
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._lock = threading.RLock()
+
+        os.makedirs(cache_dir, exist_ok=True)
+        manifest_path = os.path.join(cache_dir, _MANIFEST)
+        if os.path.exists(manifest_path):
+            with open(manifest_path, "r") as fp:
+                self._entries: Dict[str, dict] = json.load(fp)
+        else:
+            self._entries = {}
+        _CACHES.add(self)
+
+    @property
+    def size_bytes(self) -> int:
+        return sum(entry["bytes"] for entry in self._entries.values())
+
+    def stats(self) -> dict:
+        """Hit/miss counters and current size of the cache"""
+        lookups = self.hits + self.misses
+        return {"hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+                "evictions": self.evictions,
+                "entries": len(self._entries),
+                "bytes": self.size_bytes}
+
+    def _save_manifest(self) -> None:
+        if not os.path.isdir(self.cache_dir):  # cache directory removed underneath us
+            return
+        manifest_path = os.path.join(self.cache_dir, _MANIFEST)
+        with open(manifest_path + ".tmp", "w") as fp:
+            json.dump(self._entries, fp)
+        os.replace(manifest_path + ".tmp", manifest_path)
+
+    def _remove(self, key: str) -> None:
+        entry = self._entries.pop(key)
+        path = os.path.join(self.cache_dir, entry["file"])
+        if os.path.exists(path):
+            os.remove(path)
+
+    def get(self, store: str, library: str, symbol: str, start=None, end=None,
+            columns: List[str] = None) -> Optional[pd.DataFrame]:
+        """Return the cached frame for the read query, or None on a miss"""
+        key = _query_key(store, library, symbol, start, end, columns)
+        # the file is read under the lock, so a concurrent put/eviction cannot remove it
+        with self._lock:
+            entry = self._entries.get(key)
+            path = None if entry is None else os.path.join(self.cache_dir, entry["file"])
+            if path is None or not os.path.exists(path):
+                self.misses += 1
+                return None
+            entry["last_access"] = time()
+            self.hits += 1
+            with np.load(path, allow_pickle=False) as arrays:
+                columns = {i: arrays[f"c{i}"] for i in range(len(entry["columns"]))}
+                index_values = arrays["__index__"]
+
+        index = pd.Index(index_values, name=entry["index_name"],
+                         dtype=object if entry["index_dtype"] == "object" else None)
+        if entry["index_freq"] is not None:
+            index = pd.DatetimeIndex(index, freq=entry["index_freq"])
+        if entry["index_tz"] is not None:
+            index = index.tz_localize("UTC").tz_convert(entry["index_tz"])
+        frame = pd.DataFrame({i: values.astype(object) if dtype == "object" else values
+                              for (i, values), dtype in zip(columns.items(), entry["dtypes"])},
+                             index=index, columns=list(columns))
+        frame.columns = _decode_columns(entry)
+        return frame
+
+    def version(self, store: str, library: str, symbol: str, start=None, end=None,
+                columns: List[str] = None) -> Optional[int]:
+        """Arctic version the cached frame for the read query was read at"""
+        entry = self._entries.get(_query_key(store, library, symbol, start, end, columns))
+        return None if entry is None else entry["version"]
+
+    def put(self, store: str, library: str, symbol: str, version: Optional[int],
+            frame: pd.DataFrame, start=None, end=None, columns: List[str] = None) -> bool:
+        """
+        Store the frame read at the given Arctic version, replacing older versions. Returns
+        False, caching nothing, if the frame would not come back as is: columns (or index)
+        of extension dtypes, e.g. categorical, or of objects other than strings, column
+        labels other than str/int/float/bool/None or tuples of them, or a MultiIndex
+        """
+        key = _query_key(store, library, symbol, start, end, columns)
+        file_name = f"{key}_v{version}.npz"
+        path = os.path.join(self.cache_dir, file_name)
+
+        index = frame.index
+        index_tz = str(index.tz) if getattr(index, "tz", None) is not None else None
+        if index_tz is not None:
+            index = index.tz_convert("UTC").tz_localize(None)
+        arrays = {f"c{i}": _to_array(frame.iloc[:, i]) for i in range(frame.shape[1])}
+        arrays["__index__"] = None if isinstance(index, pd.MultiIndex) else _to_array(index)
+        try:
+            labels = [_encode_label(label) for label in frame.columns]
+        except TypeError:
+            return False
+        if any(values is None for values in arrays.values()):
+            return False
+
+        # written under a unique name and moved into place, readers never see a partial file
+        tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(tmp_path, "wb") as fp:
+            np.savez(fp, **arrays)
+        os.replace(tmp_path, path)
+
+        with self._lock:
+            if key in self._entries and self._entries[key]["file"] != file_name:
+                self._remove(key)
+            self._entries[key] = {"file": file_name,
+                                  "store": store,
+                                  "library": library,
+                                  "symbol": symbol,
+                                  "version": version,
+                                  "columns": labels,
+                                  "columns_multi": isinstance(frame.columns, pd.MultiIndex),
+                                  "column_names": list(frame.columns.names),
+                                  "dtypes": [str(dtype) for dtype in frame.dtypes],
+                                  "index_name": frame.index.name,
+                                  "index_dtype": str(frame.index.dtype),
+                                  "index_tz": index_tz,
+                                  "index_freq": getattr(frame.index, "freqstr", None),
+                                  "bytes": os.path.getsize(path),
+                                  "last_access": time()}
+            self._evict()
+            self._save_manifest()
+        return True
+
+    def _evict(self) -> None:
+        """Drop least recently used entries until the cache fits in max_bytes"""
+        total = self.size_bytes
+        for key in sorted(self._entries, key=lambda k: self._entries[k]["last_access"]):
+            if total <= self.max_bytes:
+                break
+            total -= self._entries[key]["bytes"]
+            self._remove(key)
+            self.evictions += 1
+
+    def invalidate(self, store: str = None, library: str = None, symbol: str = None) -> int:
+        """Drop the entries matching store/library/symbol (None matches anything),
+        returns the number of entries dropped"""
+        with self._lock:
+            keys = [key for key, entry in self._entries.items()
+                    if (store is None or entry["store"] == store) and
+                    (library is None or entry["library"] == library) and
+                    (symbol is None or entry["symbol"] == symbol)]
+            for key in keys:
+                self._remove(key)
+            if keys:
+                self._save_manifest()
+            return len(keys)
+
+    def clear(self) -> None:
+        """Drop every entry"""
+        self.invalidate()
+
+    def flush(self) -> None:
+        """Persist the access times of the entries, so LRU order survives a restart"""
+        with self._lock:
+            self._save_manifest()
+
+
+def invalidate_cached_symbol(store: str, library: str, symbol: str) -> None:
+    """Drop a symbol from every live cache, called after a write/append bumps its version"""
+    for cache in list(_CACHES):
+        cache.invalidate(store=store, library=library, symbol=symbol)
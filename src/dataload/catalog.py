@@ -0,0 +1,182 @@
+"""
+Created: 16 Oct 2026
+Cached catalog of library/symbol metadata (symbols, row counts, date ranges, versions) per
+mongo config, refreshed lazily once a TTL expires, so symbol discovery and validation are
+dictionary lookups instead of round-trips to the server
+"""
+import threading
+from time import time
+from typing import Dict, List, Optional, Set, Tuple, Union
+
+import pandas as pd
+from arctic.chunkstore.chunkstore import ChunkStore
+from arctic.store.versioned_item import VersionedItem
+from arctic.tickstore.tickstore import TickStore
+
+DEFAULT_TTL = 300  # seconds
+
+
+class MetadataCatalog:
+    """
+    Metadata of the libraries and symbols behind one mongo config. Each entry is fetched on
+    first use and re-fetched once older than ttl seconds; writes/appends made through
+    database.py update the catalog directly. One catalog is kept per pooled connection, see
+    dataload.connection.get_catalog.
+
+    Args:
+        mongo_config: Dict-like object with the keys ["mongo_user", "mongo_pwd", "url_cluster"]
+        registry: ConnectionRegistry the library handles are taken from
+        ttl: Seconds before a cached entry is considered stale
+    """
+
+    def __init__(self, mongo_config: dict, registry, ttl: float = DEFAULT_TTL):
+        self.mongo_config = mongo_config
+        self.registry = registry
+        self.ttl = ttl
+        self._lock = threading.RLock()
+        self._libraries_fetched = None
+        self._symbols: Dict[str, Tuple[float, Set[str]]] = {}
+        self._info: Dict[Tuple[str, str], Tuple[float, dict]] = {}
+
+    def _is_fresh(self, fetched: Optional[float]) -> bool:
+        return fetched is not None and time() - fetched < self.ttl
+
+    def libraries(self, refresh: bool = False) -> List[str]:
+        """Names of the libraries in the Arctic store"""
+        with self._lock:
+            refresh = refresh or not self._is_fresh(self._libraries_fetched)
+            names = self.registry.list_libraries(mongo_config=self.mongo_config,
+                                                 refresh=refresh)
+            if refresh:
+                self._libraries_fetched = time()
+            return names
+
+    def has_library(self, library: str) -> bool:
+        """Whether the library exists, re-listing once if it is not in the cached list"""
+        return library in self.libraries() or library in self.libraries(refresh=True)
+
+    def _symbol_set(self, library: str, refresh: bool = False) -> Set[str]:
+        with self._lock:
+            entry = self._symbols.get(library)
+            if refresh or entry is None or not self._is_fresh(entry[0]):
+                lib = self.registry.get_library(mongo_config=self.mongo_config,
+                                                lib_name=library)
+                entry = (time(), set(lib.list_symbols()))
+                self._symbols[library] = entry
+            return entry[1]
+
+    def symbols(self, library: str, refresh: bool = False) -> List[str]:
+        """Sorted symbols in the library"""
+        return sorted(self._symbol_set(library, refresh=refresh))
+
+    def has_symbol(self, library: str, symbol: str) -> bool:
+        """Whether the symbol exists, re-listing once if it is not in the cached set"""
+        return symbol in self._symbol_set(library) or \
+            symbol in self._symbol_set(library, refresh=True)
+
+    def symbol_info(self, library: str, symbol: str, refresh: bool = False) -> dict:
+        """
+        Metadata of a symbol: dict with keys "version", "rows", "start" and "end" (None where
+        the store does not report them cheaply, e.g. the date range of a VersionStore symbol
+        not written through the helpers in this process). What was recorded for a version is
+        kept through a refresh that finds the same version, as the store may not report it
+        """
+        key = (library, symbol)
+        with self._lock:
+            entry = self._info.get(key)
+            if refresh or entry is None or not self._is_fresh(entry[0]):
+                lib = self.registry.get_library(mongo_config=self.mongo_config,
+                                                lib_name=library)
+                info = _fetch_symbol_info(lib, symbol)
+                if entry is not None and info["version"] is not None and \
+                        info["version"] == entry[1]["version"]:
+                    info = {name: entry[1][name] if value is None else value
+                            for name, value in info.items()}
+                entry = (time(), info)
+                self._info[key] = entry
+            return dict(entry[1])
+
+    def record_write(self, library: str, symbol: str, df: pd.DataFrame,
+                     version: int = None, is_append: bool = False) -> None:
+        """Update the cached metadata after df was written (or appended) to the symbol"""
+        has_dates = isinstance(df.index, pd.DatetimeIndex) and len(df) > 0
+        with self._lock:
+            if library in self._symbols:
+                self._symbols[library][1].add(symbol)
+
+            if not is_append:
+                info = {"version": version,
+                        "rows": len(df),
+                        "start": df.index.min() if has_dates else None,
+                        "end": df.index.max() if has_dates else None}
+            else:
+                entry = self._info.get((library, symbol))
+                if entry is None:
+                    return  # nothing known about the stored rows, fetched on next use
+                info = dict(entry[1], version=version)
+                if info["rows"] is not None:
+                    info["rows"] += len(df)
+                if has_dates and info["end"] is not None:
+                    info["end"] = max(info["end"], df.index.max())
+                if has_dates and info["start"] is not None:
+                    info["start"] = min(info["start"], df.index.min())
+            self._info[(library, symbol)] = (time(), info)
+
+    def invalidate(self, library: str = None, symbol: str = None) -> None:
+        """Drop cached entries for a symbol, a library, or everything (None)"""
+        with self._lock:
+            if library is None:
+                self._libraries_fetched = None
+                self._symbols.clear()
+                self._info.clear()
+                return
+            if symbol is None:
+                self._symbols.pop(library, None)
+            self._info = {key: value for key, value in self._info.items()
+                          if key[0] != library or (symbol is not None and key[1] != symbol)}
+
+
+def _fetch_symbol_info(lib, symbol: str) -> dict:
+    """Query the store for the metadata of a symbol"""
+    info = {"version": None, "rows": None, "start": None, "end": None}
+    if isinstance(lib, ChunkStore):
+        stored = lib.get_info(symbol)
+        info["rows"] = stored.get("len")
+        info["start"], info["end"] = stored_date_range(lib, symbol)
+        return info
+    if isinstance(lib, TickStore):
+        info["start"], info["end"] = stored_date_range(lib, symbol)
+        return info
+
+    if hasattr(lib, "read_metadata"):
+        metadata = lib.read_metadata(symbol)
+        if isinstance(metadata, VersionedItem):
+            info["version"] = metadata.version
+    if hasattr(lib, "get_info"):
+        stored = lib.get_info(symbol)
+        info["rows"] = stored.get("rows", stored.get("len"))
+        info["start"], info["end"] = stored.get("start"), stored.get("end")
+    return info
+
+
+def _chunk_bound(bound: Union[bytes, str]) -> pd.Timestamp:
+    """ChunkStore chunk bounds are ascii encoded strings (DateChunker.chunk_to_str)"""
+    return pd.Timestamp(bound.decode("ascii") if isinstance(bound, bytes) else bound)
+
+
+def stored_date_range(lib, symbol: str) -> Tuple[Optional[pd.Timestamp],
+                                                 Optional[pd.Timestamp]]:
+    """
+    Date range of a ChunkStore or TickStore symbol without reading any data: the bounds of
+    the first and last chunk of a ChunkStore (so it spans whole chunks), min_date/max_date of
+    a TickStore as naive local time (as Arctic reads naive datetimes). (None, None) if a
+    ChunkStore symbol has no chunks
+    """
+    if isinstance(lib, TickStore):
+        return (pd.Timestamp(lib.min_date(symbol)).tz_localize(None),
+                pd.Timestamp(lib.max_date(symbol)).tz_localize(None))
+    first = next(lib.get_chunk_ranges(symbol), None)
+    if first is None:
+        return None, None
+    last = next(lib.get_chunk_ranges(symbol, reverse=True))
+    return _chunk_bound(first[0]), _chunk_bound(last[1])
@@ -0,0 +1,239 @@
+"""
+Created: 16 Oct 2026
+Process-wide registry of MongoClient/Arctic handles, keyed by mongo config, so that the
+helpers in database.py reuse one connection pool (and cached library handles) per cluster.
+A config with the key "backend" is opened with that backend from dataload.backends instead
+"""
+import hashlib
+import os
+import threading
+from typing import Dict, List, Tuple
+
+from arctic import Arctic
+from pymongo import MongoClient
+from pymongo.errors import ServerSelectionTimeoutError
+
+from dataload.backends import get_backend
+from dataload.catalog import MetadataCatalog
+
+DEFAULT_MAX_POOL_SIZE = 100
+DEFAULT_MIN_POOL_SIZE = 0
+
+
+def build_host_url(mongo_config: dict) -> str:
+    """Build the mongodb+srv host url from a config with keys
+    ["mongo_user", "mongo_pwd", "url_cluster"]"""
+    return "".join(["mongodb+srv://", mongo_config["mongo_user"], ":",
+                    mongo_config["mongo_pwd"], "@", mongo_config["url_cluster"]])
+
+
+def config_key(mongo_config: dict) -> Tuple:
+    """Hashable key for a mongo config, used to share connections between equal configs"""
+    return tuple(sorted((key, str(value)) for key, value in mongo_config.items()))
+
+
+def store_key(mongo_config: dict) -> str:
+    """
+    Identifier of the store a config points at, for keys that outlive the connection (e.g.
+    the read-through cache): a digest of the config without the password, so clusters,
+    backends and local_path directories are told apart. An in-memory local store only lives
+    as long as this process, so its key includes the process id
+    """
+    key = [item for item in config_key(mongo_config) if item[0] != "mongo_pwd"]
+    if mongo_config.get("backend") == "local" and mongo_config.get("local_path") is None:
+        key.append(("pid", str(os.getpid())))
+    return hashlib.sha1(repr(key).encode()).hexdigest()
+
+
+class _Connection:
+    """Live handles for a single mongo config"""
+
+    def __init__(self, client: MongoClient, backend: str = None):
+        self.client = client
+        self.backend = backend
+        self.arctic_store = None
+        self.library_names = None
+        self.libraries = {}
+        self.catalog = None
+
+
+class ConnectionRegistry:
+    """
+    Registry of reusable connections, one MongoClient (with its own connection pool) and
+    one Arctic store per distinct mongo config. Library handles and the list of library
+    names are cached, so repeated reads do not pay for connection setup or
+    list_libraries() round-trips.
+
+    Connections are dropped in a forked child process (pymongo clients are not fork-safe),
+    so the child lazily opens its own.
+
+    Args:
+        max_pool_size: Default maximum number of pooled sockets per client, can be
+            overridden per config with the key "max_pool_size"
+        min_pool_size: Default minimum number of pooled sockets per client, can be
+            overridden per config with the key "min_pool_size"
+    """
+
+    def __init__(self,
+                 max_pool_size: int = DEFAULT_MAX_POOL_SIZE,
+                 min_pool_size: int = DEFAULT_MIN_POOL_SIZE):
+        self.max_pool_size = max_pool_size
+        self.min_pool_size = min_pool_size
+        self._lock = threading.RLock()
+        self._connections: Dict[Tuple, _Connection] = {}
+        self._pid = os.getpid()
+
+    def __len__(self):
+        return len(self._connections)
+
+    def _reset_after_fork(self) -> None:
+        """Forget (without closing) every connection inherited from the parent process"""
+        self._lock = threading.RLock()
+        self._connections = {}
+        self._pid = os.getpid()
+
+    def _get_connection(self, mongo_config: dict) -> _Connection:
+        if os.getpid() != self._pid:
+            self._reset_after_fork()
+
+        key = config_key(mongo_config)
+        with self._lock:
+            connection = self._connections.get(key)
+            if connection is None:
+                pool_sizes = dict(
+                    maxPoolSize=mongo_config.get("max_pool_size", self.max_pool_size),
+                    minPoolSize=mongo_config.get("min_pool_size", self.min_pool_size))
+                backend = mongo_config.get("backend")
+                if backend is not None:
+                    client_factory, _ = get_backend(backend)
+                    client = client_factory(mongo_config, **pool_sizes)
+                else:
+                    client = MongoClient(host=build_host_url(mongo_config), **pool_sizes)
+                    # check the connection to the database
+                    try:
+                        client.PORT
+                    except ServerSelectionTimeoutError:
+                        raise ServerSelectionTimeoutError('MongoDB is not hosted.')
+                connection = _Connection(client=client, backend=backend)
+                self._connections[key] = connection
+            return connection
+
+    def get_client(self, mongo_config: dict) -> MongoClient:
+        """Return the shared MongoClient for the config, creating it on first use"""
+        return self._get_connection(mongo_config).client
+
+    def get_arctic(self, mongo_config: dict) -> Arctic:
+        """Return the shared Arctic store for the config, creating it on first use"""
+        connection = self._get_connection(mongo_config)
+        with self._lock:
+            if connection.arctic_store is None:
+                if connection.backend is not None:
+                    _, store_factory = get_backend(connection.backend)
+                    connection.arctic_store = store_factory(connection.client)
+                else:
+                    connection.arctic_store = Arctic(connection.client)
+            return connection.arctic_store
+
+    def list_libraries(self, mongo_config: dict, refresh: bool = False) -> List[str]:
+        """Cached list of library names in the Arctic store, refresh=True re-queries mongo"""
+        store = self.get_arctic(mongo_config)
+        connection = self._get_connection(mongo_config)
+        with self._lock:
+            if refresh or connection.library_names is None:
+                connection.library_names = list(store.list_libraries())
+            return connection.library_names
+
+    def get_library(self, mongo_config: dict, lib_name: str):
+        """
+        Return a cached library handle, validating the name against the cached list of
+        libraries (re-listing once if the name is unknown, in case it was created elsewhere).
+        """
+        connection = self._get_connection(mongo_config)
+        with self._lock:
+            library = connection.libraries.get(lib_name)
+            if library is not None:
+                return library
+
+            if lib_name not in self.list_libraries(mongo_config):
+                library_list = self.list_libraries(mongo_config, refresh=True)
+                assert lib_name in library_list, \
+                    f"\n Library: '{lib_name}' does not exist in Arctic database"
+
+            library = self.get_arctic(mongo_config)[lib_name]
+            connection.libraries[lib_name] = library
+            return library
+
+    def get_catalog(self, mongo_config: dict, ttl: float = None) -> MetadataCatalog:
+        """Return the metadata catalog of the config's connection (ttl updates its TTL)"""
+        connection = self._get_connection(mongo_config)
+        with self._lock:
+            if connection.catalog is None:
+                connection.catalog = MetadataCatalog(mongo_config=mongo_config, registry=self)
+            if ttl is not None:
+                connection.catalog.ttl = ttl
+            return connection.catalog
+
+    def refresh(self, mongo_config: dict = None) -> None:
+        """Drop cached library names, handles and catalog metadata (for one config, or all
+        if None), keeping the underlying clients open"""
+        catalogs = []
+        with self._lock:
+            keys = list(self._connections) if mongo_config is None \
+                else [config_key(mongo_config)]
+            for key in keys:
+                connection = self._connections.get(key)
+                if connection is None:
+                    continue
+                if connection.arctic_store is not None:
+                    connection.arctic_store.reload_cache()
+                connection.library_names = None
+                connection.libraries = {}
+                if connection.catalog is not None:
+                    catalogs.append(connection.catalog)
+        # outside the registry lock, catalogs take their own lock before the registry's
+        for catalog in catalogs:
+            catalog.invalidate()
+
+    def close(self, mongo_config: dict = None) -> None:
+        """Close and forget the connections (for one config, or all if None)"""
+        with self._lock:
+            keys = list(self._connections) if mongo_config is None \
+                else [config_key(mongo_config)]
+            for key in keys:
+                connection = self._connections.pop(key, None)
+                if connection is not None:
+                    connection.client.close()
+
+
+_REGISTRY = ConnectionRegistry()
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=lambda: _REGISTRY._reset_after_fork())
+
+
+def get_registry() -> ConnectionRegistry:
+    """Return the process-wide connection registry"""
+    return _REGISTRY
+
+
+def get_catalog(mongo_config: dict, ttl: float = None) -> MetadataCatalog:
+    """Return the cached metadata catalog for a mongo config"""
+    return _REGISTRY.get_catalog(mongo_config, ttl=ttl)
+
+
+def configure_pool(max_pool_size: int = None, min_pool_size: int = None) -> None:
+    """Set the default pool sizes for connections opened from now on"""
+    if max_pool_size is not None:
+        _REGISTRY.max_pool_size = max_pool_size
+    if min_pool_size is not None:
+        _REGISTRY.min_pool_size = min_pool_size
+
+
+def refresh_connections(mongo_config: dict = None) -> None:
+    """Drop cached library names/handles so the next call re-lists libraries"""
+    _REGISTRY.refresh(mongo_config)
+
+
+def close_connections(mongo_config: dict = None) -> None:
+    """Close pooled connections, the next db_connect call opens a new one"""
+    _REGISTRY.close(mongo_config)
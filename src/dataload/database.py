@@ -2,17 +2,26 @@
 Created: 13 Oct 2019
 Cloud database: mongoDB Atlas: initialise, write, append, read to library
 """
+import datetime
 import json
-from typing import Union
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Iterator, List, Tuple, Union
 
 import pandas as pd
 from arctic import Arctic, VERSION_STORE, CHUNK_STORE, TICK_STORE
 from arctic.chunkstore.chunkstore import ChunkStore
+from arctic.date import DateRange
 from arctic.store.version_store import VersionStore
-from pymongo import MongoClient
+from arctic.store.versioned_item import VersionedItem
+from arctic.tickstore.tickstore import TickStore
 from pymongo.collection import Collection
-from pymongo.errors import ServerSelectionTimeoutError
 
+from dataload.cache import FrameCache, invalidate_cached_symbol
+from dataload.catalog import stored_date_range
+from dataload.connection import get_catalog, get_registry, store_key
+
+# period read at a time when db_arctic_iterator re-slices a bounded symbol by chunk_rows alone
+CHUNK_ROWS_PERIOD = "D"
 
 # connect to database
 def db_connect(mongo_config: dict,
@@ -20,10 +29,14 @@ def db_connect(mongo_config: dict,
                lib_name: str = None) -> Union[object, Arctic, VersionStore, ChunkStore, Collection]:
     """
     Connect to the MongoDB Atlas instance using a config containing user, password, url_cluster
-    parameters
+    parameters. Connections are pooled per config by the registry in dataload.connection,
+    so repeated calls reuse the same MongoClient, Arctic store and library handles.
 
     Args:
-        mongo_config: Dict-like object with the keys ["mongo_user", "mongo_pwd", "url_cluster"]
+        mongo_config: Dict-like object with the keys ["mongo_user", "mongo_pwd", "url_cluster"],
+            optionally "max_pool_size" and "min_pool_size". A config with the key "backend"
+            (e.g. {"backend": "local", "local_path": ...}) is opened with that backend from
+            dataload.backends instead of MongoDB
         is_arctic: If searching the Arctic database on MongoDB (for time-series data)
         lib_name: Name of library within database, default to None
 
@@ -33,34 +46,19 @@ def db_connect(mongo_config: dict,
             lib_collection: pymongo collection
             db_connection: arctic.arctic.Arctic, pymongo.database.Database
     """
-    user = mongo_config["mongo_user"]
-    password = mongo_config["mongo_pwd"]
-    mongo_url = mongo_config["url_cluster"]
-
-    host_url = "".join(["mongodb+srv://", user, ":", password, "@", mongo_url])
-    client = MongoClient(host=host_url)
-
-    # check the connection to the database
-    try:
-        client.PORT
-        # print(f"Listing existing database names: {client.list_database_names()}")
-    except ServerSelectionTimeoutError:
-        raise ServerSelectionTimeoutError('MongoDB is not hosted.')
+    registry = get_registry()
 
     if is_arctic:
-        db_connection = Arctic(client)
-        library_list = db_connection.list_libraries()
         if lib_name is not None:
-            assert lib_name in library_list, \
-                f"\n Library: '{lib_name}' does not exist in Arctic database"
-            lib_store = db_connection[lib_name]
-            return lib_store
+            return registry.get_library(mongo_config=mongo_config, lib_name=lib_name)
         else:
+            db_connection = registry.get_arctic(mongo_config=mongo_config)
+            library_list = registry.list_libraries(mongo_config=mongo_config)
             print(f"List of libraries in 'Arctic' database: \n {library_list}")
             return db_connection
     # non-arctic collection
     else:
-        return client
+        return registry.get_client(mongo_config=mongo_config)
         # Check if I want to add a non-time series dataset
 
 
@@ -93,10 +91,9 @@ def db_keys_and_symbols(is_arctic: bool,
         except AttributeError:
             print('\nIncorrect data type, mongodb collection should be the only acceptable type.')
 
-    # Arctic symbols
+    # Arctic symbols, served from the cached catalog
     else:
-        lib = db_connect(is_arctic=True, lib_name=library_name, mongo_config=mongo_config)
-        symbols = lib.list_symbols()
+        symbols = get_catalog(mongo_config).symbols(library_name)
         return symbols
 
 
@@ -111,12 +108,10 @@ def db_arctic_library(mongo_config: dict,
     Returns
         arctic_store
     """
-    store = db_connect(mongo_config=mongo_config, is_arctic=True)
-
     if library is None:
-        return store.list_libraries()
+        return get_catalog(mongo_config).libraries()
     else:
-        return store
+        return db_connect(mongo_config=mongo_config, is_arctic=True)
 
 
 # -----------------------
@@ -124,14 +119,28 @@ def db_arctic_library(mongo_config: dict,
 # -----------------------
 def db_arctic_read(mongo_config: dict,
                    library: str,
-                   symbol: str = None) -> pd.DataFrame:
+                   symbol: str = None,
+                   start: Union[str, datetime.datetime] = None,
+                   end: Union[str, datetime.datetime] = None,
+                   columns: List[str] = None,
+                   cache: FrameCache = None,
+                   validate_cache: bool = False) -> pd.DataFrame:
     """
-    Returning the data frame stored in MongoDB Arctic database.
+    Returning the data frame stored in MongoDB Arctic database. The date range is pushed
+    down to Arctic (date_range on VersionStore/TickStore, chunk_range on ChunkStore) so
+    only the chunks/segments needed are read from the server.
 
     Args:
         mongo_config: Dict-like object with the keys ["mongo_user", "mongo_pwd", "url_cluster"]
         library: Name of library in individual mongo cluster
         symbol: Named symbol present in library
+        start: First date to read (inclusive), default None reads from the start of history
+        end: Last date to read (inclusive), default None reads to the end of history
+        columns: Columns to return, default None returns all columns. ChunkStore and
+            TickStore only deserialize these columns, VersionStore selects them after reading
+        cache: Optional local read-through cache, a cached read does not contact Mongo
+        validate_cache: If True, check the cached version against the latest version in
+            Arctic before serving from the cache (catches writes from other processes)
 
     Returns:
         pd.DataFrame
@@ -142,17 +151,274 @@ def db_arctic_read(mongo_config: dict,
     >>> store = db_connect(mongo_config=mongo_config, is_arctic=True)
     >>> store.list_libraries()
     """
+    store = store_key(mongo_config)
+    query = dict(start=start, end=end, columns=columns)
+
+    if cache is not None and symbol is not None and not validate_cache:
+        out = cache.get(store, library, symbol, **query)
+        if out is not None:
+            return out
 
     lib = db_connect(mongo_config=mongo_config, is_arctic=True, lib_name=library)
 
-    if symbol is not None:
-        assert lib.has_symbol(symbol), f"{symbol} not found in library: {library}"
-        out = lib.read(symbol)
-    else:
+    if symbol is None:
         raise KeyError(f"No symbol chosen from the library, the following symbols can be"
                        f" read from the {library}: {lib.list_symbols()}")
 
-    return out.sort_index()
+    _assert_symbol(mongo_config=mongo_config, library=library, symbol=symbol)
+
+    if cache is not None and validate_cache:
+        cached_version = cache.version(store, library, symbol, **query)
+        if cached_version is not None and \
+                cached_version == getattr(lib.read_metadata(symbol), "version", None):
+            out = cache.get(store, library, symbol, **query)
+            if out is not None:
+                return out
+
+    out, version = _read_symbol(lib=lib, library=library, symbol=symbol, **query)
+    if cache is not None:
+        cache.put(store, library, symbol, version, out, **query)
+    return out
+
+
+def _assert_symbol(mongo_config: dict, library: str, symbol: str) -> None:
+    """Validate the symbol against the cached catalog rather than a has_symbol round-trip"""
+    assert get_catalog(mongo_config).has_symbol(library, symbol), \
+        f"{symbol} not found in library: {library}"
+
+
+def _date_range(start: Union[str, datetime.datetime] = None,
+                end: Union[str, datetime.datetime] = None) -> Union[DateRange, None]:
+    """Arctic DateRange of the bounds given, or None if neither is. Arctic stores datetimes,
+    so the bounds are truncated to microseconds (period end_time carries nanoseconds)"""
+    if start is None and end is None:
+        return None
+    return DateRange(
+        start=pd.Timestamp(start).to_pydatetime(warn=False) if start is not None else None,
+        end=pd.Timestamp(end).to_pydatetime(warn=False) if end is not None else None)
+
+
+def _read_symbol(lib: Union[VersionStore, ChunkStore, TickStore],
+                 library: str,
+                 symbol: str,
+                 start: Union[str, datetime.datetime] = None,
+                 end: Union[str, datetime.datetime] = None,
+                 columns: List[str] = None) -> Tuple[pd.DataFrame, Union[int, None]]:
+    """Read a symbol from an open library handle, pushing the date range (and columns where
+    the store supports it) down to Arctic. VersionStore reads are unwrapped from the
+    VersionedItem, and the result is only sorted if the index is not already monotonic.
+    Returns the frame and the version read (None for stores without versions)."""
+    date_range = _date_range(start=start, end=end)
+    is_column_store = isinstance(lib, (ChunkStore, TickStore))
+    read_kwargs = {}
+    if date_range is not None:
+        read_kwargs['chunk_range' if isinstance(lib, ChunkStore) else 'date_range'] = date_range
+    if columns is not None and is_column_store:
+        read_kwargs['columns'] = list(columns)
+
+    out = lib.read(symbol, **read_kwargs)
+    version = None
+    if isinstance(out, VersionedItem):
+        out, version = out.data, out.version
+
+    # VersionStore serialises the whole frame, so columns can only be dropped after the read
+    if columns is not None and not is_column_store:
+        out = out[list(columns)]
+
+    if not out.index.is_monotonic_increasing:
+        out = out.sort_index()
+    return out, version
+
+
+def db_arctic_read_batch(mongo_config: dict,
+                         library: str,
+                         symbols: List[str],
+                         max_workers: int = 8,
+                         as_wide: bool = False,
+                         column: str = None,
+                         start: Union[str, datetime.datetime] = None,
+                         end: Union[str, datetime.datetime] = None,
+                         columns: List[str] = None) -> Tuple[Union[Dict[str, pd.DataFrame],
+                                                            pd.DataFrame], Dict[str, str]]:
+    """
+    Read many symbols from one library concurrently, through a bounded thread pool sharing
+    the pooled connection. A failed symbol is reported and does not abort the batch.
+
+    Args:
+        mongo_config: Dict-like object with the keys ["mongo_user", "mongo_pwd", "url_cluster"]
+        library: Name of library in individual mongo cluster
+        symbols: Symbols to read from the library
+        max_workers: Maximum number of reads in flight at once
+        as_wide: If True return one wide dataframe (outer join on the index), with one
+            column per symbol, otherwise a dict of symbol -> dataframe
+        column: Column taken from each symbol for the wide dataframe, may be omitted if
+            every symbol has a single column
+        start: First date to read (inclusive), see db_arctic_read
+        end: Last date to read (inclusive), see db_arctic_read
+        columns: Columns to read from each symbol, see db_arctic_read
+
+    Returns:
+        tuple:
+            data: dict of symbol -> pd.DataFrame, or pd.DataFrame if as_wide
+            failures: dict of symbol -> error message for the symbols that could not be read
+    """
+    assert max_workers > 0, "max_workers must be a positive integer"
+    lib = db_connect(mongo_config=mongo_config, is_arctic=True, lib_name=library)
+
+    def read_one(symbol: str):
+        try:
+            _assert_symbol(mongo_config=mongo_config, library=library, symbol=symbol)
+            frame, _ = _read_symbol(lib=lib, library=library, symbol=symbol,
+                                    start=start, end=end, columns=columns)
+            return symbol, frame, None
+        except Exception as err:
+            return symbol, None, f"{type(err).__name__}: {err}"
+
+    data, failures = {}, {}
+    with ThreadPoolExecutor(max_workers=min(max_workers, max(len(symbols), 1))) as pool:
+        for symbol, frame, error in pool.map(read_one, symbols):
+            if error is None:
+                data[symbol] = frame
+            else:
+                failures[symbol] = error
+
+    if as_wide:
+        data = _to_wide_frame(data=data, column=column)
+
+    return data, failures
+
+
+def db_arctic_iterator(mongo_config: dict,
+                       library: str,
+                       symbol: str,
+                       chunk_rows: int = None,
+                       period: str = None,
+                       start: Union[str, datetime.datetime] = None,
+                       end: Union[str, datetime.datetime] = None,
+                       columns: List[str] = None) -> Iterator[pd.DataFrame]:
+    """
+    Generator over a symbol in bounded chunks, in ascending index order, so large (e.g.
+    tick-level) histories can be processed without loading them into one dataframe.
+
+    With neither chunk_rows nor period, a ChunkStore symbol is yielded chunk by chunk as
+    stored (as ChunkStore.iterator). With period, each period is read separately with the
+    date range pushed down to Arctic. chunk_rows re-slices the chunks into frames of at most
+    chunk_rows rows (and may be combined with period to bound what is read at once). With
+    chunk_rows alone, a TickStore symbol, or a VersionStore one given start and end, is read
+    one CHUNK_ROWS_PERIOD at a time rather than in one read.
+
+    Args:
+        mongo_config: Dict-like object with the keys ["mongo_user", "mongo_pwd", "url_cluster"]
+        library: Name of library in individual mongo cluster
+        symbol: Named symbol present in library
+        chunk_rows: Maximum number of rows in each chunk yielded
+        period: Pandas frequency string of the date periods read, e.g. "M", "W", "D"
+        start: First date to read (inclusive), default None reads from the start of history
+        end: Last date to read (inclusive), default None reads to the end of history
+        columns: Columns to return, default None returns all columns
+
+    Note
+    -----
+    A VersionStore can only be read in bounded pieces by date range. Without start and end
+    its history bounds are unknown, so period chunks are then cut from one full read.
+    ChunkStore and TickStore periods are bounded by the stored chunk ranges and
+    min_date/max_date respectively.
+
+    Example
+    -----
+    >>> for chunk in db_arctic_iterator(mongo_config, 'ticks', 'TSLA', period='D'):
+    ...     accumulator.update(chunk)
+    """
+    assert chunk_rows is None or chunk_rows > 0, "chunk_rows must be a positive integer"
+    lib = db_connect(mongo_config=mongo_config, is_arctic=True, lib_name=library)
+    _assert_symbol(mongo_config=mongo_config, library=library, symbol=symbol)
+
+    if chunk_rows is not None and period is None and (
+            isinstance(lib, TickStore) or
+            (isinstance(lib, VersionStore) and start is not None and end is not None)):
+        period = CHUNK_ROWS_PERIOD
+
+    chunks = _iter_symbol_chunks(lib=lib, library=library, symbol=symbol, period=period,
+                                 start=start, end=end, columns=columns)
+    if chunk_rows is None:
+        for chunk in chunks:
+            if not chunk.empty:
+                yield chunk
+        return
+
+    pending = []
+    num_pending = 0
+    for chunk in chunks:
+        pending.append(chunk)
+        num_pending += len(chunk)
+        if num_pending < chunk_rows:
+            continue
+        data = pd.concat(pending) if len(pending) > 1 else pending[0]
+        cut = len(data) - len(data) % chunk_rows
+        for i in range(0, cut, chunk_rows):
+            yield data.iloc[i:i + chunk_rows]
+        pending = [data.iloc[cut:]]
+        num_pending = len(data) - cut
+    if num_pending:
+        yield pd.concat(pending) if len(pending) > 1 else pending[0]
+
+
+def _iter_symbol_chunks(lib: Union[VersionStore, ChunkStore, TickStore],
+                        library: str,
+                        symbol: str,
+                        period: str = None,
+                        start: Union[str, datetime.datetime] = None,
+                        end: Union[str, datetime.datetime] = None,
+                        columns: List[str] = None) -> Iterator[pd.DataFrame]:
+    """Source chunks for db_arctic_iterator: stored chunks, date periods or one full read"""
+    is_chunk_store = isinstance(lib, ChunkStore)
+
+    if is_chunk_store and period is None:
+        date_range = _date_range(start=start, end=end)
+        read_kwargs = {} if columns is None else {'columns': list(columns)}
+        for chunk in lib.iterator(symbol, chunk_range=date_range, **read_kwargs):
+            # chunks on the edge of the range are returned whole
+            yield chunk.loc[start:end] if date_range is not None else chunk
+        return
+
+    if period is not None and (start is None or end is None) and \
+            isinstance(lib, (ChunkStore, TickStore)):
+        # bound the periods by the stored range rather than reading the whole symbol
+        stored_start, stored_end = stored_date_range(lib, symbol)
+        if stored_start is None:
+            return
+        start = start if start is not None else stored_start
+        end = end if end is not None else stored_end
+
+    if period is not None and start is not None and end is not None:
+        for p in pd.period_range(start=pd.Timestamp(start), end=pd.Timestamp(end), freq=period):
+            period_start = max(p.start_time, pd.Timestamp(start))
+            period_end = min(p.end_time, pd.Timestamp(end))
+            chunk, _ = _read_symbol(lib=lib, library=library, symbol=symbol,
+                                    start=period_start, end=period_end, columns=columns)
+            yield chunk
+        return
+
+    data, _ = _read_symbol(lib=lib, library=library, symbol=symbol,
+                           start=start, end=end, columns=columns)
+    if period is None:
+        yield data
+    else:
+        for _, chunk in data.groupby(data.index.to_period(period), sort=True):
+            yield chunk
+
+
+def _to_wide_frame(data: Dict[str, pd.DataFrame], column: str = None) -> pd.DataFrame:
+    """Align one column of each symbol's frame into a wide frame, one column per symbol"""
+    series = {}
+    for symbol, frame in data.items():
+        if column is not None:
+            series[symbol] = frame[column]
+        else:
+            assert frame.shape[1] == 1, \
+                f"{symbol} has {frame.shape[1]} columns, choose one with column="
+            series[symbol] = frame.iloc[:, 0]
+    return pd.concat(series, axis=1, sort=True) if series else pd.DataFrame()
 
 
 def db_arctic_initialise(mongo_config: dict,
@@ -180,8 +446,9 @@ def db_arctic_initialise(mongo_config: dict,
     lib.initialize_library(library=library_name, lib_type=library_type)
 
     # This is important because arctic will not show the existing
-    # libraries upon creation of a new library.
-    Arctic.reload_cache(lib)
+    # libraries upon creation of a new library (the registry reloads the arctic
+    # cache and drops its cached library names).
+    get_registry().refresh(mongo_config=mongo_config)
 
 
 def db_arctic_write(mongo_config: dict,
@@ -203,7 +470,10 @@ def db_arctic_write(mongo_config: dict,
     assert library_name is not None, "library_name must be passed in to specify library to write."
 
     lib = db_connect(mongo_config=mongo_config, is_arctic=True, lib_name=library_name)
-    lib.write(symbol, df)
+    written = lib.write(symbol, df)
+    get_catalog(mongo_config).record_write(library_name, symbol, df,
+                                           version=getattr(written, "version", None))
+    invalidate_cached_symbol(store_key(mongo_config), library_name, symbol)
 
 
 def db_arctic_append(mongo_config: dict,
@@ -225,7 +495,10 @@ def db_arctic_append(mongo_config: dict,
 
     assert library_name is not None, "lib_name must be passed in to specify library to append."
     lib = db_connect(mongo_config=mongo_config, is_arctic=True, lib_name=library_name)
-    lib.append(symbol, df, upsert=True)
+    appended = lib.append(symbol, df, upsert=True)
+    get_catalog(mongo_config).record_write(library_name, symbol, df, is_append=True,
+                                           version=getattr(appended, "version", None))
+    invalidate_cached_symbol(store_key(mongo_config), library_name, symbol)
 
 
 if __name__ == '__main__':
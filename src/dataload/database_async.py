@@ -0,0 +1,164 @@
+"""
+Created: 16 Oct 2026
+asyncio counterpart of database.py: the same read, write, append and list helpers as
+awaitables. Arctic/pymongo are blocking, so each call runs on a bounded thread pool over the
+pooled connection, and the event loop is never stalled by a round-trip to MongoDB
+"""
+import asyncio
+import datetime
+import functools
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Tuple, Union
+
+import pandas as pd
+
+from dataload.cache import FrameCache
+from dataload.database import (_to_wide_frame, db_arctic_append, db_arctic_library,
+                               db_arctic_read, db_arctic_write, db_keys_and_symbols)
+
+DEFAULT_MAX_CONCURRENCY = 8
+
+_EXECUTOR = None
+_EXECUTOR_LOCK = threading.Lock()
+
+
+def _get_executor() -> ThreadPoolExecutor:
+    """Thread pool shared by every async helper, bounding the blocking calls in flight"""
+    global _EXECUTOR
+    with _EXECUTOR_LOCK:
+        if _EXECUTOR is None:
+            _EXECUTOR = ThreadPoolExecutor(max_workers=DEFAULT_MAX_CONCURRENCY,
+                                           thread_name_prefix="arctic")
+        return _EXECUTOR
+
+
+def set_max_concurrency(max_workers: int) -> None:
+    """Resize the thread pool used by the async helpers. New calls go to the new pool at
+    once, calls already submitted finish on the old one, which is then shut down"""
+    global _EXECUTOR
+    assert max_workers > 0, "max_workers must be a positive integer"
+    with _EXECUTOR_LOCK:
+        old_executor = _EXECUTOR
+        _EXECUTOR = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="arctic")
+    if old_executor is not None:
+        old_executor.shutdown(wait=False)
+
+
+async def _run_blocking(func, executor: ThreadPoolExecutor = None, **kwargs):
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(executor or _get_executor(),
+                                      functools.partial(func, **kwargs))
+
+
+async def db_keys_and_symbols_async(is_arctic: bool,
+                                    library_name: str,
+                                    mongo_config: dict) -> list:
+    """Awaitable db_keys_and_symbols: list of symbols (arctic) or keys (non-arctic)"""
+    return await _run_blocking(db_keys_and_symbols, is_arctic=is_arctic,
+                               library_name=library_name, mongo_config=mongo_config)
+
+
+async def db_arctic_library_async(mongo_config: dict, library: str = None):
+    """Awaitable db_arctic_library: list of library names, or the arctic store"""
+    return await _run_blocking(db_arctic_library, mongo_config=mongo_config, library=library)
+
+
+async def db_arctic_read_async(mongo_config: dict,
+                               library: str,
+                               symbol: str = None,
+                               start: Union[str, datetime.datetime] = None,
+                               end: Union[str, datetime.datetime] = None,
+                               columns: List[str] = None,
+                               cache: FrameCache = None) -> pd.DataFrame:
+    """Awaitable db_arctic_read, see db_arctic_read for the arguments"""
+    return await _run_blocking(db_arctic_read, mongo_config=mongo_config, library=library,
+                               symbol=symbol, start=start, end=end, columns=columns,
+                               cache=cache)
+
+
+async def db_arctic_write_async(mongo_config: dict,
+                                df: pd.DataFrame,
+                                symbol: str,
+                                library_name: str = None) -> None:
+    """Awaitable db_arctic_write"""
+    await _run_blocking(db_arctic_write, mongo_config=mongo_config, df=df, symbol=symbol,
+                        library_name=library_name)
+
+
+async def db_arctic_append_async(mongo_config: dict,
+                                 df: pd.DataFrame,
+                                 symbol: str,
+                                 library_name: str = None) -> None:
+    """Awaitable db_arctic_append"""
+    await _run_blocking(db_arctic_append, mongo_config=mongo_config, df=df, symbol=symbol,
+                        library_name=library_name)
+
+
+async def db_arctic_read_batch_async(mongo_config: dict,
+                                     library: str,
+                                     symbols: List[str],
+                                     max_concurrency: int = DEFAULT_MAX_CONCURRENCY,
+                                     as_wide: bool = False,
+                                     column: str = None,
+                                     start: Union[str, datetime.datetime] = None,
+                                     end: Union[str, datetime.datetime] = None,
+                                     columns: List[str] = None,
+                                     cache: FrameCache = None
+                                     ) -> Tuple[Union[Dict[str, pd.DataFrame], pd.DataFrame],
+                                                Dict[str, str]]:
+    """
+    Awaitable batch read of many symbols, with at most max_concurrency reads in flight.
+    A failed symbol is reported and does not abort the batch. The reads run on a thread pool
+    of the batch's own, so max_concurrency is not capped by set_max_concurrency.
+
+    Args:
+        mongo_config: Dict-like object with the keys ["mongo_user", "mongo_pwd", "url_cluster"]
+        library: Name of library in individual mongo cluster
+        symbols: Symbols to read from the library
+        max_concurrency: Maximum number of reads in flight at once
+        as_wide: If True return one wide dataframe (outer join on the index), with one
+            column per symbol, otherwise a dict of symbol -> dataframe
+        column: Column taken from each symbol for the wide dataframe, may be omitted if
+            every symbol has a single column
+        start: First date to read (inclusive), see db_arctic_read
+        end: Last date to read (inclusive), see db_arctic_read
+        columns: Columns to read from each symbol, see db_arctic_read
+        cache: Optional local read-through cache, see db_arctic_read
+
+    Returns:
+        tuple:
+            data: dict of symbol -> pd.DataFrame, or pd.DataFrame if as_wide
+            failures: dict of symbol -> error message for the symbols that could not be read
+    """
+    assert max_concurrency > 0, "max_concurrency must be a positive integer"
+    executor = ThreadPoolExecutor(max_workers=min(max_concurrency, max(len(symbols), 1)),
+                                  thread_name_prefix="arctic-batch")
+
+    async def read_one(symbol: str):
+        try:
+            frame = await _run_blocking(db_arctic_read, executor=executor,
+                                        mongo_config=mongo_config, library=library,
+                                        symbol=symbol, start=start, end=end, columns=columns,
+                                        cache=cache)
+            return symbol, frame, None
+        except Exception as err:
+            return symbol, None, f"{type(err).__name__}: {err}"
+
+    try:
+        results = await asyncio.gather(*[read_one(s) for s in symbols])
+    finally:
+        # reads already submitted finish on their own, the event loop is not held up
+        executor.shutdown(wait=False)
+
+    data, failures = {}, {}
+    for symbol, frame, error in results:
+        if error is None:
+            data[symbol] = frame
+        else:
+            failures[symbol] = error
+
+    if as_wide:
+        data = _to_wide_frame(data=data, column=column)
+
+    return data, failures
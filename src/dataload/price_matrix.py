@@ -0,0 +1,164 @@
+"""
+Created: 16 Oct 2026
+Memory-mapped store for aligned price panels (dates x tickers): the prices are kept as one
+column-major .npy array next to date and ticker index files, so analytics workers map the
+file instead of loading the universe into memory, and only the pages of the columns and
+date ranges they read are touched
+"""
+import datetime
+import json
+import os
+from typing import List, Union
+
+import numpy as np
+import pandas as pd
+
+PRICES_FILE = "prices.npy"
+DATES_FILE = "dates.npy"
+TICKERS_FILE = "tickers.json"
+INDEX_FILE = "index.json"
+
+
+class PriceMatrixStore:
+    """
+    Price panel persisted in a directory as prices.npy (float array, dates x tickers, in
+    Fortran order so each ticker's history is contiguous), dates.npy (sorted datetime64[ns],
+    in UTC for a tz-aware panel), tickers.json and index.json (the tz of the dates, reapplied
+    on read). Reads return views of the memory map, which the utils_finance functions use
+    without copying.
+
+    Args:
+        path: Directory of the store, created by PriceMatrixStore.write
+
+    Example:
+    >>> store = PriceMatrixStore.write(path='/data/universe', panel=price_df)
+    >>> prices = PriceMatrixStore('/data/universe').read(tickers=['TSLA'], start='2020-01-01')
+    >>> calculate_return_df(prices, is_log_return=True)
+    """
+
+    def __init__(self, path: str):
+        assert os.path.exists(os.path.join(path, PRICES_FILE)), \
+            f"No price matrix stored in: {path}"
+        self.path = path
+        with open(os.path.join(path, TICKERS_FILE), "r") as fp:
+            self.tickers: List[str] = json.load(fp)
+        self._ticker_positions = {ticker: i for i, ticker in enumerate(self.tickers)}
+        self.dates = np.load(os.path.join(path, DATES_FILE), mmap_mode="r")
+        index_path = os.path.join(path, INDEX_FILE)
+        self.tz = None
+        if os.path.exists(index_path):  # stores written without it have naive dates
+            with open(index_path, "r") as fp:
+                self.tz = json.load(fp)["tz"]
+        self._values = None
+
+    @classmethod
+    def write(cls,
+              path: str,
+              panel: pd.DataFrame,
+              dtype: np.dtype = np.float64,
+              block_columns: int = 512):
+        """
+        Persist a price panel (DatetimeIndex rows, one column per ticker), replacing any
+        panel stored in path. Columns are written in blocks, so the panel is never copied
+        as a whole.
+
+        Args:
+            path: Directory of the store
+            panel: Prices with a DatetimeIndex and one numeric column per ticker
+            dtype: dtype of the stored prices, e.g. np.float32 to halve the file size
+            block_columns: Number of columns converted and written at a time
+
+        Returns:
+            PriceMatrixStore
+        """
+        assert isinstance(panel.index, pd.DatetimeIndex), "panel must have a DatetimeIndex"
+        assert panel.columns.is_unique, "panel has duplicated tickers"
+        if not panel.index.is_monotonic_increasing:
+            panel = panel.sort_index(kind="mergesort")
+        os.makedirs(path, exist_ok=True)
+
+        values = np.lib.format.open_memmap(os.path.join(path, PRICES_FILE), mode="w+",
+                                           dtype=dtype, shape=panel.shape, fortran_order=True)
+        for start in range(0, panel.shape[1], block_columns):
+            values[:, start:start + block_columns] = \
+                panel.iloc[:, start:start + block_columns].to_numpy(dtype=dtype)
+        values.flush()
+        del values
+
+        tz = panel.index.tz
+        dates = panel.index.tz_convert(None) if tz is not None else panel.index
+        np.save(os.path.join(path, DATES_FILE), dates.to_numpy(dtype="datetime64[ns]"))
+        with open(os.path.join(path, TICKERS_FILE), "w") as fp:
+            json.dump([str(ticker) for ticker in panel.columns], fp)
+        with open(os.path.join(path, INDEX_FILE), "w") as fp:
+            json.dump({"tz": None if tz is None else str(tz)}, fp)
+        return cls(path)
+
+    @property
+    def shape(self) -> tuple:
+        return len(self.dates), len(self.tickers)
+
+    def values(self) -> np.memmap:
+        """Read-only memory map of the whole price array (dates x tickers)"""
+        if self._values is None:
+            self._values = np.load(os.path.join(self.path, PRICES_FILE), mmap_mode="r")
+        return self._values
+
+    def _stored_date(self, date: Union[str, datetime.datetime]) -> np.datetime64:
+        """date as stored: naive dates of a tz-aware store are taken in its tz"""
+        date = pd.Timestamp(date)
+        if self.tz is not None:
+            date = date.tz_localize(self.tz) if date.tz is None else date
+            date = date.tz_convert(None)
+        return np.datetime64(date, "ns")
+
+    def _row_slice(self,
+                   start: Union[str, datetime.datetime] = None,
+                   end: Union[str, datetime.datetime] = None) -> slice:
+        first = 0 if start is None else \
+            np.searchsorted(self.dates, self._stored_date(start), side="left")
+        last = len(self.dates) if end is None else \
+            np.searchsorted(self.dates, self._stored_date(end), side="right")
+        return slice(int(first), int(last))
+
+    def _column_index(self, tickers: List[str] = None) -> Union[slice, np.ndarray]:
+        if tickers is None:
+            return slice(None)
+        missing = [ticker for ticker in tickers if ticker not in self._ticker_positions]
+        assert not missing, f"Tickers not in the price matrix: {missing}"
+        positions = np.array([self._ticker_positions[ticker] for ticker in tickers],
+                             dtype=np.int64)
+        if len(positions) and (np.diff(positions) == 1).all():
+            return slice(int(positions[0]), int(positions[-1]) + 1)
+        return positions
+
+    def read_array(self,
+                   tickers: List[str] = None,
+                   start: Union[str, datetime.datetime] = None,
+                   end: Union[str, datetime.datetime] = None) -> np.ndarray:
+        """
+        Prices of the tickers between start and end (inclusive). Tickers stored next to each
+        other (or None, for all) are returned as a view of the memory map; any other
+        selection copies only the selected columns.
+        """
+        rows, columns = self._row_slice(start=start, end=end), self._column_index(tickers)
+        values = self.values()
+        if isinstance(columns, slice):
+            return values[rows, columns]
+        return np.take(values[rows], columns, axis=1)
+
+    def read(self,
+             tickers: List[str] = None,
+             start: Union[str, datetime.datetime] = None,
+             end: Union[str, datetime.datetime] = None) -> pd.DataFrame:
+        """
+        Price panel of the tickers between start and end (inclusive), as a dataframe over
+        read_array (no copy of the prices when the tickers are stored next to each other)
+        """
+        rows = self._row_slice(start=start, end=end)
+        columns = self.tickers if tickers is None else list(tickers)
+        index = pd.DatetimeIndex(self.dates[rows], name="date")
+        if self.tz is not None:
+            index = index.tz_localize("UTC").tz_convert(self.tz)
+        return pd.DataFrame(self.read_array(tickers=tickers, start=start, end=end),
+                            index=index, columns=columns, copy=False)
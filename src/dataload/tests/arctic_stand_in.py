@@ -0,0 +1,233 @@
+"""
+Created on: 16 Oct 2026
+
+In-memory stand-in for MongoClient/Arctic, built on the local backend, so the database
+helpers can be tested (and benchmarked) through the MongoDB code path without an Atlas
+cluster. Libraries initialised as CHUNK_STORE are modelled on ChunkStore (monthly date
+chunks, bounds reported as bytes as by DateChunker), TICK_STORE on TickStore (min_date and
+max_date, no versions) and the others on VersionStore. It counts
+connections and list_libraries()/list_symbols() calls, records the
+arguments of the last read and can simulate a network round-trip. Patch it in with:
+>>> with mock.patch("dataload.connection.MongoClient", StandInMongoClient), \
+...         mock.patch("dataload.connection.Arctic", StandInArctic):
+...     db_arctic_read(mongo_config=..., library=..., symbol=...)
+or derive test cases from StandInTestCase, which also resets the stand-in and the pooled
+connections and initialises a library for every test.
+"""
+import tempfile
+import time
+import unittest
+from unittest import mock
+
+import pandas as pd
+from arctic import CHUNK_STORE, TICK_STORE, VERSION_STORE
+from arctic.chunkstore.chunkstore import ChunkStore
+from arctic.date import DateRange
+from arctic.tickstore.tickstore import TickStore
+
+from dataload.backends import LocalArctic, LocalClient, LocalLibrary
+from dataload.connection import close_connections
+from dataload.database import db_arctic_initialise
+
+# storage shared by every stand-in client pointing at the same host
+_SERVERS = {}
+# (host, library) -> lib_type the library was initialised with
+_LIBRARY_TYPES = {}
+
+
+class StandInMongoClient(LocalClient):
+    """Records construction arguments instead of opening sockets"""
+    instances = 0
+
+    def __init__(self, host: str, **kwargs):
+        StandInMongoClient.instances += 1
+        super().__init__(storage=_SERVERS.setdefault(host, {}))
+        self.host = host
+        self.kwargs = kwargs
+        self.is_closed = False
+
+    def close(self):
+        self.is_closed = True
+
+
+class StandInLibrary(LocalLibrary):
+    """Local library adding a simulated round-trip to every read/write"""
+
+    def __init__(self, name: str, client: LocalClient):
+        super().__init__(name=name, client=client)
+        self.last_read_kwargs = None
+
+    @staticmethod
+    def _wait():
+        if StandInArctic.latency:
+            time.sleep(StandInArctic.latency)
+
+    def list_symbols(self) -> list:
+        StandInArctic.list_symbols_calls += 1
+        return super().list_symbols()
+
+    def read(self, symbol: str, **kwargs):
+        self._wait()
+        self.last_read_kwargs = kwargs
+        return super().read(symbol, **kwargs)
+
+    def write(self, symbol: str, data, **kwargs):
+        self._wait()
+        return super().write(symbol, data, **kwargs)
+
+    def append(self, symbol: str, data, upsert: bool = False, **kwargs):
+        self._wait()
+        return super().append(symbol, data, upsert=upsert, **kwargs)
+
+
+class StandInChunkStore(StandInLibrary, ChunkStore):
+    """
+    Local library with the ChunkStore interface: frames are read (and filtered) by
+    chunk_range, write/append return None and chunk bounds are yielded as ascii bytes, as
+    by arctic's DateChunker. ChunkStore.__init__ is never called, every method used by the
+    helpers is overridden here.
+    """
+    chunk_size = 'M'
+
+    def read(self, symbol: str, chunk_range=None, columns=None, **kwargs) -> pd.DataFrame:
+        data = super().read(symbol, date_range=chunk_range).data
+        self.last_read_kwargs = dict(kwargs, chunk_range=chunk_range, columns=columns)
+        return data if columns is None else data[list(columns)]
+
+    def read_metadata(self, symbol: str) -> None:
+        return None
+
+    def write(self, symbol: str, item, **kwargs) -> None:
+        super().write(symbol, item)
+
+    def append(self, symbol: str, item, upsert: bool = False, **kwargs) -> None:
+        super().append(symbol, item, upsert=upsert)
+
+    def _periods(self, symbol: str) -> pd.PeriodIndex:
+        with self._lock:
+            _, data = self._load(symbol)
+        return data.index.to_period(self.chunk_size).unique().sort_values()
+
+    def get_info(self, symbol: str) -> dict:
+        with self._lock:
+            _, data = self._load(symbol)
+        return {'chunk_count': len(self._periods(symbol)), 'len': len(data),
+                'appended_rows': 0, 'metadata': None, 'chunker': 'date',
+                'chunk_size': self.chunk_size}
+
+    def get_chunk_ranges(self, symbol: str, chunk_range=None, reverse: bool = False):
+        periods = self._periods(symbol)
+        if chunk_range is not None:
+            periods = periods[(chunk_range.start is None
+                               or periods.end_time >= pd.Timestamp(chunk_range.start))
+                              & (chunk_range.end is None
+                                 or periods.start_time <= pd.Timestamp(chunk_range.end))]
+        for period in (periods[::-1] if reverse else periods):
+            yield (str(period.start_time.to_pydatetime(warn=False)).encode('ascii'),
+                   str(period.end_time.to_pydatetime(warn=False)).encode('ascii'))
+
+    def iterator(self, symbol: str, chunk_range=None, **kwargs):
+        for start, end in list(self.get_chunk_ranges(symbol, chunk_range=chunk_range)):
+            yield self.read(symbol, chunk_range=DateRange(pd.Timestamp(start.decode()),
+                                                          pd.Timestamp(end.decode())),
+                            **kwargs)
+
+
+class StandInTickStore(StandInLibrary, TickStore):
+    """
+    Local library with the TickStore interface: reads by date_range/columns, write returns
+    None and min_date/max_date return local tz-aware datetimes. Unlike TickStore, the index
+    read back is left tz-naive.
+    """
+
+    def read(self, symbol: str, date_range=None, columns=None, **kwargs) -> pd.DataFrame:
+        data = super().read(symbol, date_range=date_range).data
+        self.last_read_kwargs = dict(kwargs, date_range=date_range, columns=columns)
+        return data if columns is None else data[list(columns)]
+
+    def read_metadata(self, symbol: str) -> None:
+        return None
+
+    def write(self, symbol: str, data, **kwargs) -> None:
+        super().write(symbol, data)
+
+    def min_date(self, symbol: str):
+        with self._lock:
+            _, data = self._load(symbol)
+        return data.index.min().to_pydatetime().astimezone()
+
+    def max_date(self, symbol: str):
+        with self._lock:
+            _, data = self._load(symbol)
+        return data.index.max().to_pydatetime().astimezone()
+
+
+# lib_type -> library class of the stand-in, VersionStore for any other lib_type
+_LIBRARY_CLASSES = {CHUNK_STORE: StandInChunkStore, TICK_STORE: StandInTickStore}
+
+
+class StandInArctic(LocalArctic):
+    """Local store counting instances, list_libraries() and list_symbols() calls"""
+    library_class = StandInLibrary
+    instances = 0
+    list_libraries_calls = 0
+    list_symbols_calls = 0
+    latency = 0.0  # simulated round-trip (seconds) of every library read/write
+
+    def __init__(self, client: StandInMongoClient):
+        StandInArctic.instances += 1
+        super().__init__(client)
+
+    def list_libraries(self) -> list:
+        StandInArctic.list_libraries_calls += 1
+        return super().list_libraries()
+
+    def initialize_library(self, library: str, lib_type: str = VERSION_STORE,
+                           **kwargs) -> None:
+        _LIBRARY_TYPES[(self._client.host, library)] = lib_type
+        super().initialize_library(library, lib_type=lib_type, **kwargs)
+
+    def __getitem__(self, library: str) -> StandInLibrary:
+        lib_type = _LIBRARY_TYPES.get((self._client.host, library), VERSION_STORE)
+        with self._lock:
+            if library not in self._libraries and lib_type in _LIBRARY_CLASSES:
+                self._libraries[library] = _LIBRARY_CLASSES[lib_type](name=library,
+                                                                      client=self._client)
+        return super().__getitem__(library)
+
+
+def reset_stand_in() -> None:
+    """Clear stored data and counters"""
+    _SERVERS.clear()
+    _LIBRARY_TYPES.clear()
+    StandInMongoClient.instances = 0
+    StandInArctic.instances = 0
+    StandInArctic.list_libraries_calls = 0
+    StandInArctic.list_symbols_calls = 0
+    StandInArctic.latency = 0.0
+
+
+class StandInTestCase(unittest.TestCase):
+    """
+    Test case running the database helpers against the stand-in: the stand-in storage,
+    counters and pooled connections are reset, MongoClient/Arctic are patched, library_name
+    is initialised (as library_type) and a temporary directory is available as temp_dir
+    """
+    library_name = 'security_data'
+    library_type = VERSION_STORE
+
+    def setUp(self) -> None:
+        reset_stand_in()
+        close_connections()
+        self.addCleanup(close_connections)
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.temp_dir.cleanup)
+        self.mongo_config = {'mongo_user': 'user', 'mongo_pwd': 'pwd',
+                             'url_cluster': 'cluster.example.net'}
+        for patch in [mock.patch("dataload.connection.MongoClient", StandInMongoClient),
+                      mock.patch("dataload.connection.Arctic", StandInArctic)]:
+            patch.start()
+            self.addCleanup(patch.stop)
+        if self.library_name is not None:
+            db_arctic_initialise(mongo_config=self.mongo_config, library_name=self.library_name,
+                                 library_type=self.library_type)
@@ -0,0 +1,73 @@
+"""
+Created on: 16 Oct 2026
+
+Benchmark serial db_arctic_read calls against db_arctic_read_batch, using the in-memory
+stand-in with a simulated network round-trip per read.
+Run with: python -m dataload.tests.benchmark_batch_read (from the src folder)
+"""
+from time import time
+from unittest import mock
+
+import numpy as np
+import pandas as pd
+
+from dataload.connection import close_connections
+from dataload.database import (db_arctic_initialise, db_arctic_read, db_arctic_read_batch,
+                               db_arctic_write)
+from dataload.tests.arctic_stand_in import StandInArctic, StandInMongoClient, reset_stand_in
+
+
+def run_benchmark(num_symbols: int = 100,
+                  num_rows: int = 2500,
+                  latency: float = 0.02,
+                  worker_counts: tuple = (1, 4, 8, 16)) -> pd.DataFrame:
+    """
+    Time reading num_symbols symbols serially and in batches of increasing worker count
+
+    Args:
+        num_symbols: Number of symbols written to, then read from, the stand-in library
+        num_rows: Number of daily rows in each symbol
+        latency: Simulated round-trip time (seconds) of each read
+        worker_counts: Thread pool sizes to benchmark db_arctic_read_batch with
+
+    Returns:
+        pd.DataFrame: seconds taken and speed-up over the serial loop for each run
+    """
+    reset_stand_in()
+    close_connections()
+    mongo_config = {'mongo_user': 'user', 'mongo_pwd': 'pwd',
+                    'url_cluster': 'benchmark.example.net'}
+    symbols = [f"security_{i}" for i in range(num_symbols)]
+    dates = pd.date_range('2010-01-01', periods=num_rows, freq='B')
+
+    with mock.patch("dataload.connection.MongoClient", StandInMongoClient), \
+            mock.patch("dataload.connection.Arctic", StandInArctic):
+        db_arctic_initialise(mongo_config=mongo_config, library_name='benchmark',
+                             library_type='VersionStore')
+        for symbol in symbols:
+            db_arctic_write(mongo_config=mongo_config,
+                            df=pd.DataFrame({'price': np.random.randn(num_rows).cumsum()},
+                                            index=dates),
+                            symbol=symbol, library_name='benchmark')
+        StandInArctic.latency = latency
+
+        results = {}
+        start_time = time()
+        for symbol in symbols:
+            db_arctic_read(mongo_config=mongo_config, library='benchmark', symbol=symbol)
+        results['serial'] = time() - start_time
+
+        for workers in worker_counts:
+            start_time = time()
+            db_arctic_read_batch(mongo_config=mongo_config, library='benchmark',
+                                 symbols=symbols, max_workers=workers)
+            results[f'batch ({workers} workers)'] = time() - start_time
+
+    close_connections()
+    summary = pd.DataFrame.from_dict(results, orient='index', columns=['seconds'])
+    summary['speed-up'] = summary.loc['serial', 'seconds'] / summary['seconds']
+    return summary
+
+
+if __name__ == '__main__':
+    print(run_benchmark())
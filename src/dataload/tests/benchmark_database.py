@@ -0,0 +1,87 @@
+"""
+Created on: 16 Oct 2026
+
+Benchmark read, write and append latency/throughput of the database helpers across frame
+sizes, on the local backend (in memory, and in a local directory).
+Run with: python -m dataload.tests.benchmark_database (from the src folder)
+"""
+import tempfile
+from time import perf_counter
+
+import numpy as np
+import pandas as pd
+
+from dataload.connection import close_connections
+from dataload.database import (db_arctic_append, db_arctic_initialise, db_arctic_read,
+                               db_arctic_write)
+
+
+def _time_call(func, repeats: int, **kwargs) -> np.ndarray:
+    timings = []
+    for _ in range(repeats):
+        start_time = perf_counter()
+        func(**kwargs)
+        timings.append(perf_counter() - start_time)
+    return np.array(timings)
+
+
+def run_benchmark(mongo_config: dict,
+                  frame_sizes: tuple = (1000, 10000, 100000, 1000000),
+                  num_columns: int = 5,
+                  append_rows: int = 100,
+                  repeats: int = 5) -> pd.DataFrame:
+    """
+    Time db_arctic_write, db_arctic_append and db_arctic_read for frames of increasing size
+
+    Args:
+        mongo_config: Config of the backend to benchmark, e.g. {"backend": "local"}
+        frame_sizes: Number of rows of the frames written/read
+        num_columns: Number of float columns in each frame
+        append_rows: Number of rows in each append
+        repeats: Number of timed calls per operation and frame size
+
+    Returns:
+        pd.DataFrame: mean/min latency (ms) and throughput (rows per second) per operation
+    """
+    db_arctic_initialise(mongo_config=mongo_config, library_name='benchmark',
+                         library_type='VersionStore')
+    results = []
+    for num_rows in frame_sizes:
+        dates = pd.date_range('1990-01-01', periods=num_rows + append_rows * repeats, freq='min')
+        data = pd.DataFrame(np.random.randn(len(dates), num_columns),
+                            columns=[f"col_{i}" for i in range(num_columns)], index=dates)
+        symbol = f"rows_{num_rows}"
+
+        timings = {
+            'write': (num_rows, _time_call(db_arctic_write, repeats, mongo_config=mongo_config,
+                                           df=data.iloc[:num_rows], symbol=symbol,
+                                           library_name='benchmark'))}
+        append_starts = iter(range(num_rows, len(data), append_rows))
+
+        def append_next():
+            i = next(append_starts)
+            db_arctic_append(mongo_config=mongo_config, df=data.iloc[i:i + append_rows],
+                             symbol=symbol, library_name='benchmark')
+
+        timings['append'] = (append_rows, _time_call(append_next, repeats))
+        timings['read'] = (num_rows, _time_call(db_arctic_read, repeats,
+                                                mongo_config=mongo_config, library='benchmark',
+                                                symbol=symbol))
+
+        for operation, (rows, seconds) in timings.items():
+            results.append({'operation': operation,
+                            'frame_rows': num_rows,
+                            'mean_ms': 1000 * seconds.mean(),
+                            'min_ms': 1000 * seconds.min(),
+                            'rows_per_second': rows / seconds.mean()})
+
+    return pd.DataFrame(results).set_index(['operation', 'frame_rows']).sort_index()
+
+
+if __name__ == '__main__':
+    with tempfile.TemporaryDirectory() as local_dir:
+        for name, config in {'memory': {'backend': 'local'},
+                             'directory': {'backend': 'local', 'local_path': local_dir}}.items():
+            print(f"\nLocal backend ({name}):")
+            print(run_benchmark(mongo_config=config))
+            close_connections()
@@ -0,0 +1,70 @@
+"""
+Created on: 16 Oct 2026
+
+Test the local storage backend through the database helpers
+"""
+import tempfile
+import unittest
+
+import numpy as np
+import pandas as pd
+
+from dataload.connection import close_connections
+from dataload.database import (db_arctic_append, db_arctic_initialise, db_arctic_library,
+                               db_arctic_read, db_arctic_write, db_keys_and_symbols)
+
+
+class TestLocalBackend(unittest.TestCase):
+    def setUp(self) -> None:
+        close_connections()
+        self.local_dir = tempfile.TemporaryDirectory()
+        self.configs = {'memory': {'backend': 'local'},
+                        'directory': {'backend': 'local', 'local_path': self.local_dir.name}}
+        self.data = pd.DataFrame({'price': np.arange(6.)},
+                                 index=pd.date_range('2020-01-01', periods=6))
+
+    def tearDown(self) -> None:
+        close_connections()
+        self.local_dir.cleanup()
+
+    def test_write_append_read_list(self):
+        for name, config in self.configs.items():
+            with self.subTest(backend=name):
+                db_arctic_initialise(mongo_config=config, library_name='security_data',
+                                     library_type='VersionStore')
+                db_arctic_write(mongo_config=config, df=self.data.iloc[:3], symbol='GOOGL',
+                                library_name='security_data')
+                db_arctic_append(mongo_config=config, df=self.data.iloc[3:], symbol='GOOGL',
+                                 library_name='security_data')
+                db_arctic_append(mongo_config=config, df=self.data, symbol='TSLA',
+                                 library_name='security_data')
+
+                self.assertEqual(db_arctic_library(mongo_config=config), ['security_data'])
+                self.assertEqual(db_keys_and_symbols(is_arctic=True,
+                                                     library_name='security_data',
+                                                     mongo_config=config),
+                                 ['GOOGL', 'TSLA'])
+                pd.testing.assert_frame_equal(
+                    db_arctic_read(mongo_config=config, library='security_data',
+                                   symbol='GOOGL', start='2020-01-03'),
+                    self.data.iloc[2:], check_freq=False)
+
+    def test_directory_backend_persists(self):
+        config = self.configs['directory']
+        db_arctic_initialise(mongo_config=config, library_name='security_data',
+                             library_type='VersionStore')
+        db_arctic_write(mongo_config=config, df=self.data, symbol='GOOGL/A',
+                        library_name='security_data')
+        close_connections()
+
+        pd.testing.assert_frame_equal(
+            db_arctic_read(mongo_config=config, library='security_data', symbol='GOOGL/A'),
+            self.data)
+
+    def test_unknown_backend(self):
+        with self.assertRaises(KeyError):
+            db_arctic_library(mongo_config={'backend': 'missing'})
+
+
+if __name__ == '__main__':
+    unittest.main()
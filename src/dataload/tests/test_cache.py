@@ -0,0 +1,128 @@
+"""
+Created on: 16 Oct 2026
+
+Test the local on-disk read-through cache for Arctic reads
+"""
+import tempfile
+import unittest
+from unittest import mock
+
+import numpy as np
+import pandas as pd
+
+from dataload.cache import FrameCache
+from dataload.connection import close_connections, store_key
+from dataload.database import db_arctic_initialise, db_arctic_read, db_arctic_write
+from dataload.tests.arctic_stand_in import StandInTestCase
+
+
+class TestFrameCache(unittest.TestCase):
+    def setUp(self) -> None:
+        self.cache_dir = tempfile.TemporaryDirectory()
+        self.data = pd.DataFrame(
+            {'price': np.arange(5.), 'ticker': list('abcde')},
+            index=pd.date_range('2020-01-01', periods=5, name='date', tz='Europe/London'))
+
+    def tearDown(self) -> None:
+        self.cache_dir.cleanup()
+
+    def test_put_get_roundtrip(self):
+        cache = FrameCache(cache_dir=self.cache_dir.name)
+        self.assertIsNone(cache.get('store', 'lib', 'sym'))
+        cache.put('store', 'lib', 'sym', 3, self.data)
+
+        # a new cache over the same directory picks up the persisted entries
+        cache = FrameCache(cache_dir=self.cache_dir.name)
+        pd.testing.assert_frame_equal(cache.get('store', 'lib', 'sym'), self.data)
+        self.assertEqual(cache.version('store', 'lib', 'sym'), 3)
+        self.assertEqual((cache.stats()['hits'], cache.stats()['misses']), (1, 0))
+
+    def test_column_labels_and_dtypes_roundtrip(self):
+        cache = FrameCache(cache_dir=self.cache_dir.name)
+        frames = {'int_labels': pd.DataFrame({0: [1.5, 2.5], 1: ['x', 'y']}),
+                  'tuple_labels': pd.DataFrame(
+                      [[1, 2.], [3, 4.]],
+                      columns=pd.MultiIndex.from_tuples([('px', 1), ('px', 2)],
+                                                        names=['field', 'n'])),
+                  'string_index': pd.DataFrame({'flag': [True, False]},
+                                               index=pd.Index(['a', 'b'], name='key'))}
+        for symbol, frame in frames.items():
+            self.assertTrue(cache.put('store', 'lib', symbol, 1, frame))
+            pd.testing.assert_frame_equal(cache.get('store', 'lib', symbol), frame)
+
+    def test_unsupported_frames_not_cached(self):
+        cache = FrameCache(cache_dir=self.cache_dir.name)
+        frames = {'categorical': self.data.astype({'ticker': 'category'}),
+                  'mixed_objects': self.data.assign(ticker=['a', 1, None, 'd', 2.]),
+                  'timestamp_labels': pd.DataFrame({pd.Timestamp('2020-01-01'): [1.]})}
+        for symbol, frame in frames.items():
+            self.assertFalse(cache.put('store', 'lib', symbol, 1, frame))
+            self.assertIsNone(cache.get('store', 'lib', symbol))
+        self.assertEqual(cache.stats()['entries'], 0)
+
+    def test_lru_eviction(self):
+        cache = FrameCache(cache_dir=self.cache_dir.name)
+        cache.put('store', 'lib', 'sym_a', 1, self.data)
+        cache.max_bytes = 2 * cache.size_bytes
+        cache.put('store', 'lib', 'sym_b', 1, self.data)
+        cache.get('store', 'lib', 'sym_a')  # sym_b is now least recently used
+        cache.put('store', 'lib', 'sym_c', 1, self.data)
+
+        self.assertEqual(cache.stats()['evictions'], 1)
+        self.assertIsNone(cache.get('store', 'lib', 'sym_b'))
+        self.assertIsNotNone(cache.get('store', 'lib', 'sym_a'))
+
+
+class TestReadThroughCache(StandInTestCase):
+    def setUp(self) -> None:
+        super().setUp()
+        self.cache = FrameCache(cache_dir=self.temp_dir.name)
+        db_arctic_write(mongo_config=self.mongo_config,
+                        df=pd.DataFrame({'price': np.arange(5.)},
+                                        index=pd.date_range('2020-01-01', periods=5)),
+                        symbol='stock_a', library_name='security_data')
+
+    def test_warm_read_does_not_connect(self):
+        cold = db_arctic_read(mongo_config=self.mongo_config, library='security_data',
+                              symbol='stock_a', cache=self.cache)
+        close_connections()
+        with mock.patch("dataload.connection.MongoClient", side_effect=AssertionError):
+            warm = db_arctic_read(mongo_config=self.mongo_config, library='security_data',
+                                  symbol='stock_a', cache=self.cache)
+        pd.testing.assert_frame_equal(warm, cold)
+        self.assertEqual((self.cache.stats()['hits'], self.cache.stats()['misses']), (1, 1))
+
+    def test_write_invalidates(self):
+        db_arctic_read(mongo_config=self.mongo_config, library='security_data',
+                       symbol='stock_a', cache=self.cache)
+        db_arctic_write(mongo_config=self.mongo_config,
+                        df=pd.DataFrame({'price': [10.]},
+                                        index=pd.date_range('2021-01-01', periods=1)),
+                        symbol='stock_a', library_name='security_data')
+        out = db_arctic_read(mongo_config=self.mongo_config, library='security_data',
+                             symbol='stock_a', cache=self.cache)
+        self.assertEqual(out['price'].tolist(), [10.])
+        self.assertEqual(self.cache.version(store_key(self.mongo_config), 'security_data',
+                                            'stock_a'), 2)
+
+    def test_stores_do_not_share_entries(self):
+        frames = {}
+        for name in ['a', 'b']:
+            local_config = {'backend': 'local',
+                            'local_path': f"{self.temp_dir.name}/store_{name}"}
+            frame = pd.DataFrame({'price': [1. if name == 'a' else 2.]},
+                                 index=pd.date_range('2020-01-01', periods=1))
+            db_arctic_initialise(mongo_config=local_config, library_name='security_data',
+                                 library_type='VersionStore')
+            db_arctic_write(mongo_config=local_config, df=frame, symbol='stock_a',
+                            library_name='security_data')
+            frames[name] = (local_config, frame)
+        for local_config, frame in frames.values():
+            pd.testing.assert_frame_equal(
+                db_arctic_read(mongo_config=local_config, library='security_data',
+                               symbol='stock_a', cache=self.cache), frame)
+        self.assertEqual(self.cache.stats()['misses'], 2)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,117 @@
+"""
+Created on: 16 Oct 2026
+
+Test the cached library/symbol metadata catalog, against the in-memory stand-in
+"""
+import unittest
+from unittest import mock
+
+import numpy as np
+import pandas as pd
+from arctic import CHUNK_STORE
+
+from dataload.connection import get_catalog, refresh_connections
+from dataload.database import (db_arctic_append, db_arctic_library, db_arctic_read,
+                               db_arctic_write, db_connect, db_keys_and_symbols)
+from dataload.tests.arctic_stand_in import StandInArctic, StandInTestCase
+
+
+class TestMetadataCatalog(StandInTestCase):
+    def setUp(self) -> None:
+        super().setUp()
+        self.data = pd.DataFrame({'price': np.arange(10.)},
+                                 index=pd.date_range('2020-01-01', periods=10, name='date'))
+        for symbol in ['AAPL', 'TSLA']:
+            db_arctic_write(mongo_config=self.mongo_config, df=self.data, symbol=symbol,
+                            library_name='security_data')
+
+    def test_symbols_listed_once(self):
+        for _ in range(5):
+            symbols = db_keys_and_symbols(is_arctic=True, library_name='security_data',
+                                          mongo_config=self.mongo_config)
+            db_arctic_read(mongo_config=self.mongo_config, library='security_data',
+                           symbol='TSLA')
+        self.assertEqual(symbols, ['AAPL', 'TSLA'])
+        self.assertEqual(StandInArctic.list_symbols_calls, 1)
+
+    def test_libraries_cached(self):
+        self.assertEqual(db_arctic_library(mongo_config=self.mongo_config), ['security_data'])
+        calls = StandInArctic.list_libraries_calls
+        db_arctic_library(mongo_config=self.mongo_config)
+        self.assertEqual(StandInArctic.list_libraries_calls, calls)
+
+    def test_unknown_symbol_relisted_once(self):
+        get_catalog(self.mongo_config).symbols('security_data')
+        with self.assertRaises(AssertionError):
+            db_arctic_read(mongo_config=self.mongo_config, library='security_data',
+                           symbol='MSFT')
+        self.assertEqual(StandInArctic.list_symbols_calls, 2)
+
+    def test_ttl_expiry_refetches(self):
+        catalog = get_catalog(self.mongo_config, ttl=60)
+        catalog.symbols('security_data')
+        with mock.patch("dataload.catalog.time", return_value=1e12):
+            catalog.symbols('security_data')
+        self.assertEqual(StandInArctic.list_symbols_calls, 2)
+
+    def test_symbol_info_tracks_writes(self):
+        catalog = get_catalog(self.mongo_config)
+        info = catalog.symbol_info('security_data', 'TSLA')
+        self.assertEqual(info['rows'], 10)
+        self.assertEqual(info['end'], self.data.index[-1])
+
+        new_rows = pd.DataFrame({'price': [10., 11.]},
+                                index=pd.date_range('2020-01-11', periods=2, name='date'))
+        with mock.patch("dataload.catalog._fetch_symbol_info") as fetch:
+            db_arctic_append(mongo_config=self.mongo_config, df=new_rows, symbol='TSLA',
+                             library_name='security_data')
+            info = catalog.symbol_info('security_data', 'TSLA')
+        fetch.assert_not_called()
+        self.assertEqual(info['rows'], 12)
+        self.assertEqual(info['end'], new_rows.index[-1])
+        self.assertEqual(info['version'], 2)
+
+    def test_refresh_keeps_recorded_range_of_same_version(self):
+        catalog = get_catalog(self.mongo_config)
+        lib = db_connect(mongo_config=self.mongo_config, is_arctic=True,
+                         lib_name='security_data')
+        # as an Arctic VersionStore, whose get_info has no date range
+        with mock.patch.object(lib, 'get_info', return_value={'rows': 10}):
+            info = catalog.symbol_info('security_data', 'TSLA', refresh=True)
+            self.assertEqual(info['end'], self.data.index[-1])
+
+            lib.write('TSLA', self.data.iloc[:5])
+            info = catalog.symbol_info('security_data', 'TSLA', refresh=True)
+        self.assertEqual(info['version'], 2)
+        self.assertIsNone(info['end'])
+
+    def test_refresh_invalidates(self):
+        catalog = get_catalog(self.mongo_config)
+        catalog.symbols('security_data')
+        refresh_connections(self.mongo_config)
+        catalog.symbols('security_data')
+        self.assertEqual(StandInArctic.list_symbols_calls, 2)
+
+
+class TestChunkStoreCatalog(StandInTestCase):
+    library_name = 'chunked_data'
+    library_type = CHUNK_STORE
+
+    def test_symbol_info_decodes_chunk_ranges(self):
+        data = pd.DataFrame({'price': np.arange(50.)},
+                            index=pd.date_range('2020-01-15', periods=50, name='date'))
+        db_arctic_write(mongo_config=self.mongo_config, df=data, symbol='TSLA',
+                        library_name='chunked_data')
+        lib = db_connect(mongo_config=self.mongo_config, is_arctic=True,
+                         lib_name='chunked_data')
+        self.assertIsInstance(next(lib.get_chunk_ranges('TSLA'))[0], bytes)
+
+        info = get_catalog(self.mongo_config).symbol_info('chunked_data', 'TSLA', refresh=True)
+        self.assertEqual(info['rows'], 50)
+        self.assertEqual(info['start'], pd.Timestamp('2020-01-01'))
+        self.assertEqual(info['end'], pd.Timestamp('2020-03-31 23:59:59.999999'))
+        self.assertIsNone(info['version'])
+
+
+if __name__ == '__main__':
+    unittest.main()
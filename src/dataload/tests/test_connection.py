@@ -0,0 +1,54 @@
+"""
+Created on: 16 Oct 2026
+
+Test the pooled connection registry behind db_connect, against the in-memory stand-in
+"""
+import unittest
+from unittest import mock
+
+from dataload.connection import close_connections, get_registry, refresh_connections
+from dataload.database import db_connect
+from dataload.tests.arctic_stand_in import StandInArctic, StandInMongoClient, StandInTestCase
+
+
+class TestConnectionRegistry(StandInTestCase):
+    def test_connection_is_reused(self):
+        for _ in range(10):
+            db_connect(mongo_config=self.mongo_config, is_arctic=True,
+                       lib_name='security_data')
+        self.assertEqual(StandInMongoClient.instances, 1)
+        self.assertEqual(StandInArctic.instances, 1)
+        self.assertEqual(len(get_registry()), 1)
+
+    def test_library_names_cached_until_refresh(self):
+        db_connect(mongo_config=self.mongo_config, is_arctic=True, lib_name='security_data')
+        calls = StandInArctic.list_libraries_calls
+        db_connect(mongo_config=self.mongo_config, is_arctic=True, lib_name='security_data')
+        self.assertEqual(StandInArctic.list_libraries_calls, calls)
+
+        refresh_connections(self.mongo_config)
+        db_connect(mongo_config=self.mongo_config, is_arctic=True, lib_name='security_data')
+        self.assertEqual(StandInArctic.list_libraries_calls, calls + 1)
+
+    def test_unknown_library_raises(self):
+        with self.assertRaises(AssertionError):
+            db_connect(mongo_config=self.mongo_config, is_arctic=True, lib_name='missing')
+
+    def test_pool_size_and_close(self):
+        config = dict(self.mongo_config, max_pool_size=5)
+        client = db_connect(mongo_config=config, is_arctic=False)
+        self.assertEqual(client.kwargs['maxPoolSize'], 5)
+
+        close_connections(config)
+        self.assertTrue(client.is_closed)
+        self.assertIsNot(db_connect(mongo_config=config, is_arctic=False), client)
+
+    def test_connections_dropped_after_fork(self):
+        db_connect(mongo_config=self.mongo_config, is_arctic=False)
+        with mock.patch("dataload.connection.os.getpid", return_value=-1):
+            db_connect(mongo_config=self.mongo_config, is_arctic=False)
+        self.assertEqual(StandInMongoClient.instances, 2)
+
+
+if __name__ == '__main__':
+    unittest.main()
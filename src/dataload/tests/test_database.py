@@ -6,12 +6,20 @@ Test database functions for MongoDB (non-relational database)
 """
 import json
 import unittest
+import warnings
+from unittest import mock
 
 # 3rd party import
+import numpy as np
+import pandas as pd
+from arctic import CHUNK_STORE, TICK_STORE
 from pymongo import MongoClient
 
 # local import
-from src.dataload.database import (db_connect, db_keys_and_symbols)
+from dataload.database import (db_arctic_initialise, db_arctic_iterator, db_arctic_read,
+                               db_arctic_read_batch, db_arctic_write, db_connect,
+                               db_keys_and_symbols)
+from dataload.tests.arctic_stand_in import StandInTestCase
 
 
 class TestMongoDB(unittest.TestCase):
@@ -43,5 +51,116 @@ class TestMongoDB(unittest.TestCase):
                                 mongo_config=self.mongo_config))
 
 
+class TestArcticStandIn(StandInTestCase):
+    """Arctic helpers run against the in-memory stand-in, no Atlas config needed"""
+
+    def setUp(self) -> None:
+        super().setUp()
+        dates = pd.date_range('2020-01-01', periods=5)
+        for i, symbol in enumerate(['stock_a', 'stock_b']):
+            db_arctic_write(mongo_config=self.mongo_config,
+                            df=pd.DataFrame({'price': np.arange(5.) + i,
+                                             'volume': np.arange(5.) * 100},
+                                            index=dates),
+                            symbol=symbol,
+                            library_name='security_data')
+
+    def test_db_arctic_read__date_range_and_columns(self):
+        out = db_arctic_read(mongo_config=self.mongo_config, library='security_data',
+                             symbol='stock_a', start='2020-01-02', end='2020-01-03',
+                             columns=['price'])
+        pd.testing.assert_frame_equal(
+            out,
+            pd.DataFrame({'price': [1.0, 2.0]},
+                         index=pd.date_range('2020-01-02', periods=2, freq='D')))
+
+        lib = db_connect(mongo_config=self.mongo_config, is_arctic=True,
+                         lib_name='security_data')
+        date_range = lib.last_read_kwargs['date_range']
+        self.assertEqual((date_range.start, date_range.end),
+                         (pd.Timestamp('2020-01-02'), pd.Timestamp('2020-01-03')))
+
+    def test_db_arctic_iterator(self):
+        by_rows = list(db_arctic_iterator(mongo_config=self.mongo_config,
+                                          library='security_data', symbol='stock_a',
+                                          chunk_rows=2))
+        self.assertEqual([len(chunk) for chunk in by_rows], [2, 2, 1])
+
+        by_period = list(db_arctic_iterator(mongo_config=self.mongo_config,
+                                            library='security_data', symbol='stock_a',
+                                            period='2D', start='2020-01-01', end='2020-01-05',
+                                            columns=['price']))
+        self.assertEqual([len(chunk) for chunk in by_period], [2, 2, 1])
+        pd.testing.assert_frame_equal(
+            pd.concat(by_period),
+            db_arctic_read(mongo_config=self.mongo_config, library='security_data',
+                           symbol='stock_a', columns=['price']),
+            check_freq=False)
+
+    def test_db_arctic_read_batch(self):
+        data, failures = db_arctic_read_batch(mongo_config=self.mongo_config,
+                                              library='security_data',
+                                              symbols=['stock_a', 'stock_b', 'stock_c'],
+                                              max_workers=2)
+        self.assertEqual(sorted(data), ['stock_a', 'stock_b'])
+        self.assertEqual(list(failures), ['stock_c'])
+        self.assertEqual(data['stock_b']['price'].iloc[0], 1.0)
+
+    def test_db_arctic_read_batch__wide(self):
+        data, failures = db_arctic_read_batch(mongo_config=self.mongo_config,
+                                              library='security_data',
+                                              symbols=['stock_a', 'stock_b'],
+                                              as_wide=True,
+                                              column='price')
+        self.assertEqual(failures, {})
+        self.assertEqual(list(data.columns), ['stock_a', 'stock_b'])
+        np.testing.assert_array_equal(data['stock_b'].values - data['stock_a'].values,
+                                      np.ones(5))
+
+
+class TestArcticIteratorStores(StandInTestCase):
+    """Period iteration without start/end is bounded by the stored range of the symbol"""
+
+    def setUp(self) -> None:
+        super().setUp()
+        self.data = pd.DataFrame({'price': np.arange(50.)},
+                                 index=pd.date_range('2020-01-15', periods=50, name='date'))
+
+    def _iterate_by_period(self, library: str, library_type: str, period: str = None,
+                           **kwargs):
+        db_arctic_initialise(mongo_config=self.mongo_config, library_name=library,
+                             library_type=library_type)
+        db_arctic_write(mongo_config=self.mongo_config, df=self.data, symbol='TSLA',
+                        library_name=library)
+        lib = db_connect(mongo_config=self.mongo_config, is_arctic=True, lib_name=library)
+        with mock.patch.object(lib, 'read', wraps=lib.read) as read, \
+                warnings.catch_warnings():
+            warnings.simplefilter('error')
+            chunks = list(db_arctic_iterator(mongo_config=self.mongo_config, library=library,
+                                             symbol='TSLA', period=period, **kwargs))
+        pd.testing.assert_frame_equal(pd.concat(chunks), self.data, check_freq=False)
+        return chunks, read.call_args_list
+
+    def test_chunk_store_period(self):
+        chunks, reads = self._iterate_by_period('chunked_data', CHUNK_STORE, period='M')
+        self.assertEqual([len(chunk) for chunk in chunks], [17, 29, 4])
+        self.assertTrue(all(call.kwargs['chunk_range'] is not None for call in reads))
+
+    def test_tick_store_period(self):
+        chunks, reads = self._iterate_by_period('ticks', TICK_STORE, period='M')
+        self.assertEqual([len(chunk) for chunk in chunks], [17, 29, 4])
+        date_ranges = [call.kwargs['date_range'] for call in reads]
+        self.assertEqual(len(date_ranges), 3)
+        self.assertEqual((date_ranges[0].start, date_ranges[-1].end),
+                         (self.data.index[0], self.data.index[-1]))
+
+    def test_tick_store_chunk_rows(self):
+        chunks, reads = self._iterate_by_period('ticks', TICK_STORE, chunk_rows=20)
+        self.assertEqual([len(chunk) for chunk in chunks], [20, 20, 10])
+        # one bounded read per day rather than one read of the whole symbol
+        self.assertEqual(len(reads), len(self.data))
+        self.assertTrue(all(call.kwargs['date_range'].start is not None for call in reads))
+
+
 if __name__ == '__main__':
     unittest.main()
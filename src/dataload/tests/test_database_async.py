@@ -0,0 +1,103 @@
+"""
+Created on: 16 Oct 2026
+
+Test the asyncio variant of the database helpers, against the in-memory stand-in
+"""
+import asyncio
+import threading
+import time
+import unittest
+from unittest import mock
+
+import numpy as np
+import pandas as pd
+
+from dataload import database_async
+from dataload.database_async import (db_arctic_append_async, db_arctic_read_async,
+                                     db_arctic_read_batch_async, db_arctic_write_async,
+                                     db_keys_and_symbols_async, set_max_concurrency)
+from dataload.tests.arctic_stand_in import StandInArctic, StandInTestCase
+
+
+class TestDatabaseAsync(StandInTestCase):
+    def setUp(self) -> None:
+        super().setUp()
+        self.dates = pd.date_range('2020-01-01', periods=4)
+
+    def test_write_append_read(self):
+        async def run():
+            await db_arctic_write_async(
+                mongo_config=self.mongo_config, symbol='stock_a', library_name='security_data',
+                df=pd.DataFrame({'price': [1., 2.]}, index=self.dates[:2]))
+            await db_arctic_append_async(
+                mongo_config=self.mongo_config, symbol='stock_a', library_name='security_data',
+                df=pd.DataFrame({'price': [3., 4.]}, index=self.dates[2:]))
+            symbols = await db_keys_and_symbols_async(is_arctic=True,
+                                                      library_name='security_data',
+                                                      mongo_config=self.mongo_config)
+            frame = await db_arctic_read_async(mongo_config=self.mongo_config,
+                                               library='security_data', symbol='stock_a')
+            return symbols, frame
+
+        symbols, frame = asyncio.run(run())
+        self.assertEqual(symbols, ['stock_a'])
+        self.assertEqual(frame['price'].tolist(), [1., 2., 3., 4.])
+
+    def test_batch_read_does_not_block_loop(self):
+        symbols = [f"stock_{i}" for i in range(8)]
+
+        async def run():
+            for symbol in symbols:
+                await db_arctic_write_async(
+                    mongo_config=self.mongo_config, symbol=symbol, library_name='security_data',
+                    df=pd.DataFrame({'price': np.arange(4.)}, index=self.dates))
+            StandInArctic.latency = 0.05
+            ticks = []
+
+            async def ticker():
+                for _ in range(5):
+                    ticks.append(1)
+                    await asyncio.sleep(0.01)
+
+            (data, failures), _ = await asyncio.gather(
+                db_arctic_read_batch_async(mongo_config=self.mongo_config,
+                                           library='security_data',
+                                           symbols=symbols + ['missing'],
+                                           max_concurrency=4, as_wide=True),
+                ticker())
+            return data, failures, ticks
+
+        data, failures, ticks = asyncio.run(run())
+        self.assertEqual(list(data.columns), symbols)
+        self.assertEqual(list(failures), ['missing'])
+        self.assertEqual(len(ticks), 5)
+
+    def test_batch_concurrency_above_shared_pool(self):
+        self.addCleanup(set_max_concurrency, database_async.DEFAULT_MAX_CONCURRENCY)
+        set_max_concurrency(1)
+        # every read waits for the others, so the batch only completes with 4 in flight
+        in_flight = threading.Barrier(4, timeout=5)
+
+        def read(symbol: str, **kwargs) -> pd.DataFrame:
+            in_flight.wait()
+            return pd.DataFrame({'price': [1.]}, index=self.dates[:1])
+
+        with mock.patch("dataload.database_async.db_arctic_read", side_effect=read):
+            data, failures = asyncio.run(db_arctic_read_batch_async(
+                mongo_config=self.mongo_config, library='security_data',
+                symbols=[f"stock_{i}" for i in range(4)], max_concurrency=4))
+        self.assertEqual(failures, {})
+        self.assertEqual(len(data), 4)
+
+    def test_resize_does_not_wait_for_running_calls(self):
+        self.addCleanup(set_max_concurrency, database_async.DEFAULT_MAX_CONCURRENCY)
+        running = database_async._get_executor().submit(time.sleep, 0.5)
+        started = time.time()
+        set_max_concurrency(2)
+        self.assertLess(time.time() - started, 0.25)
+        self.assertEqual(database_async._get_executor()._max_workers, 2)
+        running.result(timeout=5)  # the call already submitted still completes
+
+
+if __name__ == '__main__':
+    unittest.main()
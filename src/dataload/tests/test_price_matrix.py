@@ -0,0 +1,76 @@
+"""
+Created on: 16 Oct 2026
+
+Test the memory-mapped price matrix store
+"""
+import tempfile
+import unittest
+
+import numpy as np
+import pandas as pd
+
+from dataload.price_matrix import PriceMatrixStore
+from securityAnalysis.utils_finance import calculate_performance_metrics, calculate_return_df
+
+
+class TestPriceMatrixStore(unittest.TestCase):
+    def setUp(self) -> None:
+        self.directory = tempfile.TemporaryDirectory()
+        self.panel = pd.DataFrame(
+            100 + np.random.rand(50, 6).cumsum(axis=0),
+            index=pd.bdate_range('2020-01-01', periods=50, name='date'),
+            columns=[f"ticker_{i}" for i in range(6)])
+        self.store = PriceMatrixStore.write(path=self.directory.name, panel=self.panel,
+                                            block_columns=4)
+
+    def tearDown(self) -> None:
+        self.directory.cleanup()
+
+    def test_roundtrip(self):
+        store = PriceMatrixStore(self.directory.name)
+        self.assertEqual(store.shape, (50, 6))
+        pd.testing.assert_frame_equal(store.read(), self.panel, check_freq=False)
+
+    def test_tz_aware_roundtrip(self):
+        # hourly across the DST change, where local wall times repeat
+        panel = pd.DataFrame(
+            np.arange(12.).reshape(6, 2),
+            index=pd.date_range('2020-10-25 00:00', periods=6, freq='h', tz='Europe/London',
+                                name='date'),
+            columns=['ticker_0', 'ticker_1'])
+        with tempfile.TemporaryDirectory() as directory:
+            PriceMatrixStore.write(path=directory, panel=panel)
+            store = PriceMatrixStore(directory)
+            pd.testing.assert_frame_equal(store.read(), panel, check_freq=False)
+            pd.testing.assert_frame_equal(
+                store.read(start='2020-10-25 00:30', end=pd.Timestamp('2020-10-25 03:00+00:00')),
+                panel.iloc[1:5], check_freq=False)
+
+    def test_read_slices(self):
+        tickers = ['ticker_2', 'ticker_3']
+        frame = self.store.read(tickers=tickers, start='2020-01-10', end='2020-02-03')
+        pd.testing.assert_frame_equal(frame, self.panel.loc['2020-01-10':'2020-02-03', tickers],
+                                      check_freq=False)
+        self.assertTrue(np.shares_memory(frame.to_numpy(), self.store.values()))
+
+        scattered = self.store.read(tickers=['ticker_5', 'ticker_0'])
+        pd.testing.assert_frame_equal(scattered, self.panel[['ticker_5', 'ticker_0']],
+                                      check_freq=False)
+
+        with self.assertRaises(AssertionError):
+            self.store.read(tickers=['missing'])
+
+    def test_utils_finance_reads_without_copy(self):
+        frame = self.store.read(start='2020-01-06')
+        out = np.empty((len(frame) - 1, frame.shape[1]))
+        returns = calculate_return_df(frame, is_log_return=True, out=out)
+        self.assertTrue(np.shares_memory(returns.to_numpy(), out))
+        pd.testing.assert_frame_equal(
+            returns, calculate_return_df(self.panel.loc['2020-01-06':], is_log_return=True),
+            check_freq=False)
+        pd.testing.assert_frame_equal(calculate_performance_metrics(frame),
+                                      calculate_performance_metrics(self.panel.loc['2020-01-06':]))
+
+
+if __name__ == '__main__':
+    unittest.main()
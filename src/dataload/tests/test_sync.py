@@ -0,0 +1,146 @@
+"""
+Created on: 16 Oct 2026
+
+Test the incremental Arctic sync against the in-memory stand-in
+"""
+import unittest
+from unittest import mock
+
+import numpy as np
+import pandas as pd
+from arctic import CHUNK_STORE
+
+from dataload.connection import get_catalog
+from dataload.database import db_arctic_read, db_arctic_write, db_connect
+from dataload.sync import db_arctic_sync
+from dataload.tests.arctic_stand_in import StandInTestCase
+
+
+class TestArcticSync(StandInTestCase):
+    def setUp(self) -> None:
+        super().setUp()
+        self.history = pd.DataFrame({'price': np.arange(20.), 'volume': np.arange(20) * 10},
+                                    index=pd.date_range('2020-01-01', periods=20, name='date'))
+        db_arctic_write(mongo_config=self.mongo_config, df=self.history.iloc[:15],
+                        symbol='TSLA', library_name='security_data')
+
+    def _read(self, symbol: str = 'TSLA') -> pd.DataFrame:
+        return db_arctic_read(mongo_config=self.mongo_config, library='security_data',
+                              symbol=symbol)
+
+    def _version(self, symbol: str = 'TSLA') -> int:
+        lib = db_connect(mongo_config=self.mongo_config, is_arctic=True,
+                         lib_name='security_data')
+        return lib.read_metadata(symbol).version
+
+    def test_appends_only_new_rows(self):
+        summary = db_arctic_sync(mongo_config=self.mongo_config, library_name='security_data',
+                                 data={'TSLA': self.history})
+        row = summary.loc['TSLA']
+        self.assertEqual(row['action'], 'append')
+        self.assertEqual((row['rows_written'], row['rows_skipped'], row['rows_revised']),
+                         (5, 15, 0))
+        pd.testing.assert_frame_equal(self._read(), self.history, check_freq=False)
+
+    def test_new_tail_needs_no_read(self):
+        with mock.patch("dataload.sync.db_arctic_read") as read:
+            db_arctic_sync(mongo_config=self.mongo_config, library_name='security_data',
+                           data={'TSLA': self.history.iloc[15:]})
+        read.assert_not_called()
+        pd.testing.assert_frame_equal(self._read(), self.history, check_freq=False)
+
+    def test_append_by_another_writer_is_read(self):
+        get_catalog(self.mongo_config).symbol_info('security_data', 'TSLA')
+        lib = db_connect(mongo_config=self.mongo_config, is_arctic=True,
+                         lib_name='security_data')
+        # written around the helpers, so the catalog still has the old end
+        lib.append('TSLA', self.history.iloc[15:18])
+        summary = db_arctic_sync(mongo_config=self.mongo_config, library_name='security_data',
+                                 data={'TSLA': self.history.iloc[15:]})
+        self.assertEqual((summary.loc['TSLA', 'rows_written'],
+                          summary.loc['TSLA', 'rows_skipped']), (2, 3))
+        pd.testing.assert_frame_equal(self._read(), self.history, check_freq=False)
+
+    def test_up_to_date_symbol_is_untouched(self):
+        summary = db_arctic_sync(mongo_config=self.mongo_config, library_name='security_data',
+                                 data={'TSLA': self.history.iloc[:15]})
+        self.assertEqual(summary.loc['TSLA', 'action'], 'none')
+        self.assertEqual(summary.loc['TSLA', 'rows_skipped'], 15)
+        self.assertEqual(self._version(), 1)
+
+    def test_new_symbol_is_written(self):
+        summary = db_arctic_sync(mongo_config=self.mongo_config, library_name='security_data',
+                                 data={'AAPL': self.history, 'TSLA': self.history})
+        self.assertEqual(list(summary['action']), ['write', 'append'])
+        pd.testing.assert_frame_equal(self._read('AAPL'), self.history, check_freq=False)
+
+    def test_revisions(self):
+        revised = self.history.copy()
+        revised.iloc[3, 0] = 100.
+
+        skipped = db_arctic_sync(mongo_config=self.mongo_config,
+                                 library_name='security_data', data={'TSLA': revised})
+        self.assertEqual(skipped.loc['TSLA', 'rows_revised'], 1)
+        self.assertEqual(self._read().iloc[3, 0], 3.)
+
+        revised.iloc[4, 1] = -1
+        failed = db_arctic_sync(mongo_config=self.mongo_config, library_name='security_data',
+                                data={'TSLA': revised}, on_revision='fail')
+        self.assertEqual(failed.loc['TSLA', 'action'], 'failed')
+        self.assertIn('ValueError', failed.loc['TSLA', 'error'])
+
+        rewritten = db_arctic_sync(mongo_config=self.mongo_config,
+                                   library_name='security_data', data={'TSLA': revised},
+                                   on_revision='rewrite')
+        self.assertEqual(rewritten.loc['TSLA', 'action'], 'rewrite')
+        self.assertEqual(rewritten.loc['TSLA', 'rows_revised'], 2)
+        pd.testing.assert_frame_equal(self._read(), revised, check_freq=False)
+
+    def test_tolerance_and_nan(self):
+        stored = self.history.iloc[:15].copy()
+        stored.iloc[2, 0] = np.nan
+        db_arctic_write(mongo_config=self.mongo_config, df=stored, symbol='TSLA',
+                        library_name='security_data')
+        incoming = stored.copy()
+        incoming['price'] *= 1 + 1e-12
+        summary = db_arctic_sync(mongo_config=self.mongo_config, library_name='security_data',
+                                 data={'TSLA': incoming})
+        self.assertEqual(summary.loc['TSLA', 'rows_revised'], 0)
+
+
+class TestChunkStoreSync(StandInTestCase):
+    """Sync against a ChunkStore, whose stored end date comes from the chunk ranges"""
+    library_name = 'chunked_data'
+    library_type = CHUNK_STORE
+
+    def setUp(self) -> None:
+        super().setUp()
+        self.history = pd.DataFrame({'price': np.arange(20.)},
+                                    index=pd.date_range('2020-01-20', periods=20, name='date'))
+        db_arctic_write(mongo_config=self.mongo_config, df=self.history.iloc[:15],
+                        symbol='TSLA', library_name='chunked_data')
+        # as in a fresh process, the stored range is fetched from the store
+        get_catalog(self.mongo_config).invalidate()
+
+    def test_appends_only_new_rows(self):
+        summary = db_arctic_sync(mongo_config=self.mongo_config, library_name='chunked_data',
+                                 data={'TSLA': self.history})
+        self.assertEqual(summary.loc['TSLA', 'action'], 'append')
+        self.assertEqual(summary.loc['TSLA', 'rows_written'], 5)
+        pd.testing.assert_frame_equal(
+            db_arctic_read(mongo_config=self.mongo_config, library='chunked_data',
+                           symbol='TSLA'),
+            self.history, check_freq=False)
+
+    def test_tail_after_last_chunk_needs_no_read(self):
+        tail = pd.DataFrame({'price': [100., 101.]},
+                            index=pd.date_range('2020-03-02', periods=2, name='date'))
+        with mock.patch("dataload.sync.db_arctic_read") as read:
+            summary = db_arctic_sync(mongo_config=self.mongo_config,
+                                     library_name='chunked_data', data={'TSLA': tail})
+        read.assert_not_called()
+        self.assertEqual(summary.loc['TSLA', 'rows_written'], 2)
+
+
+if __name__ == '__main__':
+    unittest.main()
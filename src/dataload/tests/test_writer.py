@@ -0,0 +1,101 @@
+"""
+Created on: 16 Oct 2026
+
+Test the buffered, coalescing Arctic writer against the in-memory stand-in
+"""
+import threading
+import time
+import unittest
+from unittest import mock
+
+import numpy as np
+import pandas as pd
+
+from dataload.database import db_arctic_append, db_arctic_read, db_connect
+from dataload.tests.arctic_stand_in import StandInTestCase
+from dataload.writer import ArcticBufferedWriter
+
+
+class TestArcticBufferedWriter(StandInTestCase):
+    library_name = 'intraday'
+
+    def setUp(self) -> None:
+        super().setUp()
+        self.times = pd.date_range('2020-01-01 08:00', periods=100, freq='s')
+
+    def _versions(self, symbol: str) -> int:
+        lib = db_connect(mongo_config=self.mongo_config, is_arctic=True, lib_name='intraday')
+        return lib.read_metadata(symbol).version
+
+    def test_flush_by_size(self):
+        writer = ArcticBufferedWriter(mongo_config=self.mongo_config, library_name='intraday',
+                                      max_rows=25, max_delay=60)
+        for i in range(100):
+            writer.add(symbol='TSLA', df=pd.DataFrame({'price': [float(i)]},
+                                                      index=self.times[i:i + 1]))
+        writer.close()
+
+        self.assertEqual(self._versions('TSLA'), 4)  # one version per 25 rows, not per row
+        out = db_arctic_read(mongo_config=self.mongo_config, library='intraday', symbol='TSLA')
+        np.testing.assert_array_equal(out['price'].values, np.arange(100.))
+        self.assertEqual(writer.stats()['rows_per_append'], 25)
+
+    def test_flush_by_age(self):
+        writer = ArcticBufferedWriter(mongo_config=self.mongo_config, library_name='intraday',
+                                      max_rows=1000, max_delay=0)
+        writer.add(symbol='TSLA', df=pd.DataFrame({'price': [1.]}, index=self.times[:1]))
+        self.assertEqual(writer.pending_rows, 0)
+        self.assertEqual(writer.appends, 1)
+
+    def test_concurrent_producers(self):
+        writer = ArcticBufferedWriter(mongo_config=self.mongo_config, library_name='intraday',
+                                      max_rows=10, max_delay=60)
+
+        def produce(symbol: str):
+            for i in range(50):
+                writer.add(symbol=symbol, df=pd.DataFrame({'price': [float(i)]},
+                                                          index=self.times[i:i + 1]))
+
+        threads = [threading.Thread(target=produce, args=(f"stock_{i}",)) for i in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        writer.close()
+
+        self.assertEqual(writer.stats()['rows_written'], 200)
+        for i in range(4):
+            out = db_arctic_read(mongo_config=self.mongo_config, library='intraday',
+                                 symbol=f"stock_{i}")
+            np.testing.assert_array_equal(out['price'].values, np.arange(50.))
+
+    def test_background_flush_survives_failed_append(self):
+        attempts = []
+
+        def append(**kwargs):
+            attempts.append(len(kwargs['df']))
+            if len(attempts) == 1:
+                raise ConnectionError("cluster unavailable")
+            db_arctic_append(**kwargs)
+
+        with mock.patch("dataload.writer.db_arctic_append", side_effect=append), \
+                self.assertLogs("dataload.writer", level="ERROR"):
+            writer = ArcticBufferedWriter(mongo_config=self.mongo_config,
+                                          library_name='intraday', max_rows=1000,
+                                          max_delay=0.02, flush_interval=0.01)
+            writer.add(symbol='TSLA', df=pd.DataFrame({'price': [1., 2.]},
+                                                      index=self.times[:2]))
+            deadline = time.time() + 5
+            while writer.appends == 0 and time.time() < deadline:
+                time.sleep(0.01)
+            self.assertEqual(writer.appends, 1)  # retried by the flusher, not by close
+            writer.close()
+
+        self.assertEqual(attempts, [2, 2])  # the failed rows were retried, not dropped
+        self.assertEqual(writer.pending_rows, 0)
+        out = db_arctic_read(mongo_config=self.mongo_config, library='intraday', symbol='TSLA')
+        np.testing.assert_array_equal(out['price'].values, [1., 2.])
+
+
+if __name__ == '__main__':
+    unittest.main()
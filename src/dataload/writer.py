@@ -0,0 +1,170 @@
+"""
+Created: 16 Oct 2026
+Buffered writer for Arctic: coalesces many small frames per symbol into a single append,
+flushed once a row count or age threshold is reached, to cut write amplification and the
+number of versions created by a high-frequency feed
+"""
+import logging
+import threading
+from collections import defaultdict
+from time import time
+from typing import Dict, List
+
+import pandas as pd
+
+from dataload.database import db_arctic_append
+
+logger = logging.getLogger(__name__)
+
+
+class ArcticBufferedWriter:
+    """
+    Accumulate rows per symbol and write them with one db_arctic_append per flush. Safe to
+    share between threads; appends of the same symbol are serialised so rows keep their order.
+
+    Args:
+        mongo_config: Dict-like object with the keys ["mongo_user", "mongo_pwd", "url_cluster"]
+        library_name: Name of arctic library to append on
+        max_rows: Flush a symbol once this many rows are buffered for it
+        max_delay: Flush a symbol once its oldest buffered row is this many seconds old
+        flush_interval: If set, a background thread checks for symbols past max_delay every
+            flush_interval seconds, otherwise the age is only checked when rows are added.
+            A failed background flush is logged and its rows stay buffered for the next check
+
+    Example:
+    >>> with ArcticBufferedWriter(mongo_config=mongo_cfg, library_name='intraday') as writer:
+    ...     writer.add(symbol='TSLA', df=tick_df)
+    """
+
+    def __init__(self,
+                 mongo_config: dict,
+                 library_name: str,
+                 max_rows: int = 10000,
+                 max_delay: float = 5.0,
+                 flush_interval: float = None):
+        assert max_rows > 0, "max_rows must be a positive integer"
+        self.mongo_config = mongo_config
+        self.library_name = library_name
+        self.max_rows = max_rows
+        self.max_delay = max_delay
+
+        self._lock = threading.Lock()
+        self._symbol_locks = defaultdict(threading.Lock)
+        self._buffers: Dict[str, List[pd.DataFrame]] = defaultdict(list)
+        self._buffered_rows: Dict[str, int] = defaultdict(int)
+        self._first_added: Dict[str, float] = {}
+
+        self.rows_received = 0
+        self.rows_written = 0
+        self.appends = 0
+        self.write_seconds = 0.0
+        self._started = time()
+
+        self._closed = threading.Event()
+        self._flusher = None
+        if flush_interval is not None:
+            self._flusher = threading.Thread(target=self._flush_periodically,
+                                             args=(flush_interval,), daemon=True)
+            self._flusher.start()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    @property
+    def pending_rows(self) -> int:
+        return sum(self._buffered_rows.values())
+
+    def add(self, symbol: str, df: pd.DataFrame) -> None:
+        """Buffer rows for a symbol, flushing it if a threshold is reached"""
+        assert not self._closed.is_set(), "writer is closed"
+        if df.empty:
+            return
+        with self._lock:
+            self._buffers[symbol].append(df)
+            self._buffered_rows[symbol] += len(df)
+            self._first_added.setdefault(symbol, time())
+            self.rows_received += len(df)
+            is_due = self._buffered_rows[symbol] >= self.max_rows or \
+                time() - self._first_added[symbol] >= self.max_delay
+        if is_due:
+            self.flush(symbol)
+
+    def _take(self, symbol: str) -> List[pd.DataFrame]:
+        with self._lock:
+            frames = self._buffers.pop(symbol, [])
+            self._buffered_rows.pop(symbol, None)
+            self._first_added.pop(symbol, None)
+        return frames
+
+    def _put_back(self, symbol: str, frames: List[pd.DataFrame]) -> None:
+        with self._lock:
+            self._buffers[symbol] = frames + self._buffers[symbol]
+            self._buffered_rows[symbol] += sum(len(df) for df in frames)
+            self._first_added.setdefault(symbol, time())
+
+    def flush(self, symbol: str = None) -> None:
+        """Write the buffered rows of one symbol (or every symbol if None) as one append each"""
+        with self._lock:
+            symbols = [symbol] if symbol is not None else list(self._buffers)
+        for sym in symbols:
+            with self._lock:
+                symbol_lock = self._symbol_locks[sym]
+            with symbol_lock:
+                frames = self._take(sym)
+                if not frames:
+                    continue
+                data = pd.concat(frames) if len(frames) > 1 else frames[0]
+                if not data.index.is_monotonic_increasing:
+                    data = data.sort_index(kind='mergesort')
+
+                start_time = time()
+                try:
+                    db_arctic_append(mongo_config=self.mongo_config, df=data, symbol=sym,
+                                     library_name=self.library_name)
+                except Exception:
+                    self._put_back(sym, frames)
+                    raise
+                with self._lock:
+                    self.write_seconds += time() - start_time
+                    self.rows_written += len(data)
+                    self.appends += 1
+
+    def flush_expired(self) -> None:
+        """Flush every symbol whose oldest buffered row is older than max_delay"""
+        now = time()
+        with self._lock:
+            expired = [sym for sym, first in self._first_added.items()
+                       if now - first >= self.max_delay]
+        for sym in expired:
+            self.flush(sym)
+
+    def _flush_periodically(self, interval: float) -> None:
+        while not self._closed.wait(interval):
+            try:
+                self.flush_expired()
+            except Exception:
+                # the rows were put back by flush, the next check retries them
+                logger.exception("Background flush to library %s failed", self.library_name)
+
+    def close(self) -> None:
+        """Stop the background flusher and write everything still buffered"""
+        self._closed.set()
+        if self._flusher is not None:
+            self._flusher.join()
+        self.flush()
+
+    def stats(self) -> dict:
+        """Throughput of the writer since it was created"""
+        elapsed = time() - self._started
+        return {"rows_received": self.rows_received,
+                "rows_written": self.rows_written,
+                "pending_rows": self.pending_rows,
+                "appends": self.appends,
+                "rows_per_append": self.rows_written / self.appends if self.appends else 0.0,
+                "write_seconds": self.write_seconds,
+                "rows_per_second": self.rows_written / elapsed if elapsed else 0.0,
+                "write_rows_per_second":
+                    self.rows_written / self.write_seconds if self.write_seconds else 0.0}
@@ -0,0 +1,169 @@
+"""
+Created: 16 Oct 2026
+Bootstrap confidence intervals for the performance metrics of utils_finance (annualised
+return, volatility, Sharpe, Sortino and information ratio). The metrics only depend on sums
+of the returns, squared returns and squared downside returns, and are invariant to the order
+of the returns. So a resampled path is fully described by how many times it draws each
+historical row (iid, or in circular blocks), and a batch of paths is evaluated with one
+matrix product of those counts: no path is ever materialised. Batches run across a process
+pool, each drawing from its own seeded stream
+"""
+from concurrent.futures import ProcessPoolExecutor
+from typing import Tuple
+
+import numpy as np
+import pandas as pd
+
+from securityAnalysis.utils_finance import (PERFORMANCE_METRICS,
+                                            calculate_performance_metrics,
+                                            calculate_return_array, select_numeric_columns)
+
+# inputs of a worker process, set once per process by _init_worker
+_WORKER_INPUTS = {}
+
+
+def resample_counts(rng: np.random.Generator,
+                    num_rows: int,
+                    num_paths: int,
+                    path_length: int,
+                    block_size: int = None) -> np.ndarray:
+    """
+    Number of times each of num_rows historical returns is drawn by each of num_paths
+    resampled paths. iid draws rows independently; with block_size, paths are made of
+    blocks of block_size consecutive rows (wrapping around the end, circular block
+    bootstrap), so serial dependence within a block is preserved.
+
+    Returns:
+        np.ndarray: (num_paths x num_rows) counts, each row summing to the path length
+        (path_length, rounded up to whole blocks)
+    """
+    uniform = np.full(num_rows, 1 / num_rows)
+    if block_size is None or block_size == 1:
+        return rng.multinomial(path_length, uniform, size=num_paths)
+
+    assert 0 < block_size <= num_rows, "block_size must be between 1 and the number of rows"
+    num_blocks = -(-path_length // block_size)
+    starts = rng.multinomial(num_blocks, uniform, size=num_paths)
+    # row t is covered by the blocks starting at t - block_size + 1, ..., t (circularly)
+    wrapped = np.concatenate([starts[:, num_rows - block_size + 1:], starts], axis=1)
+    cumulative = np.zeros((num_paths, wrapped.shape[1] + 1), dtype=np.int64)
+    np.cumsum(wrapped, axis=1, out=cumulative[:, 1:])
+    return cumulative[:, block_size:] - cumulative[:, :num_rows]
+
+
+def _metrics_from_sums(count: np.ndarray, sums: np.ndarray, squares: np.ndarray,
+                       downside: np.ndarray, risk_free: float,
+                       annualisation_factor: int) -> np.ndarray:
+    """Metrics (as calculate_performance_metrics) from the sums over each path, returned as
+    an array (paths x PERFORMANCE_METRICS x securities)"""
+    with np.errstate(divide="ignore", invalid="ignore"):
+        mean = sums / count
+        ann_return = mean * annualisation_factor
+        ann_vol = np.sqrt(np.maximum(squares / count - np.square(mean), 0) *
+                          annualisation_factor)
+        downside_dev = np.sqrt(downside / count * annualisation_factor)
+        return np.stack([ann_return,
+                         ann_vol,
+                         (ann_return - risk_free) / ann_vol,
+                         (ann_return - risk_free) / downside_dev,
+                         ann_return / ann_vol], axis=1)
+
+
+def _init_worker(row_stats: np.ndarray, path_length: int, block_size: int, risk_free: float,
+                 annualisation_factor: int) -> None:
+    _WORKER_INPUTS.update(row_stats=row_stats, path_length=path_length,
+                          block_size=block_size, risk_free=risk_free,
+                          annualisation_factor=annualisation_factor)
+
+
+def _bootstrap_batch(task: Tuple[np.random.SeedSequence, int]) -> np.ndarray:
+    """Metrics of one batch of resampled paths"""
+    seed, num_paths = task
+    inputs = _WORKER_INPUTS
+    row_stats = inputs["row_stats"]
+    num_rows, num_securities = row_stats.shape[0], row_stats.shape[1] // 3
+    counts = resample_counts(np.random.default_rng(seed), num_rows=num_rows,
+                             num_paths=num_paths, path_length=inputs["path_length"],
+                             block_size=inputs["block_size"])
+    sums = counts @ row_stats
+    sums, squares, downside = (sums[:, i * num_securities:(i + 1) * num_securities]
+                               for i in range(3))
+    return _metrics_from_sums(counts.sum(axis=1, keepdims=True), sums, squares, downside,
+                              inputs["risk_free"], inputs["annualisation_factor"])
+
+
+def bootstrap_performance_metrics(data: pd.DataFrame,
+                                  num_paths: int = 10000,
+                                  path_length: int = None,
+                                  block_size: int = None,
+                                  confidence: float = 0.95,
+                                  risk_free: float = 0,
+                                  target_return: float = 0,
+                                  annualisation_factor: int = 252,
+                                  batch_size: int = 1000,
+                                  max_workers: int = None,
+                                  seed: int = None) -> pd.DataFrame:
+    """
+    Bootstrap (percentile) confidence intervals of the performance metrics of every security,
+    from num_paths resampled return paths. Batch i always draws from the i-th stream spawned
+    from seed, so a run is reproducible whatever the number of workers. Dates with a missing
+    price are dropped, so every path draws whole cross-sections of returns. Non-numeric
+    columns are ignored, as in calculate_performance_metrics.
+
+    Args:
+        data: Input dataframe with numeric columns as the security prices, and the date
+            being the index
+        num_paths: Number of resampled paths
+        path_length: Number of returns per path, default the number of historical returns
+        block_size: Length of the blocks of consecutive returns drawn (circular block
+            bootstrap), default None draws iid returns
+        confidence: Confidence level of the intervals
+        risk_free: Risk free rate, annualised, as a decimal
+        target_return: Target return per period, below which returns count as downside
+        annualisation_factor: Number of periods in a year, 252 for daily data
+        batch_size: Number of paths evaluated at once
+        max_workers: Number of processes, 1 evaluates the batches in this process, default
+            None uses the number of CPUs
+        seed: Seed of the resampling, default None is not reproducible
+
+    Returns:
+        pd.DataFrame: indexed by (metric, security), with the columns estimate (on the
+        historical returns), mean and std (over the paths), lower and upper (bounds of the
+        confidence interval)
+    """
+    assert 0 < confidence < 1, "confidence must lie between 0 and 1"
+    assert num_paths > 0 and batch_size > 0, "num_paths and batch_size must be positive"
+    data = select_numeric_columns(data).dropna()
+    returns = calculate_return_array(data.to_numpy(dtype=np.float64), return_type="relative")
+    downside = np.square(np.minimum(returns - target_return, 0))
+    row_stats = np.hstack([returns, np.square(returns), downside])
+    inputs = (row_stats, len(returns) if path_length is None else path_length, block_size,
+              risk_free, annualisation_factor)
+
+    batch_sizes = [batch_size] * (num_paths // batch_size)
+    if num_paths % batch_size:
+        batch_sizes.append(num_paths % batch_size)
+    tasks = list(zip(np.random.SeedSequence(seed).spawn(len(batch_sizes)), batch_sizes))
+
+    if max_workers == 1 or len(tasks) == 1:
+        _init_worker(*inputs)
+        batches = [_bootstrap_batch(task) for task in tasks]
+    else:
+        with ProcessPoolExecutor(max_workers=max_workers, initializer=_init_worker,
+                                 initargs=inputs) as pool:
+            batches = list(pool.map(_bootstrap_batch, tasks))
+    samples = np.concatenate(batches)
+
+    tail = (1 - confidence) / 2
+    estimate = calculate_performance_metrics(data, risk_free=risk_free,
+                                             target_return=target_return,
+                                             annualisation_factor=annualisation_factor)
+    summary = {"estimate": estimate.T.to_numpy(),
+               "mean": np.nanmean(samples, axis=0),
+               "std": np.nanstd(samples, axis=0),
+               "lower": np.nanquantile(samples, tail, axis=0),
+               "upper": np.nanquantile(samples, 1 - tail, axis=0)}
+    index = pd.MultiIndex.from_product([PERFORMANCE_METRICS, data.columns],
+                                       names=["metric", "security"])
+    return pd.DataFrame({name: values.ravel() for name, values in summary.items()},
+                        index=index)
@@ -0,0 +1,242 @@
+"""
+Created: 16 Oct 2026
+Covariance/correlation of security returns for large universes: blockwise products (e.g. in
+float32, so a 10k+ asset matrix is built without float64 temporaries of the same size), an
+estimator updated incrementally as new rows arrive (equal or exponential weights) instead of
+recomputing daily_returns.cov() over the full history, and Ledoit-Wolf shrinkage. Results
+are dataframes, usable as the covariance of efficient_frontier and frontier_solver
+"""
+from typing import Iterable, Tuple, Union
+
+import numpy as np
+import pandas as pd
+
+
+def _drop_nan_rows(returns: np.ndarray) -> np.ndarray:
+    is_complete = ~np.isnan(returns).any(axis=1)
+    return returns if is_complete.all() else returns[is_complete]
+
+
+def blockwise_cross_product(a: np.ndarray,
+                            block_size: int = 1024,
+                            dtype: np.dtype = np.float32,
+                            out: np.ndarray = None) -> np.ndarray:
+    """
+    aᵀa computed in square blocks of block_size columns, only the upper triangle of blocks
+    is multiplied and mirrored. out may be preallocated (e.g. a np.memmap), and is added to.
+
+    Args:
+        a: 2-D array (rows x columns)
+        block_size: Number of columns per block
+        dtype: dtype of the products and of out when not given
+        out: Optional (columns x columns) array the product is added to
+
+    Returns:
+        np.ndarray: (columns x columns) product
+    """
+    num_columns = a.shape[1]
+    if out is None:
+        out = np.zeros((num_columns, num_columns), dtype=dtype)
+    a = a.astype(dtype, copy=False)
+    for i in range(0, num_columns, block_size):
+        block_i = a[:, i:i + block_size]
+        for j in range(i, num_columns, block_size):
+            product = block_i.T @ a[:, j:j + block_size]
+            out[i:i + block_size, j:j + block_size] += product
+            if j != i:
+                out[j:j + block_size, i:i + block_size] += product.T
+    return out
+
+
+def blockwise_covariance(returns: Union[np.ndarray, pd.DataFrame],
+                         block_size: int = 1024,
+                         dtype: np.dtype = np.float32,
+                         ddof: int = 1) -> Union[np.ndarray, pd.DataFrame]:
+    """
+    Covariance of the columns of returns (rows with a NaN are dropped), with the
+    cross product computed blockwise in dtype, see blockwise_cross_product
+
+    Returns:
+        np.ndarray, or pd.DataFrame labelled with the columns if returns is a dataframe
+    """
+    values = _drop_nan_rows(np.asarray(returns, dtype=np.float64))
+    centred = (values - values.mean(axis=0)).astype(dtype, copy=False)
+    covariance = blockwise_cross_product(centred, block_size=block_size, dtype=dtype)
+    covariance /= values.shape[0] - ddof
+    if isinstance(returns, pd.DataFrame):
+        return pd.DataFrame(covariance, index=returns.columns, columns=returns.columns)
+    return covariance
+
+
+def covariance_to_correlation(covariance: Union[np.ndarray, pd.DataFrame]
+                              ) -> Union[np.ndarray, pd.DataFrame]:
+    """Correlation matrix from a covariance matrix"""
+    std = np.sqrt(np.diag(np.asarray(covariance)))
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return covariance / np.outer(std, std)
+
+
+def shrink_covariance(covariance: Union[np.ndarray, pd.DataFrame],
+                      shrinkage: float) -> Union[np.ndarray, pd.DataFrame]:
+    """Shrink a covariance matrix towards the scaled identity (average variance on the
+    diagonal): (1 - shrinkage) * covariance + shrinkage * mu * I"""
+    assert 0 <= shrinkage <= 1, "shrinkage must be between 0 and 1"
+    values = np.asarray(covariance)
+    target = np.trace(values) / values.shape[0] * np.eye(values.shape[0], dtype=values.dtype)
+    shrunk = (1 - shrinkage) * values + shrinkage * target
+    if isinstance(covariance, pd.DataFrame):
+        return pd.DataFrame(shrunk, index=covariance.index, columns=covariance.columns)
+    return shrunk
+
+
+def ledoit_wolf_covariance(returns: Union[np.ndarray, pd.DataFrame],
+                           block_size: int = 1024,
+                           dtype: np.dtype = np.float64
+                           ) -> Tuple[Union[np.ndarray, pd.DataFrame], float]:
+    """
+    Ledoit-Wolf (2004) shrinkage of the sample covariance (ddof=0) towards the scaled
+    identity, with the optimal intensity estimated from the returns. Better conditioned than
+    the sample covariance when there are not many more dates than securities.
+
+    Returns:
+        tuple: shrunk covariance (a dataframe if returns is one), shrinkage intensity
+    """
+    values = _drop_nan_rows(np.asarray(returns, dtype=np.float64))
+    num_rows, num_columns = values.shape
+    centred = values - values.mean(axis=0)
+    sample = blockwise_cross_product(centred, block_size=block_size, dtype=dtype) / num_rows
+
+    mu = np.trace(sample) / num_columns
+    sample_sq = np.sum(np.square(sample, dtype=np.float64))
+    delta = (sample_sq - 2 * mu * np.trace(sample) + num_columns * mu ** 2) / num_columns
+    # sum over the rows x of ||x xᵀ - S||², without forming any x xᵀ
+    beta = (np.sum(np.square(np.sum(np.square(centred), axis=1))) - num_rows * sample_sq) / \
+        (num_rows ** 2 * num_columns)
+    shrinkage = 0. if delta == 0 else min(beta, delta) / delta
+
+    covariance = shrink_covariance(sample, shrinkage)
+    if isinstance(returns, pd.DataFrame):
+        covariance = pd.DataFrame(covariance, index=returns.columns, columns=returns.columns)
+    return covariance, shrinkage
+
+
+class CovarianceEstimator:
+    """
+    Covariance of returns updated incrementally as new rows arrive, so the daily refresh
+    costs O(new rows x securities²) rather than a recomputation over the full history.
+    Equal weights merge each batch with the pairwise (Chan) update, the cross product of
+    the batch computed blockwise. With halflife, rows are exponentially weighted (as
+    pd.DataFrame.ewm(halflife=, adjust=False).cov(bias=True)). Rows containing a NaN are
+    skipped.
+
+    Args:
+        columns: Names of the securities, the column order of the returns passed to update
+        halflife: Half-life (in rows) of the exponential weights, default None weights
+            every row equally
+        dtype: dtype of the running moments, e.g. np.float32 for 10k+ securities
+        block_size: Number of columns per block of the batch cross products
+
+    Example:
+    >>> estimator = CovarianceEstimator(columns=daily_returns.columns)
+    >>> estimator.update(daily_returns)          # history
+    >>> estimator.update(latest_returns)         # then only the new rows, every day
+    >>> solve_efficient_frontier(mean_returns=estimator.mean(),
+    ...                          covariance=estimator.covariance())
+    """
+
+    def __init__(self,
+                 columns: Iterable[str],
+                 halflife: float = None,
+                 dtype: np.dtype = np.float64,
+                 block_size: int = 1024):
+        self.columns = list(columns)
+        self.halflife = halflife
+        self.decay = None if halflife is None else np.exp(-np.log(2) / halflife)
+        self.dtype = dtype
+        self.block_size = block_size
+
+        num_columns = len(self.columns)
+        self.count = 0
+        self._mean = np.zeros(num_columns, dtype=np.float64)
+        self._comoment = np.zeros((num_columns, num_columns), dtype=dtype)
+
+    def update(self, returns: Union[pd.DataFrame, np.ndarray]) -> None:
+        """Add rows of returns (dataframe with the estimator's columns, or 2-D array)"""
+        if isinstance(returns, pd.DataFrame):
+            returns = returns.reindex(columns=self.columns)
+        values = np.asarray(returns, dtype=np.float64)
+        if values.ndim == 1:
+            values = values[None, :]
+        assert values.shape[1] == len(self.columns), \
+            f"expected {len(self.columns)} columns, got {values.shape[1]}"
+        values = _drop_nan_rows(values)
+        if not len(values):
+            return
+        if self.decay is None:
+            self._update_equal(values)
+        else:
+            self._update_exponential(values)
+
+    def _update_equal(self, values: np.ndarray) -> None:
+        batch_count = values.shape[0]
+        batch_mean = values.mean(axis=0)
+        total = self.count + batch_count
+        delta = batch_mean - self._mean
+        blockwise_cross_product(values - batch_mean, block_size=self.block_size,
+                                dtype=self.dtype, out=self._comoment)
+        # mean-shift correction, a rank-1 update added blockwise in dtype
+        shift = delta * np.sqrt(self.count * batch_count / total)
+        blockwise_cross_product(shift[None, :], block_size=self.block_size,
+                                dtype=self.dtype, out=self._comoment)
+        self._mean += delta * batch_count / total
+        self.count = total
+
+    def _update_exponential(self, values: np.ndarray) -> None:
+        if self.count == 0:
+            self._mean[:] = values[0]
+            self.count = 1
+            values = values[1:]
+            if not len(values):
+                return
+        # row k of n new rows has weight (1 - decay) * decay^(n-1-k), the rows seen before
+        # decay^n in total: merge the two weighted groups as in _update_equal
+        num_rows = len(values)
+        prior_weight = self.decay ** num_rows
+        weights = (1 - self.decay) * self.decay ** np.arange(num_rows - 1, -1, -1)
+        batch_weight = weights.sum()
+        batch_mean = weights @ values / batch_weight
+
+        self._comoment *= prior_weight
+        blockwise_cross_product(np.sqrt(weights)[:, None] * (values - batch_mean),
+                                block_size=self.block_size, dtype=self.dtype,
+                                out=self._comoment)
+        shift = (self._mean - batch_mean) * np.sqrt(prior_weight * batch_weight)
+        blockwise_cross_product(shift[None, :], block_size=self.block_size,
+                                dtype=self.dtype, out=self._comoment)
+        self._mean = prior_weight * self._mean + batch_weight * batch_mean
+        self.count += num_rows
+
+    def mean(self) -> pd.Series:
+        """Mean (or exponentially weighted mean) return of each security"""
+        return pd.Series(self._mean, index=self.columns)
+
+    def covariance(self, ddof: int = 1, shrinkage: float = None) -> pd.DataFrame:
+        """
+        Covariance matrix of the returns seen so far
+
+        Args:
+            ddof: Delta degrees of freedom of equal weights (ignored with halflife)
+            shrinkage: Optional intensity of the shrinkage towards the scaled identity, see
+                shrink_covariance (e.g. from ledoit_wolf_covariance on a recent window)
+        """
+        if self.decay is None:
+            covariance = self._comoment / max(self.count - ddof, 1)
+        else:
+            covariance = self._comoment.copy()
+        if shrinkage is not None:
+            covariance = shrink_covariance(covariance, shrinkage)
+        return pd.DataFrame(covariance, index=self.columns, columns=self.columns)
+
+    def correlation(self) -> pd.DataFrame:
+        """Correlation matrix of the returns seen so far"""
+        return covariance_to_correlation(self.covariance())
@@ -0,0 +1,176 @@
+"""
+Created: 16 Oct 2026
+Monte Carlo efficient frontier (promoted from jupyter-notebooks/EfficientFrontier.ipynb):
+random long-only portfolios are generated and evaluated in batches with matrix products,
+batches run across a process pool with independently seeded streams, and only the
+frontier and the top-k portfolios by Sharpe ratio are kept in memory
+"""
+from concurrent.futures import ProcessPoolExecutor
+from typing import Tuple
+
+import numpy as np
+import pandas as pd
+
+PORTFOLIO_COLUMNS = ["Volatility", "Portfolio Return", "Sharpe Ratio"]
+
+# inputs of a worker process, set once per process by _init_worker
+_WORKER_INPUTS = {}
+
+
+def calculate_return_statistics(price_df: pd.DataFrame) -> Tuple[pd.Series, pd.DataFrame]:
+    """Mean and covariance of the daily (relative) returns of each security"""
+    daily_returns = price_df.pct_change()
+    return daily_returns.mean(), daily_returns.cov()
+
+
+def random_weights(seed: np.random.SeedSequence, num_portfolios: int,
+                   num_stocks: int) -> np.ndarray:
+    """Random long-only weights (rows sum to 1) drawn from the stream of seed"""
+    weights = np.random.default_rng(seed).random((num_portfolios, num_stocks))
+    weights /= weights.sum(axis=1, keepdims=True)
+    return weights
+
+
+def evaluate_portfolios(weights: np.ndarray,
+                        mean_returns: np.ndarray,
+                        covariance: np.ndarray,
+                        risk_free_rate: float,
+                        annualisation_factor: int = 252) -> np.ndarray:
+    """Annualised volatility, return and Sharpe ratio of each row of weights, as an array
+    with columns PORTFOLIO_COLUMNS"""
+    portfolio_return = weights @ mean_returns * annualisation_factor
+    portfolio_var = np.einsum("ij,ij->i", weights @ covariance, weights)
+    portfolio_std = np.sqrt(portfolio_var * annualisation_factor)
+    return np.column_stack([portfolio_std, portfolio_return,
+                            (portfolio_return - risk_free_rate) / portfolio_std])
+
+
+def _frontier(results: np.ndarray) -> np.ndarray:
+    """Positions of the portfolios on the upper envelope: no other portfolio has a higher
+    return for the same or lower volatility"""
+    order = np.lexsort((-results[:, 1], results[:, 0]))
+    returns = results[order, 1]
+    is_frontier = returns > np.concatenate([[-np.inf], np.maximum.accumulate(returns)[:-1]])
+    return order[is_frontier]
+
+
+def _top_k(results: np.ndarray, top_k: int) -> np.ndarray:
+    """Positions of the top_k portfolios by Sharpe ratio, best first"""
+    if len(results) > top_k:
+        candidates = np.argpartition(-results[:, 2], top_k - 1)[:top_k]
+    else:
+        candidates = np.arange(len(results))
+    return candidates[np.argsort(-results[candidates, 2], kind="stable")]
+
+
+def _keep(results: np.ndarray, weights: np.ndarray, top_k: int) -> Tuple[np.ndarray, ...]:
+    frontier, best = _frontier(results), _top_k(results, top_k)
+    return results[frontier], weights[frontier], results[best], weights[best]
+
+
+def _init_worker(mean_returns: np.ndarray, covariance: np.ndarray, risk_free_rate: float,
+                 annualisation_factor: int, top_k: int) -> None:
+    _WORKER_INPUTS.update(mean_returns=mean_returns, covariance=covariance,
+                          risk_free_rate=risk_free_rate,
+                          annualisation_factor=annualisation_factor, top_k=top_k)
+
+
+def _simulate_batch(task: Tuple[np.random.SeedSequence, int]) -> Tuple[np.ndarray, ...]:
+    """Evaluate one batch of random portfolios, returning its frontier and top-k"""
+    seed, num_portfolios = task
+    inputs = _WORKER_INPUTS
+    weights = random_weights(seed, num_portfolios, len(inputs["mean_returns"]))
+    results = evaluate_portfolios(weights, inputs["mean_returns"], inputs["covariance"],
+                                  inputs["risk_free_rate"], inputs["annualisation_factor"])
+    return _keep(results, weights, inputs["top_k"])
+
+
+def simulate_portfolios(mean_returns: pd.Series,
+                        covariance: pd.DataFrame,
+                        num_portfolios: int,
+                        risk_free_rate: float,
+                        top_k: int = 10,
+                        batch_size: int = 100000,
+                        max_workers: int = None,
+                        seed: int = None,
+                        annualisation_factor: int = 252) -> Tuple[pd.DataFrame, pd.DataFrame]:
+    """
+    Evaluate num_portfolios random long-only portfolios in batches, keeping the efficient
+    frontier and the top_k portfolios by Sharpe ratio. Batch i always draws from the i-th
+    stream spawned from seed, so a run is reproducible whatever the number of workers.
+
+    Args:
+        mean_returns: Mean daily return of each security
+        covariance: Covariance of the daily returns
+        num_portfolios: Number of different portfolios to try
+        risk_free_rate: Risk free rate of return from investing. 0.015 = 1.5%
+        top_k: Number of portfolios with the highest Sharpe ratio to keep
+        batch_size: Number of portfolios generated and evaluated at once
+        max_workers: Number of processes, 1 evaluates the batches in this process, default
+            None uses the number of CPUs
+        seed: Seed of the random weights, default None is not reproducible
+        annualisation_factor: Number of periods in a year, 252 for daily returns
+
+    Returns:
+        tuple:
+            frontier: portfolios on the efficient frontier, by increasing volatility
+            top_portfolios: top_k portfolios by decreasing Sharpe ratio
+            both with the columns PORTFOLIO_COLUMNS followed by the weight of each security
+    """
+    assert num_portfolios > 0 and batch_size > 0 and top_k > 0, \
+        "num_portfolios, batch_size and top_k must be positive integers"
+    stocks = list(mean_returns.index)
+    inputs = (np.asarray(mean_returns, dtype=np.float64),
+              np.asarray(covariance, dtype=np.float64), risk_free_rate,
+              annualisation_factor, top_k)
+
+    batch_sizes = [batch_size] * (num_portfolios // batch_size)
+    if num_portfolios % batch_size:
+        batch_sizes.append(num_portfolios % batch_size)
+    tasks = list(zip(np.random.SeedSequence(seed).spawn(len(batch_sizes)), batch_sizes))
+
+    if max_workers == 1 or len(tasks) == 1:
+        _init_worker(*inputs)
+        batches = [_simulate_batch(task) for task in tasks]
+    else:
+        with ProcessPoolExecutor(max_workers=max_workers, initializer=_init_worker,
+                                 initargs=inputs) as pool:
+            batches = list(pool.map(_simulate_batch, tasks))
+
+    # merging the frontiers/top-k of every batch gives the frontier/top-k of the whole run
+    frontier_results, frontier_weights, top_results, top_weights = \
+        (np.concatenate(arrays) for arrays in zip(*batches))
+    frontier = _frontier(frontier_results)
+    best = _top_k(top_results, top_k)
+
+    def to_frame(results: np.ndarray, weights: np.ndarray) -> pd.DataFrame:
+        return pd.concat([pd.DataFrame(results, columns=PORTFOLIO_COLUMNS),
+                          pd.DataFrame(weights, columns=stocks)], axis=1)
+
+    return (to_frame(frontier_results[frontier], frontier_weights[frontier]),
+            to_frame(top_results[best], top_weights[best]))
+
+
+def calculate_portfolio_performance_metrics(price_df: pd.DataFrame,
+                                            num_portfolios: int,
+                                            risk_free_rate: float,
+                                            **kwargs) -> Tuple[pd.DataFrame, pd.DataFrame]:
+    """
+    Calculation portfolio performance metrics: annual standard deviation (volatility),
+    return and Sharpe ratio of random portfolios of the securities in price_df
+
+    Args:
+        price_df: Prices, one column per security
+        num_portfolios: Number of different portfolios to try
+            with random allocation to each stock
+        risk_free_rate: Risk free rate of return from
+            investing. 0.015 = 1.5%
+        **kwargs: top_k, batch_size, max_workers, seed, see simulate_portfolios
+
+    Returns:
+        tuple: (frontier, top_portfolios), see simulate_portfolios
+    """
+    mean_returns, covariance = calculate_return_statistics(price_df)
+    return simulate_portfolios(mean_returns=mean_returns, covariance=covariance,
+                               num_portfolios=num_portfolios, risk_free_rate=risk_free_rate,
+                               **kwargs)
@@ -0,0 +1,164 @@
+"""
+Created: 16 Oct 2026
+Efficient frontier solved directly rather than sampled (see efficient_frontier): the minimum
+variance portfolio, the maximum Sharpe ratio portfolio and points along the frontier, in
+closed form when short positions are unconstrained, otherwise by quadratic programming
+(SLSQP) under long-only/weight bounds, each frontier point warm-started from the previous one
+"""
+from typing import Sequence, Tuple, Union
+
+import numpy as np
+import pandas as pd
+from scipy.optimize import minimize
+
+from securityAnalysis.efficient_frontier import PORTFOLIO_COLUMNS, evaluate_portfolios
+from securityAnalysis.utils_finance import calculate_return_array
+
+Bounds = Union[Tuple[float, float], Sequence[Tuple[float, float]]]
+
+
+def calculate_return_moments(price_df: pd.DataFrame) -> Tuple[pd.Series, pd.DataFrame]:
+    """Mean and covariance of the daily relative returns, computed with the return engine
+    (utils_finance.calculate_return_array); dates with a missing price are dropped"""
+    returns = calculate_return_array(price_df.to_numpy(dtype=np.float64),
+                                     return_type="relative")
+    returns = returns[~np.isnan(returns).any(axis=1)]
+    return (pd.Series(returns.mean(axis=0), index=price_df.columns),
+            pd.DataFrame(np.cov(returns, rowvar=False, ddof=1), index=price_df.columns,
+                         columns=price_df.columns))
+
+
+def _closed_form(mu: np.ndarray, cov: np.ndarray, risk_free: float, num_points: int):
+    """Lagrangian solutions with only the budget constraint (short positions allowed)"""
+    inv_ones = np.linalg.solve(cov, np.ones(len(mu)))
+    inv_mu = np.linalg.solve(cov, mu)
+    a, b, c = inv_ones.sum(), inv_mu.sum(), mu @ inv_mu
+    min_variance = inv_ones / a
+    excess = inv_mu - risk_free * inv_ones
+    assert excess.sum() > 0, \
+        "the risk free rate is above the minimum variance return, no maximum Sharpe portfolio"
+    max_sharpe = excess / excess.sum()
+
+    targets = np.linspace(b / a, mu.max(), num_points)
+    frontier = (np.outer(c - b * targets, inv_ones) +
+                np.outer(a * targets - b, inv_mu)) / (a * c - b ** 2)
+    return min_variance, max_sharpe, frontier
+
+
+def _bounds_array(bounds: Bounds, num_stocks: int) -> np.ndarray:
+    bounds = np.asarray(bounds, dtype=np.float64)
+    if bounds.ndim == 1:
+        bounds = np.tile(bounds, (num_stocks, 1))
+    assert bounds.shape == (num_stocks, 2), "weight_bounds must be (low, high) per security"
+    assert bounds[:, 0].sum() <= 1 <= bounds[:, 1].sum(), \
+        "weight_bounds cannot hold a fully invested portfolio"
+    return bounds
+
+
+def _max_return_weights(mu: np.ndarray, bounds: np.ndarray) -> np.ndarray:
+    """Highest return portfolio under the bounds: lower bounds first, then the remaining
+    budget to the securities with the highest return, each up to its upper bound"""
+    weights = bounds[:, 0].copy()
+    budget = 1 - weights.sum()
+    for i in np.argsort(-mu, kind="stable"):
+        add = min(bounds[i, 1] - weights[i], budget)
+        weights[i] += add
+        budget -= add
+    return weights
+
+
+def _solve(objective, x0: np.ndarray, bounds: np.ndarray, constraints: list) -> np.ndarray:
+    result = minimize(objective, x0=x0, jac=True, method="SLSQP", bounds=bounds,
+                      constraints=[{"type": "eq", "fun": lambda w: w.sum() - 1,
+                                    "jac": lambda w: np.ones_like(w)}] + constraints,
+                      options={"ftol": 1e-12, "maxiter": 500})
+    if not result.success:
+        raise ValueError(f"Optimisation failed: {result.message}")
+    return np.clip(result.x, bounds[:, 0], bounds[:, 1])
+
+
+def _constrained(mu: np.ndarray, cov: np.ndarray, risk_free: float, bounds: np.ndarray,
+                 num_points: int):
+    """SLSQP solutions under the budget constraint and weight bounds"""
+    def variance(w):
+        cov_w = cov @ w
+        return w @ cov_w, 2 * cov_w
+
+    def negative_sharpe(w):
+        cov_w = cov @ w
+        std = np.sqrt(w @ cov_w)
+        excess = mu @ w - risk_free
+        return -excess / std, -(mu * std - excess * cov_w / std) / std ** 2
+
+    x0 = np.clip(np.full(len(mu), 1 / len(mu)), bounds[:, 0], bounds[:, 1])
+    min_variance = _solve(variance, x0=x0, bounds=bounds, constraints=[])
+    max_sharpe = _solve(negative_sharpe, x0=min_variance, bounds=bounds, constraints=[])
+    if num_points == 0:
+        return min_variance, max_sharpe, np.empty((0, len(mu)))
+
+    max_return = _max_return_weights(mu, bounds)
+    targets = np.linspace(mu @ min_variance, mu @ max_return, num_points)
+    frontier = [min_variance]
+    for target in targets[1:-1]:
+        on_target = {"type": "eq", "fun": lambda w, t=target: mu @ w - t, "jac": lambda w: mu}
+        # warm start from the adjacent (lower return) frontier point
+        frontier.append(_solve(variance, x0=frontier[-1], bounds=bounds,
+                               constraints=[on_target]))
+    if num_points > 1:
+        frontier.append(max_return)
+    return min_variance, max_sharpe, np.array(frontier[:num_points])
+
+
+def solve_efficient_frontier(mean_returns: pd.Series,
+                             covariance: pd.DataFrame,
+                             risk_free_rate: float = 0,
+                             num_points: int = 50,
+                             long_only: bool = True,
+                             weight_bounds: Bounds = None,
+                             annualisation_factor: int = 252
+                             ) -> Tuple[pd.DataFrame, pd.DataFrame]:
+    """
+    Minimum variance portfolio, maximum Sharpe ratio portfolio and num_points portfolios
+    along the efficient frontier, from the minimum variance return to the highest return
+    attainable. Without long_only or weight_bounds the closed-form (Lagrangian) solutions
+    are used, otherwise each portfolio is solved with SLSQP.
+
+    Args:
+        mean_returns: Mean daily return of each security, e.g. from calculate_return_moments
+        covariance: Covariance of the daily returns
+        risk_free_rate: Risk free rate of return, annualised. 0.015 = 1.5%
+        num_points: Number of frontier portfolios, 0 for none
+        long_only: Constrain the weights to [0, 1]
+        weight_bounds: (low, high) for every weight, or one (low, high) per security,
+            replaces the long-only bounds
+        annualisation_factor: Number of periods in a year, 252 for daily returns
+
+    Returns:
+        tuple:
+            portfolios: rows "min_variance" and "max_sharpe"
+            frontier: num_points portfolios by increasing return
+            both with the columns PORTFOLIO_COLUMNS (as simulate_portfolios) followed by
+            the weight of each security
+    """
+    stocks = list(mean_returns.index)
+    # optimise on annualised moments, daily ones are too small for the solver tolerances
+    mu = np.asarray(mean_returns, dtype=np.float64) * annualisation_factor
+    cov = np.asarray(covariance, dtype=np.float64) * annualisation_factor
+
+    if weight_bounds is None and not long_only:
+        min_variance, max_sharpe, frontier = _closed_form(mu, cov, risk_free_rate, num_points)
+    else:
+        bounds = _bounds_array((0., 1.) if weight_bounds is None else weight_bounds, len(mu))
+        min_variance, max_sharpe, frontier = _constrained(mu, cov, risk_free_rate, bounds,
+                                                          num_points)
+
+    def to_frame(weights: np.ndarray, index=None) -> pd.DataFrame:
+        results = evaluate_portfolios(weights, np.asarray(mean_returns, dtype=np.float64),
+                                      np.asarray(covariance, dtype=np.float64),
+                                      risk_free_rate, annualisation_factor)
+        return pd.concat([pd.DataFrame(results, columns=PORTFOLIO_COLUMNS, index=index),
+                          pd.DataFrame(weights, columns=stocks, index=index)], axis=1)
+
+    return (to_frame(np.vstack([min_variance, max_sharpe]),
+                     index=["min_variance", "max_sharpe"]),
+            to_frame(frontier))
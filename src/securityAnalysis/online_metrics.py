@@ -0,0 +1,174 @@
+"""
+Created: 16 Oct 2026
+Streaming counterpart of utils_finance.calculate_performance_metrics for live prices: running
+(Welford) moments of the returns and downside sums per security, updated in O(1) per tick,
+instead of recomputing the metrics over an ever-growing dataframe
+"""
+import json
+from typing import Iterable, Union
+
+import numpy as np
+import pandas as pd
+
+from securityAnalysis.utils_finance import PERFORMANCE_METRICS, calculate_return_array
+
+
+class OnlineMetricsAccumulator:
+    """
+    Running annualised return, volatility, Sharpe and Sortino ratio of a set of securities,
+    fed one tick (or a batch of ticks) of prices at a time. A NaN price is skipped, the next
+    return is measured from the last valid price, so the metrics of each security match
+    calculate_performance_metrics on its price history with the NaNs dropped.
+
+    Args:
+        columns: Names of the securities, the order of the prices passed to update
+        risk_free: Risk free rate, annualised, as a decimal
+        target_return: Target return per period, below which returns count as downside
+        annualisation_factor: Number of periods (ticks) in a year, 252 for daily data
+
+    Example:
+    >>> accumulator = OnlineMetricsAccumulator(columns=['TSLA', 'AAPL'])
+    >>> accumulator.update(price_df)            # history, as one batch
+    >>> accumulator.update(latest_prices)       # then one tick at a time
+    >>> accumulator.metrics()
+    """
+
+    def __init__(self,
+                 columns: Iterable[str],
+                 risk_free: float = 0,
+                 target_return: float = 0,
+                 annualisation_factor: int = 252):
+        self.columns = list(columns)
+        self.risk_free = risk_free
+        self.target_return = target_return
+        self.annualisation_factor = annualisation_factor
+
+        num_columns = len(self.columns)
+        self.last_price = np.full(num_columns, np.nan)
+        self.count = np.zeros(num_columns, dtype=np.int64)
+        self.mean = np.zeros(num_columns)
+        self.m2 = np.zeros(num_columns)
+        self.downside_sq = np.zeros(num_columns)
+
+    def _as_array(self, prices: Union[pd.Series, pd.DataFrame, np.ndarray]) -> np.ndarray:
+        if isinstance(prices, pd.Series):
+            prices = prices.reindex(self.columns).to_numpy(dtype=np.float64)
+        elif isinstance(prices, pd.DataFrame):
+            prices = prices.reindex(columns=self.columns).to_numpy(dtype=np.float64)
+        prices = np.asarray(prices, dtype=np.float64)
+        if prices.ndim == 1:
+            prices = prices[None, :]
+        assert prices.shape[1] == len(self.columns), \
+            f"expected {len(self.columns)} prices per tick, got {prices.shape[1]}"
+        return prices
+
+    def update(self, prices: Union[pd.Series, pd.DataFrame, np.ndarray]) -> None:
+        """Add one tick (Series / 1-D array, one price per security) or a batch of ticks
+        (DataFrame / 2-D array, rows in time order)"""
+        prices = self._as_array(prices)
+        if prices.shape[0] == 1:
+            self._update_tick(prices[0])
+        else:
+            self._update_batch(prices)
+
+    def _update_tick(self, price: np.ndarray) -> None:
+        """Welford update with a single return per security"""
+        with np.errstate(divide="ignore", invalid="ignore"):
+            rtn = price / self.last_price - 1
+        valid = ~np.isnan(rtn)
+        self.count += valid
+        delta = np.where(valid, rtn - self.mean, 0.)
+        self.mean += np.where(valid, delta / np.maximum(self.count, 1), 0.)
+        self.m2 += np.where(valid, delta * (rtn - self.mean), 0.)
+        self.downside_sq += np.where(valid, np.square(np.minimum(rtn - self.target_return, 0)),
+                                     0.)
+        self.last_price = np.where(np.isnan(price), self.last_price, price)
+
+    def _update_batch(self, prices: np.ndarray) -> None:
+        """Merge the moments of a batch of returns into the running moments (Chan et al.)"""
+        returns = calculate_return_array(np.vstack([self.last_price, prices]),
+                                         return_type="relative", fill_gaps=True)
+        # a missing price is no tick at all, rather than a zero return
+        returns[np.isnan(prices)] = np.nan
+        valid = ~np.isnan(returns)
+        batch_count = valid.sum(axis=0)
+        with np.errstate(invalid="ignore"):
+            batch_mean = np.nansum(returns, axis=0) / np.maximum(batch_count, 1)
+            batch_m2 = np.nansum(np.square(returns - batch_mean), axis=0)
+            downside = np.minimum(returns - self.target_return, 0)
+        total = self.count + batch_count
+        delta = batch_mean - self.mean
+        weight = np.where(total > 0, batch_count / np.maximum(total, 1), 0.)
+        self.m2 += batch_m2 + np.square(delta) * self.count * weight
+        self.mean += delta * weight
+        self.count = total
+        self.downside_sq += np.nansum(np.square(downside), axis=0)
+
+        last_valid = ~np.isnan(prices)
+        has_price = last_valid.any(axis=0)
+        last_row = prices.shape[0] - 1 - np.argmax(last_valid[::-1], axis=0)
+        self.last_price = np.where(has_price, prices[last_row, np.arange(prices.shape[1])],
+                                   self.last_price)
+
+    @property
+    def annualised_return(self) -> np.ndarray:
+        with np.errstate(invalid="ignore"):
+            return np.where(self.count > 0, self.mean, np.nan) * self.annualisation_factor
+
+    @property
+    def annualised_volatility(self) -> np.ndarray:
+        with np.errstate(divide="ignore", invalid="ignore"):
+            return np.sqrt(self.m2 / self.count * self.annualisation_factor)
+
+    @property
+    def sharpe_ratio(self) -> np.ndarray:
+        with np.errstate(divide="ignore", invalid="ignore"):
+            return (self.annualised_return - self.risk_free) / self.annualised_volatility
+
+    @property
+    def sortino_ratio(self) -> np.ndarray:
+        with np.errstate(divide="ignore", invalid="ignore"):
+            downside_dev = np.sqrt(self.downside_sq / self.count * self.annualisation_factor)
+            return (self.annualised_return - self.risk_free) / downside_dev
+
+    def metrics(self) -> pd.DataFrame:
+        """Current metrics, laid out as calculate_performance_metrics"""
+        with np.errstate(divide="ignore", invalid="ignore"):
+            info_ratio = self.annualised_return / self.annualised_volatility
+        return pd.DataFrame({"annualised_return": self.annualised_return,
+                             "annualised_volatility": self.annualised_volatility,
+                             "sharpe_ratio": self.sharpe_ratio,
+                             "sortino_ratio": self.sortino_ratio,
+                             "info_ratio": info_ratio},
+                            index=self.columns, columns=PERFORMANCE_METRICS)
+
+    def get_state(self) -> dict:
+        """JSON-serialisable state, restored with OnlineMetricsAccumulator.from_state"""
+        return {"columns": self.columns,
+                "risk_free": self.risk_free,
+                "target_return": self.target_return,
+                "annualisation_factor": self.annualisation_factor,
+                "last_price": self.last_price.tolist(),
+                "count": self.count.tolist(),
+                "mean": self.mean.tolist(),
+                "m2": self.m2.tolist(),
+                "downside_sq": self.downside_sq.tolist()}
+
+    @classmethod
+    def from_state(cls, state: dict):
+        """Restore an accumulator checkpointed with get_state"""
+        accumulator = cls(columns=state["columns"], risk_free=state["risk_free"],
+                          target_return=state["target_return"],
+                          annualisation_factor=state["annualisation_factor"])
+        accumulator.last_price = np.array(state["last_price"], dtype=np.float64)
+        accumulator.count = np.array(state["count"], dtype=np.int64)
+        for name in ["mean", "m2", "downside_sq"]:
+            setattr(accumulator, name, np.array(state[name], dtype=np.float64))
+        return accumulator
+
+    def to_json(self) -> str:
+        return json.dumps(self.get_state())
+
+    @classmethod
+    def from_json(cls, state: str):
+        return cls.from_state(json.loads(state))
@@ -6,11 +6,15 @@ Provide summary statistics on the data
 Introduce tests (such as Augmented Dickey Fuller) to check stationarity of time series
 Inspiration from: https://www.analyticsvidhya.com/blog/2018/09/non-stationary-time-series-python/
 """
+import os
+from concurrent.futures import ProcessPoolExecutor
+from typing import Iterable, List, Tuple, Union
+
 import matplotlib.pyplot as plt
 import numpy as np
 import pandas as pd
 import scipy.stats as stats
-from scipy.stats import kurtosis, skew
+from statsmodels.tsa.adfvalues import mackinnoncrit, mackinnonp
 from statsmodels.tsa.stattools import adfuller
 
 from securityAnalysis.utils_finance import calculate_return_df
@@ -19,6 +23,15 @@ pd.set_option('display.max_columns', 10)
 pd.set_option('display.width', 500)
 plt.style.use('seaborn')
 
+ADF_REGRESSIONS = ['n', 'c', 'ct', 'ctt']
+ADF_AUTOLAGS = ['aic', 'bic', 't-stat']
+# regressions whose (unit diagonal) Gram is worse conditioned are taken as rank deficient
+ADF_MAX_CONDITION = 1e10
+# below this many columns the ADF tests run in process by default, as starting a process pool
+# costs more than it saves
+ADF_MIN_PARALLEL_COLUMNS = 32
+MOMENT_COLUMNS = ['Size', 'Mean', 'Std Dev', 'Skewness', 'Excess Kurtosis', 'Min', 'Max']
+
 
 def test_stationarity_adf(time_series: np.array) -> None:
     """
@@ -49,7 +62,9 @@ def test_stationarity_adf(time_series: np.array) -> None:
     print(df_output)
 
 
-def get_aug_dickey_fuller_result(time_series: np.array, alpha: int = 5) -> bool:
+def get_aug_dickey_fuller_result(time_series: np.array,
+                                 alpha: int = 5,
+                                 verbose: bool = True) -> bool:
     """
     Method to perform Augmented Dickey Fuller Test for stationarity on time_series, at a
     given level of significance alpha
@@ -57,13 +72,15 @@ def get_aug_dickey_fuller_result(time_series: np.array, alpha: int = 5) -> bool:
     Parameters:
         time_series: 1-D array of time series data to be tested for stationarity
         alpha: chosen level of significance, must be one of 1,5 or 10%
+        verbose: If False, do not print progress
 
     Returns:
         bool: True if stationary data (t-statistic less than critical value at significance level
         alpha, reject H_0), False for non-stationary data
     """
     assert alpha in [1, 5, 10], "Choose appropriate alpha significance: [1, 5 or 10%]"
-    print(f"Performing augmented Dickey Fuller test at significance level alpha: {alpha}")
+    if verbose:
+        print(f"Performing augmented Dickey Fuller test at significance level alpha: {alpha}")
 
     df_test = adfuller(time_series, autolag='AIC')
     test_stats = {
@@ -75,56 +92,543 @@ def get_aug_dickey_fuller_result(time_series: np.array, alpha: int = 5) -> bool:
     return is_stationary
 
 
-def get_descriptive_stats(data: pd.DataFrame, alpha: float = 0.05) -> dict:
+def _adf_column_batch(task: Tuple[np.ndarray, int]) -> List[bool]:
+    """ADF results of the columns of one batch, run quietly in a worker process"""
+    values, alpha = task
+    return [get_aug_dickey_fuller_result(values[:, i], alpha=alpha, verbose=False)
+            for i in range(values.shape[1])]
+
+
+def get_aug_dickey_fuller_results(data: pd.DataFrame,
+                                  alpha: int = 5,
+                                  max_workers: int = None,
+                                  columns_per_task: int = None,
+                                  verbose: bool = True) -> pd.Series:
+    """
+    Augmented Dickey Fuller test (see get_aug_dickey_fuller_result) of every column, the
+    columns split in batches that are tested in parallel across processes. Results are in
+    column order whatever the number of workers.
+
+    Parameters:
+        data: Clean dataframe with no NaNs, one time series per column
+        alpha: chosen level of significance, must be one of 1,5 or 10%
+        max_workers: Number of processes, 1 tests the columns in this process, default None
+            uses the number of CPUs, or tests fewer than ADF_MIN_PARALLEL_COLUMNS columns in
+            this process
+        columns_per_task: Number of columns per task sent to a worker, default splits the
+            columns into about four tasks per worker (fewer, larger tasks cost less to ship)
+        verbose: If False, do not print progress
+
+    Returns:
+        pd.Series: True for the stationary columns, indexed by column
+    """
+    assert alpha in [1, 5, 10], "Choose appropriate alpha significance: [1, 5 or 10%]"
+    if verbose:
+        print(f"Performing augmented Dickey Fuller test on {data.shape[1]} columns at "
+              f"significance level alpha: {alpha}")
+    num_columns = data.shape[1]
+    if max_workers is None and num_columns < ADF_MIN_PARALLEL_COLUMNS:
+        max_workers = 1
+    max_workers = max_workers or os.cpu_count() or 1
+    if columns_per_task is None:
+        columns_per_task = max(-(-num_columns // (4 * max_workers)), 1)
+
+    values = data.to_numpy(dtype=np.float64)
+    tasks = [(values[:, start:start + columns_per_task], alpha)
+             for start in range(0, num_columns, columns_per_task)]
+    if max_workers == 1 or len(tasks) <= 1:
+        batches = [_adf_column_batch(task) for task in tasks]
+    else:
+        with ProcessPoolExecutor(max_workers=max_workers) as pool:
+            batches = list(pool.map(_adf_column_batch, tasks))
+
+    return pd.Series([result for batch in batches for result in batch], index=data.columns,
+                     dtype=bool)
+
+
+def _default_adf_lags(num_dates: int, regression: str) -> int:
+    """Maximum lag of adfuller when not given: 12 * (nobs / 100)^(1/4) (Schwert, 1989)"""
+    num_trend = len(regression) if regression != 'n' else 0
+    return min(num_dates // 2 - num_trend - 1, int(np.ceil(12 * (num_dates / 100) ** 0.25)))
+
+
+def _adf_design(values: np.ndarray, lags: int, regression: str) -> np.ndarray:
+    """
+    ADF regressions of the columns of values (dates x series), as set up by adfuller: the
+    difference Δy_t regressed on the level y_{t-1}, the lagged differences Δy_{t-1}, ...,
+    Δy_{t-lags} and the deterministic terms of regression (constant, trend, trend², the
+    trends scaled to [0, 1], which leaves the statistic of the level unchanged)
+
+    Returns:
+        np.ndarray: (series x observations x (1 + lags + trend terms + 1)), the regressors
+        with the lagged level in column 0, and the regressand Δy_t in the last column
+    """
+    diff = np.diff(values, axis=0)
+    num_obs = diff.shape[0] - lags
+    num_trend = len(regression) if regression != 'n' else 0
+    design = np.empty((values.shape[1], num_obs, 2 + lags + num_trend))
+    design[:, :, 0] = values[lags:-1].T
+    for lag in range(1, lags + 1):
+        design[:, :, lag] = diff[lags - lag:diff.shape[0] - lag].T
+    trend = np.arange(1, num_obs + 1) / num_obs
+    for order in range(num_trend):
+        design[:, :, 1 + lags + order] = trend ** order
+    design[:, :, -1] = diff[lags:].T
+    return design
+
+
+def _gram_tstat(gram: np.ndarray, num_obs: Union[int, np.ndarray]) -> np.ndarray:
+    """
+    t-statistics of the coefficient of regressor 0 in OLS regressions given their Gram
+    matrices [X y]ᵀ[X y] (... x (variables + 1) x (variables + 1), the regressand last):
+    β = (XᵀX)⁻¹Xᵀy and the sum of squared residuals yᵀy - βᵀXᵀy, the Gram scaled to a unit
+    diagonal first (which leaves the t-statistic unchanged) for the conditioning. Regressions
+    that are rank deficient (condition number above ADF_MAX_CONDITION, e.g. a linear series
+    whose lagged differences are constant) or fit exactly have a NaN t-statistic.
+    """
+    num_vars = gram.shape[-1] - 1
+    with np.errstate(divide='ignore', invalid='ignore'):
+        scale = 1 / np.sqrt(np.diagonal(gram, axis1=-2, axis2=-1))
+        gram = gram * scale[..., :, None] * scale[..., None, :]
+    regressors = gram[..., :num_vars, :num_vars]
+    is_finite = np.isfinite(gram).all(axis=(-2, -1))
+    is_regular = is_finite.copy()
+    if is_finite.any():
+        is_regular[is_finite] = np.linalg.cond(regressors[is_finite]) < ADF_MAX_CONDITION
+
+    tstats = np.full(gram.shape[:-2], np.nan)
+    num_obs = np.broadcast_to(num_obs, tstats.shape)[is_regular]
+    inverse = np.linalg.inv(regressors[is_regular])
+    cross = gram[..., :num_vars, num_vars][is_regular]
+    beta = np.einsum('...vw,...w->...v', inverse, cross)
+    ssr = gram[..., num_vars, num_vars][is_regular] - np.einsum('...v,...v->...', beta, cross)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        tstats[is_regular] = np.where(
+            ssr > 0, beta[..., 0] / np.sqrt(ssr / (num_obs - num_vars) * inverse[..., 0, 0]),
+            np.nan)
+    return tstats
+
+
+def _non_constant_columns(values: np.ndarray) -> np.ndarray:
+    """Indices of the columns that are not constant (their ADF regressions are singular)"""
+    return np.flatnonzero(values.max(axis=0) != values.min(axis=0))
+
+
+def _adf_tstats(values: np.ndarray, lags: int, regression: str, block_size: int) -> np.ndarray:
+    """ADF test statistics of the columns of values, block_size columns at a time"""
+    test_stats = np.empty(values.shape[1])
+    for start in range(0, values.shape[1], block_size):
+        design = _adf_design(values[:, start:start + block_size], lags, regression)
+        test_stats[start:start + block_size] = _gram_tstat(
+            np.matmul(design.transpose(0, 2, 1), design), design.shape[1])
+    return test_stats
+
+
+def _adf_results(results: pd.DataFrame,
+                 lags: Union[int, np.ndarray],
+                 num_obs: Union[int, np.ndarray],
+                 regression: str,
+                 alpha: int,
+                 p_values: bool) -> pd.DataFrame:
+    """Add the p-values (optional), lags, number of observations, critical values and the
+    stationarity flag at alpha to results, holding the test statistics"""
+    if p_values:
+        results['p-value'] = [mackinnonp(test_stat, regression=regression, N=1)
+                              for test_stat in results['Test Statistic']]
+    num_obs = np.broadcast_to(num_obs, len(results))
+    results['#Lags Used'] = lags
+    results['Number of Observations Used'] = num_obs
+    # the critical values only depend on the number of observations
+    critical_values = pd.DataFrame(
+        {num: mackinnoncrit(N=1, regression=regression, nobs=num) for num in np.unique(num_obs)},
+        index=[1, 5, 10])
+    for level in [1, 5, 10]:
+        results[f'Critical Value ({level}%)'] = critical_values.loc[level, num_obs].to_numpy()
+    results['Stationary'] = results['Test Statistic'] < results[f'Critical Value ({alpha}%)']
+    return results
+
+
+def get_aug_dickey_fuller_batch(data: pd.DataFrame,
+                                lags: int = None,
+                                regression: str = 'c',
+                                alpha: int = 5,
+                                block_size: int = 128,
+                                p_values: bool = False) -> pd.DataFrame:
+    """
+    Augmented Dickey Fuller test with a fixed number of lags (adfuller(autolag=None,
+    maxlag=lags)) of every column of data at once: the regressions of a block of columns
+    are built together and solved from their Gram matrices with NumPy, for screening wide
+    panels far faster than adfuller column by column. The columns share their length, so
+    they share the critical values (looked up as in get_aug_dickey_fuller_result).
+
+    Parameters:
+        data: Clean dataframe with no NaNs, one time series per column
+        lags: Number of lagged differences, default the maximum lag of adfuller,
+            12 * (nobs / 100)^(1/4)
+        regression: Deterministic terms, one of 'n' (none), 'c' (constant), 'ct' (and trend)
+            or 'ctt' (and quadratic trend)
+        alpha: chosen level of significance, must be one of 1,5 or 10%
+        block_size: Number of columns regressed at once, bounds the memory of the
+            regressions (dates x block_size x (lags + 3) floats)
+        p_values: If True, add the MacKinnon p-values (one statsmodels call per column, so
+            slower than the regressions themselves on wide panels)
+
+    Returns:
+        pd.DataFrame: indexed by column, the results of test_stationarity_adf (the p-value
+        only with p_values) and 'Stationary', True if the test statistic is less than the
+        critical value at alpha (NaN statistics, of constant columns or of rank deficient
+        regressions such as a linear series with lags, are not stationary)
+    """
+    assert alpha in [1, 5, 10], "Choose appropriate alpha significance: [1, 5 or 10%]"
+    assert regression in ADF_REGRESSIONS, f"regression must be one of {ADF_REGRESSIONS}"
+    values = np.asarray(data, dtype=np.float64)
+    assert not np.isnan(values).any(), "data must not contain NaNs"
+    num_dates = values.shape[0]
+    lags = _default_adf_lags(num_dates, regression) if lags is None else lags
+    num_trend = len(regression) if regression != 'n' else 0
+    assert 0 <= lags <= num_dates // 2 - num_trend - 1, \
+        "lags must be less than (nobs/2 - 1 - ntrend)"
+
+    test_stats = np.full(values.shape[1], np.nan)
+    valid_columns = _non_constant_columns(values)
+    test_stats[valid_columns] = _adf_tstats(values[:, valid_columns], lags, regression,
+                                            block_size)
+    results = pd.DataFrame({'Test Statistic': test_stats}, index=getattr(data, 'columns', None))
+    return _adf_results(results, lags, num_dates - 1 - lags, regression, alpha, p_values)
+
+
+def _adf_autolag(values: np.ndarray, max_lag: int, regression: str,
+                 autolag: str) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Lag selection of adfuller(autolag=...) for the columns of values, from one regression on
+    max_lag lags per column. The regressors are ordered as the nested candidate models
+    (trend terms, level, then lags 1 to max_lag, the regressand last), so with the QR
+    decomposition [X y] = QR, the sum of squared residuals of the model on the first k
+    regressors is the sum of R[i, y]² for i >= k, and every model is evaluated without
+    refitting
+
+    Returns:
+        tuple: the best information criterion (|t| of the last lag for 't-stat') and the
+        selected number of lags, per column
+    """
+    num_trend = len(regression) if regression != 'n' else 0
+    order = list(range(1 + max_lag, 1 + max_lag + num_trend)) + list(range(1 + max_lag)) + [-1]
+    design = _adf_design(values, max_lag, regression)[:, :, order]
+    num_obs = design.shape[1]
+    upper_y = np.linalg.qr(design, mode='r')[:, :, -1]
+    ssr = np.cumsum(np.square(upper_y)[:, ::-1], axis=1)[:, ::-1]
+
+    # candidate models: the trend terms, the level and 0 to max_lag lags
+    num_vars = np.arange(num_trend + 1, num_trend + max_lag + 2)
+    ssr = ssr[:, num_vars]
+    if autolag == 't-stat':
+        abs_tstats = np.abs(upper_y[:, num_vars - 1]) / np.sqrt(ssr / (num_obs - num_vars))
+        # the longest lag whose t-statistic is significant at 5%, else no lag
+        is_significant = abs_tstats >= 1.6448536269514722
+        best_lags = np.where(is_significant.any(axis=1),
+                             max_lag - np.argmax(is_significant[:, ::-1], axis=1), 0)
+        return abs_tstats[np.arange(len(best_lags)), best_lags], best_lags
+
+    llf = -num_obs / 2 * (np.log(2 * np.pi) + np.log(ssr / num_obs) + 1)
+    penalty = 2 if autolag == 'aic' else np.log(num_obs)
+    criteria = -2 * llf + penalty * num_vars
+    # argmin keeps the first minimum, adfuller's shortest lag on ties
+    best_lags = np.argmin(criteria, axis=1)
+    return criteria[np.arange(len(best_lags)), best_lags], best_lags
+
+
+def get_aug_dickey_fuller_autolag(data: pd.DataFrame,
+                                  max_lag: int = None,
+                                  regression: str = 'c',
+                                  autolag: str = 'AIC',
+                                  alpha: int = 5,
+                                  block_size: int = 128,
+                                  p_values: bool = False) -> pd.DataFrame:
+    """
+    Augmented Dickey Fuller test with the number of lags selected by an information
+    criterion, as adfuller(maxlag=max_lag, autolag=autolag) used by test_stationarity_adf
+    and get_aug_dickey_fuller_result. Rather than one regression per candidate lag, the
+    regression on max_lag lags is built once and every candidate is evaluated from it (see
+    _adf_autolag), then, as adfuller, the test is run with the selected lag on the longer
+    sample it allows (see get_aug_dickey_fuller_batch).
+
+    Parameters:
+        data: Clean dataframe with no NaNs, one time series per column
+        max_lag: Maximum number of lagged differences, default the maximum lag of adfuller,
+            12 * (nobs / 100)^(1/4)
+        regression: Deterministic terms, one of 'n', 'c', 'ct' or 'ctt'
+        autolag: Criterion of the lag selection, one of 'AIC', 'BIC' or 't-stat'
+        alpha: chosen level of significance, must be one of 1,5 or 10%
+        block_size: Number of columns regressed at once
+        p_values: If True, add the MacKinnon p-values
+
+    Returns:
+        pd.DataFrame: indexed by column, as get_aug_dickey_fuller_batch with the selected
+        '#Lags Used' and the 'Best Information Criterion' (NaN with the test statistic, for
+        constant columns and rank deficient regressions)
+    """
+    assert alpha in [1, 5, 10], "Choose appropriate alpha significance: [1, 5 or 10%]"
+    assert regression in ADF_REGRESSIONS, f"regression must be one of {ADF_REGRESSIONS}"
+    autolag = autolag.lower()
+    assert autolag in ADF_AUTOLAGS, f"autolag must be one of {ADF_AUTOLAGS}"
+    values = np.asarray(data, dtype=np.float64)
+    assert not np.isnan(values).any(), "data must not contain NaNs"
+    num_dates = values.shape[0]
+    max_lag = _default_adf_lags(num_dates, regression) if max_lag is None else max_lag
+    num_trend = len(regression) if regression != 'n' else 0
+    assert 0 <= max_lag <= num_dates // 2 - num_trend - 1, \
+        "max_lag must be less than (nobs/2 - 1 - ntrend)"
+
+    num_columns = values.shape[1]
+    test_stats, best_criteria = np.full(num_columns, np.nan), np.full(num_columns, np.nan)
+    lags = np.full(num_columns, max_lag)
+    valid_columns = _non_constant_columns(values)
+    for start in range(0, len(valid_columns), block_size):
+        columns = valid_columns[start:start + block_size]
+        best_criteria[columns], lags[columns] = _adf_autolag(values[:, columns], max_lag,
+                                                             regression, autolag)
+    for lag in np.unique(lags[valid_columns]):
+        columns = valid_columns[lags[valid_columns] == lag]
+        test_stats[columns] = _adf_tstats(values[:, columns], lag, regression, block_size)
+    # the criterion of a rank deficient regression is meaningless, as its statistic
+    best_criteria[np.isnan(test_stats)] = np.nan
+
+    results = pd.DataFrame({'Test Statistic': test_stats}, index=getattr(data, 'columns', None))
+    results = _adf_results(results, lags, num_dates - 1 - lags, regression, alpha, p_values)
+    results['Best Information Criterion'] = best_criteria
+    return results
+
+
+def get_rolling_aug_dickey_fuller(data: Union[pd.DataFrame, pd.Series],
+                                  window: int = None,
+                                  lags: int = 1,
+                                  regression: str = 'c',
+                                  alpha: int = 5,
+                                  min_periods: int = None,
+                                  block_size: int = 128
+                                  ) -> Tuple[Union[pd.DataFrame, pd.Series],
+                                             Union[pd.DataFrame, pd.Series]]:
+    """
+    Augmented Dickey Fuller test (as adfuller(autolag=None, maxlag=lags)) on a rolling or
+    expanding window ending at every date, e.g. to monitor when a spread stops being
+    stationary. The outer products of the ADF regression rows are accumulated once, so the
+    Gram matrix of any window is the difference of two cumulative sums, and all the windows
+    of a block of columns are solved together (see get_aug_dickey_fuller_batch) rather than
+    rerunning the test on every window. The trend terms are indexed over the full sample,
+    which spans the same regressors as in each window.
+
+    Parameters:
+        data: Prices (or spreads), one time series per column. Leading NaNs (e.g. before a
+            listing) are skipped, the regression rows involving any other NaN are dropped
+        window: Number of dates per window, default None uses expanding windows
+        lags: Number of lagged differences, fixed across the windows (e.g. selected with
+            get_aug_dickey_fuller_autolag on a history)
+        regression: Deterministic terms, one of 'n', 'c', 'ct' or 'ctt'
+        alpha: chosen level of significance, must be one of 1,5 or 10%
+        min_periods: Minimum number of observations of a window (dates with a price), default
+            window, or for expanding windows the shortest sample adfuller accepts with lags
+        block_size: Number of columns regressed at once, bounds the memory of the windows
+            (dates x block_size x (lags + 3)² floats)
+
+    Returns:
+        tuple: test statistics (NaN until a window has min_periods observations, or for a
+        constant window) and stationarity flags at alpha (test statistic less than the
+        critical value for the number of observations of the window), both indexed like data
+    """
+    assert alpha in [1, 5, 10], "Choose appropriate alpha significance: [1, 5 or 10%]"
+    assert regression in ADF_REGRESSIONS, f"regression must be one of {ADF_REGRESSIONS}"
+    frame = data.to_frame() if isinstance(data, pd.Series) else data
+    values = frame.to_numpy(dtype=np.float64)
+    num_dates, num_columns = values.shape
+    num_trend = len(regression) if regression != 'n' else 0
+    shortest = 2 * (lags + num_trend + 1)
+    if min_periods is None:
+        min_periods = shortest if window is None else window
+    assert min_periods >= shortest, \
+        f"min_periods must be at least {shortest}, 2 * (lags + 1 + ntrend)"
+    assert window is None or window >= min_periods, "window must be at least min_periods"
+
+    windows = frame.expanding() if window is None else frame.rolling(window)
+    is_constant = (windows.max() == windows.min()).to_numpy()
+
+    # window ending at date d: the regression rows (indexed from 0, of the differences from
+    # date lags + 1) from d - window + 1 to d - lags - 1
+    dates = np.arange(lags + 1, num_dates)
+    ends = dates - lags
+    starts = np.zeros_like(dates) if window is None else np.maximum(dates - window + 1, 0)
+    num_vars = 1 + lags + num_trend
+
+    test_stats = np.full((num_dates, num_columns), np.nan)
+    num_obs = np.zeros((num_dates, num_columns), dtype=int)
+    for start in range(0, num_columns, block_size):
+        columns = slice(start, start + block_size)
+        design = _adf_design(values[:, columns], lags, regression)
+        is_valid = np.isfinite(design).all(axis=2)
+        design[~is_valid] = 0
+        cumulative = np.zeros((design.shape[1] + 1,) + design.shape[:1] + (num_vars + 1,) * 2)
+        np.cumsum(np.einsum('soi,soj->osij', design, design), axis=0, out=cumulative[1:])
+        cumulative_obs = np.zeros((design.shape[1] + 1, design.shape[0]), dtype=int)
+        np.cumsum(is_valid.T, axis=0, out=cumulative_obs[1:])
+
+        gram = cumulative[ends] - cumulative[starts]
+        block_obs = cumulative_obs[ends] - cumulative_obs[starts]
+        is_tested = (block_obs >= min_periods - 1 - lags) & ~is_constant[dates, columns]
+        gram[~is_tested] = np.eye(num_vars + 1)
+        block_stats = _gram_tstat(gram, np.where(is_tested, block_obs, num_vars + 1))
+        test_stats[dates, columns] = np.where(is_tested, block_stats, np.nan)
+        num_obs[dates, columns] = np.where(is_tested, block_obs, 0)
+
+    # the critical values only depend on the number of observations
+    critical_values = np.full((num_dates, num_columns), np.nan)
+    level = [1, 5, 10].index(alpha)
+    for num in np.unique(num_obs[num_obs > 0]):
+        critical_values[num_obs == num] = mackinnoncrit(N=1, regression=regression,
+                                                        nobs=num)[level]
+
+    test_stats = pd.DataFrame(test_stats, index=frame.index, columns=frame.columns)
+    is_stationary = test_stats < critical_values
+    if isinstance(data, pd.Series):
+        return test_stats.iloc[:, 0], is_stationary.iloc[:, 0]
+    return test_stats, is_stationary
+
+
+def _chunk_moments(values: np.ndarray) -> Tuple[np.ndarray, ...]:
+    """Count, mean, sums of the 2nd to 4th powers of the deviations from the mean, min and max
+    of the columns of values, skipping NaNs, in float64"""
+    values = np.asarray(values, dtype=np.float64)
+    is_valid = ~np.isnan(values)
+    count = is_valid.sum(axis=0)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        mean = np.where(is_valid, values, 0).sum(axis=0) / count
+    deviation = np.where(is_valid, values - mean, 0)
+    deviation_sq = np.square(deviation)
+    minimum = np.where(is_valid, values, np.inf).min(axis=0, initial=np.inf)
+    maximum = np.where(is_valid, values, -np.inf).max(axis=0, initial=-np.inf)
+    return (count, np.where(count > 0, mean, 0), deviation_sq.sum(axis=0),
+            (deviation_sq * deviation).sum(axis=0), np.square(deviation_sq).sum(axis=0),
+            minimum, maximum)
+
+
+def _merge_moments(moments_a: Tuple[np.ndarray, ...],
+                   moments_b: Tuple[np.ndarray, ...]) -> Tuple[np.ndarray, ...]:
+    """Moments (see _chunk_moments) of the union of two sets of rows, with the pairwise
+    updates of Pébay (2008)"""
+    count_a, mean_a, m2_a, m3_a, m4_a, min_a, max_a = moments_a
+    count_b, mean_b, m2_b, m3_b, m4_b, min_b, max_b = moments_b
+    count = count_a + count_b
+    total = np.maximum(count, 1).astype(np.float64)
+    delta = mean_b - mean_a
+    delta_n = delta / total
+    cross = count_a * count_b * delta * delta_n
+    m4 = (m4_a + m4_b + cross * delta_n ** 2 * (count_a ** 2 - count_a * count_b + count_b ** 2) +
+          6 * delta_n ** 2 * (count_a ** 2 * m2_b + count_b ** 2 * m2_a) +
+          4 * delta_n * (count_a * m3_b - count_b * m3_a))
+    m3 = (m3_a + m3_b + cross * delta_n * (count_a - count_b) +
+          3 * delta_n * (count_a * m2_b - count_b * m2_a))
+    return (count, mean_a + delta_n * count_b, m2_a + m2_b + cross, m3, m4,
+            np.minimum(min_a, min_b), np.maximum(max_a, max_b))
+
+
+def calculate_moments(data: Union[pd.DataFrame, Iterable[pd.DataFrame]],
+                      chunk_size: int = None) -> pd.DataFrame:
+    """
+    Size, mean, standard deviation (ddof=0), skewness, excess kurtosis (both biased, as
+    scipy.stats skew and kurtosis), min and max of every column, skipping NaNs, in one pass
+    over the data with float64 accumulators: the moments of each chunk of rows are merged
+    into the running moments (Pébay, 2008), so the data never has to be in memory at once.
+
+    Args:
+        data: Dataframe, or an iterable of dataframes with the same columns (the chunks of a
+            frame that does not fit in memory, e.g. pd.read_csv(..., chunksize=))
+        chunk_size: Number of rows per chunk of a dataframe, bounds the float64 temporaries,
+            default None takes the dataframe at once
+
+    Returns:
+        pd.DataFrame: indexed by column, with the MOMENT_COLUMNS
+    """
+    if isinstance(data, pd.DataFrame):
+        chunk_size = chunk_size or max(len(data), 1)
+        chunks = (data.iloc[start:start + chunk_size]
+                  for start in range(0, max(len(data), 1), chunk_size))
+    else:
+        chunks = iter(data)
+
+    first_chunk = next(chunks, None)
+    if first_chunk is None:
+        raise ValueError("data is an empty iterable, at least one dataframe is needed")
+    columns = first_chunk.columns
+    moments = _chunk_moments(first_chunk.to_numpy(dtype=np.float64))
+    for chunk in chunks:
+        assert chunk.columns.equals(columns), "chunks must have the same columns"
+        moments = _merge_moments(moments, _chunk_moments(chunk.to_numpy(dtype=np.float64)))
+
+    count, mean, m2, m3, m4, minimum, maximum = moments
+    has_values = count > 0
+    with np.errstate(invalid='ignore', divide='ignore'):
+        variance = m2 / count
+        # as scipy (catastrophic cancellation in _moment), a column whose spread around the
+        # mean is below 10x the float64 resolution relative to the mean is taken as constant,
+        # without skewness or kurtosis
+        spread = np.maximum(maximum - mean, mean - minimum)
+        is_constant = spread <= np.finfo(np.float64).resolution * 10 * np.abs(mean)
+        skewness = np.where(is_constant, np.nan, m3 / count / variance ** 1.5)
+        excess_kurtosis = np.where(is_constant, np.nan, m4 / count / variance ** 2 - 3)
+    return pd.DataFrame({'Size': count.astype(np.int64),
+                         'Mean': np.where(has_values, mean, np.nan),
+                         'Std Dev': np.sqrt(variance),
+                         'Skewness': skewness,
+                         'Excess Kurtosis': excess_kurtosis,
+                         'Min': np.where(has_values, minimum, np.nan),
+                         'Max': np.where(has_values, maximum, np.nan)},
+                        index=columns, columns=MOMENT_COLUMNS)
+
+
+def get_descriptive_stats(data: pd.DataFrame,
+                          alpha: float = 0.05,
+                          max_workers: int = None,
+                          columns_per_task: int = None,
+                          verbose: bool = True) -> pd.DataFrame:
     """Compute descriptive, high level stats (p-values given for two tailed tests),
     incuding skewness and kurtosis, specifying alpha (for tests of skewness and kurtosis)
 
     Args:
         data: Clean dataframe with no NaNs
         alpha: level of significance for the two-tailed test. must lie between 0 and 1
+        max_workers: Number of processes for the Augmented Dickey Fuller tests, see
+            get_aug_dickey_fuller_results
+        columns_per_task: Number of columns per task of Augmented Dickey Fuller tests, see
+            get_aug_dickey_fuller_results
+        verbose: If False, do not print progress
 
     Returns
-        dict of results for descriptive level statistics
+        pd.DataFrame: descriptive level statistics (see calculate_moments), the tests of
+        skewness, kurtosis and stationarity, one row per column of data
     """
     assert 0 < alpha < 1, f"Alpha level of {alpha} is not valid, must lie between 0 and 1"
-    print("Getting descriptive level stats for dataframe...")
-
-    result_df = pd.DataFrame(columns=['Size', 'Mean', 'Std Dev', 'Skewness', 'Excess Kurtosis'])
+    if verbose:
+        print("Getting descriptive level stats for dataframe...")
 
-    result_df['Size'] = data.count()
-    result_df['Mean'] = data.mean()
-    result_df['Std Dev'] = np.std(data)
-    result_df['Min'] = np.min(data)
-    result_df['Max'] = np.max(data)
+    result_df = calculate_moments(data)
 
-    result_df['Skewness'] = skew(data)
     result_df['Skewness t-statistic'] = \
         result_df['Skewness'].values / np.sqrt(6 / result_df['Size'].values)
     result_df['Skewness p-value'] = 2 * (1 - stats.t.cdf(result_df['Skewness t-statistic'], df=1))
     # so, one can reject h_0 (skewness of log returns = 0) for a p-value of less than alpha
     skew_h0_title = "Skewness reject H_0 at " + str(100 * alpha) + "% sig level"
-    skew_h0_values = result_df['Skewness p-value'].values < alpha
-    result_df['Skewness accept H_0'] = skew_h0_values
-    result_df.rename(columns={'Skewness accept H_0': skew_h0_title}, inplace=True)
+    result_df[skew_h0_title] = result_df['Skewness p-value'].values < alpha
 
-    result_df['Excess Kurtosis'] = kurtosis(data)  # if high excess kurtosis --> thick tails
+    # if high excess kurtosis --> thick tails
     result_df['Excess Kurtosis t-statistic'] = \
         result_df['Excess Kurtosis'].values / np.sqrt(24 / result_df['Size'].values)
     result_df['Excess Kurtosis p-value'] = \
         2 * (1 - stats.t.cdf(result_df['Excess Kurtosis t-statistic'], df=1))
     kurt_h0_title = f"Kurtosis reject H_0 at {str(100 * alpha)}% sig level"
-    kurt_h0_values = result_df['Excess Kurtosis p-value'].values < alpha
-    result_df['Excess Kurtosis accept H_0'] = kurt_h0_values
-    result_df.rename(columns={'Excess Kurtosis accept H_0': kurt_h0_title}, inplace=True)
-
-    adf_results = []
-    for i in data.columns:
-        adf_results.append(get_aug_dickey_fuller_result(data.loc[:, i]))
+    result_df[kurt_h0_title] = result_df['Excess Kurtosis p-value'].values < alpha
 
-    result_df['Aug Dickey-Fuller Test'] = adf_results
-    result_dict = result_df.T.to_dict()
+    result_df['Aug Dickey-Fuller Test'] = get_aug_dickey_fuller_results(
+        data, max_workers=max_workers, columns_per_task=columns_per_task, verbose=verbose)
 
-    return result_dict
+    return result_df
 
 
 if __name__ == '__main__':
@@ -0,0 +1,78 @@
+"""
+Created on: 16 Oct 2026
+
+Benchmark the vectorized return engine behind calculate_return_df against the previous
+column-by-column DataFrame.apply/shift implementation, on synthetic price panels.
+Run with: python -m securityAnalysis.tests.benchmark_returns (from the src folder)
+"""
+from time import perf_counter
+
+import numpy as np
+import pandas as pd
+
+from securityAnalysis.utils_finance import calculate_return_array, calculate_return_df
+
+
+def _apply_return_df(data: pd.DataFrame, return_type: str) -> pd.DataFrame:
+    """Previous implementation of calculate_return_df, one lambda per column"""
+    if return_type == 'log':
+        return data.apply(lambda x: np.log(x / x.shift(1)))[1:]
+    if return_type == 'relative':
+        return data.apply(lambda x: (x / x.shift(1)) - 1)[1:]
+    return data.apply(lambda x: x - x.shift(1))[1:]
+
+
+def _best_of(func, repeats: int) -> float:
+    timings = []
+    for _ in range(repeats):
+        start_time = perf_counter()
+        func()
+        timings.append(perf_counter() - start_time)
+    return min(timings)
+
+
+def run_benchmark(panel_shapes: tuple = ((252 * 5, 500), (252 * 20, 1000), (252 * 20, 5000)),
+                  return_types: tuple = ('relative', 'log', 'absolute'),
+                  repeats: int = 3) -> pd.DataFrame:
+    """
+    Time the previous apply-based returns, calculate_return_df, and calculate_return_array
+    (float64, and float32 into a preallocated buffer) for each panel shape and return type
+
+    Args:
+        panel_shapes: (number of dates, number of securities) of the price panels
+        return_types: Return types to time
+        repeats: Number of timed calls, the fastest is reported
+
+    Returns:
+        pd.DataFrame: seconds per implementation and the speed-up over apply
+    """
+    results = []
+    for num_dates, num_securities in panel_shapes:
+        prices = pd.DataFrame(
+            100 * np.exp(np.cumsum(np.random.randn(num_dates, num_securities) * 0.01, axis=0)),
+            index=pd.bdate_range('2000-01-03', periods=num_dates))
+        values = prices.to_numpy()
+        buffer = np.empty((num_dates - 1, num_securities), dtype=np.float32)
+
+        for return_type in return_types:
+            flags = {f'is_{return_type}_return': True}
+            pd.testing.assert_frame_equal(calculate_return_df(prices, **flags),
+                                          _apply_return_df(prices, return_type))
+            timings = {
+                'apply': _best_of(lambda: _apply_return_df(prices, return_type), repeats),
+                'return_df': _best_of(lambda: calculate_return_df(prices, **flags), repeats),
+                'array_f64': _best_of(
+                    lambda: calculate_return_array(values, return_type=return_type), repeats),
+                'array_f32_out': _best_of(
+                    lambda: calculate_return_array(values, return_type=return_type,
+                                                   out=buffer), repeats)}
+            results.append(dict({'dates': num_dates, 'securities': num_securities,
+                                 'return_type': return_type}, **timings,
+                                speed_up=timings['apply'] / timings['return_df']))
+
+    return pd.DataFrame(results).set_index(['dates', 'securities', 'return_type'])
+
+
+if __name__ == '__main__':
+    with pd.option_context('display.width', 200, 'display.max_columns', 10):
+        print(run_benchmark())
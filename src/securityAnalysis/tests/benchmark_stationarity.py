@@ -0,0 +1,165 @@
+"""
+Created on: 16 Oct 2026
+
+Benchmark the Augmented Dickey Fuller stage of get_descriptive_stats across worker counts,
+on synthetic return panels (scaling is bounded by the number of CPUs of the machine), and the
+batched fixed-lag, autolag and rolling tests against adfuller column by column.
+Run with: python -m securityAnalysis.tests.benchmark_stationarity (from the src folder)
+"""
+import os
+from time import perf_counter
+
+import numpy as np
+import pandas as pd
+
+from statsmodels.tsa.stattools import adfuller
+
+from securityAnalysis.stationarity import (get_aug_dickey_fuller_autolag,
+                                           get_aug_dickey_fuller_batch,
+                                           get_aug_dickey_fuller_results,
+                                           get_rolling_aug_dickey_fuller)
+
+
+def run_benchmark(panel_shapes: tuple = ((252 * 5, 200), (252 * 5, 1000)),
+                  worker_counts: tuple = None,
+                  columns_per_task: int = None) -> pd.DataFrame:
+    """
+    Time get_aug_dickey_fuller_results for each panel shape and number of workers, checking
+    every run gives the serial results
+
+    Args:
+        panel_shapes: (number of dates, number of securities) of the return panels
+        worker_counts: Numbers of processes to time, default 1, 2, 4, ... up to the number
+            of CPUs
+        columns_per_task: Number of columns per task, default see
+            get_aug_dickey_fuller_results
+
+    Returns:
+        pd.DataFrame: seconds per run and the speed-up over one worker
+    """
+    if worker_counts is None:
+        num_cpus = os.cpu_count() or 1
+        worker_counts = tuple(2 ** i for i in range(num_cpus.bit_length()))
+        if worker_counts[-1] != num_cpus:
+            worker_counts += (num_cpus,)
+
+    results = []
+    for num_dates, num_securities in panel_shapes:
+        returns = pd.DataFrame(np.random.randn(num_dates, num_securities) * 0.01,
+                               index=pd.bdate_range('2000-01-03', periods=num_dates))
+        serial = None
+        for max_workers in worker_counts:
+            start_time = perf_counter()
+            adf_results = get_aug_dickey_fuller_results(returns, max_workers=max_workers,
+                                                        columns_per_task=columns_per_task,
+                                                        verbose=False)
+            seconds = perf_counter() - start_time
+            if serial is None:
+                serial = (adf_results, seconds)
+            pd.testing.assert_series_equal(adf_results, serial[0])
+            results.append({'dates': num_dates, 'securities': num_securities,
+                            'workers': max_workers, 'seconds': seconds,
+                            'speed_up': serial[1] / seconds})
+
+    return pd.DataFrame(results).set_index(['dates', 'securities', 'workers'])
+
+
+def run_batch_benchmark(panel_shapes: tuple = ((252 * 5, 500), (252 * 5, 5000)),
+                        lags: int = 5,
+                        sample_size: int = 100) -> pd.DataFrame:
+    """
+    Time get_aug_dickey_fuller_batch against adfuller(autolag=None) column by column (on
+    sample_size columns, extrapolated to the panel), checking the test statistics agree
+
+    Returns:
+        pd.DataFrame: seconds per implementation and the speed-up of the batch
+    """
+    results = []
+    for num_dates, num_securities in panel_shapes:
+        prices = pd.DataFrame(np.cumsum(np.random.randn(num_dates, num_securities), axis=0))
+        start_time = perf_counter()
+        batch = get_aug_dickey_fuller_batch(prices, lags=lags)
+        batch_seconds = perf_counter() - start_time
+
+        sample = prices.iloc[:, :sample_size]
+        start_time = perf_counter()
+        test_stats = [adfuller(sample[column], maxlag=lags, autolag=None)[0]
+                      for column in sample.columns]
+        adfuller_seconds = (perf_counter() - start_time) * num_securities / sample.shape[1]
+        np.testing.assert_allclose(batch['Test Statistic'].iloc[:sample_size], test_stats)
+        results.append({'dates': num_dates, 'securities': num_securities,
+                         'adfuller': adfuller_seconds, 'batch': batch_seconds,
+                         'speed_up': adfuller_seconds / batch_seconds})
+
+    return pd.DataFrame(results).set_index(['dates', 'securities'])
+
+
+def run_autolag_benchmark(num_dates: int = 252 * 5,
+                          num_securities: int = 500,
+                          sample_size: int = 20) -> pd.DataFrame:
+    """
+    Time get_aug_dickey_fuller_autolag against adfuller(autolag='AIC'), per series (one
+    column at a time) and on the whole panel (adfuller extrapolated from sample_size
+    columns), checking the selected lags are identical
+
+    Returns:
+        pd.DataFrame: seconds per series of each implementation
+    """
+    prices = pd.DataFrame(np.cumsum(np.random.randn(num_dates, num_securities), axis=0))
+    sample = prices.iloc[:, :sample_size]
+
+    start_time = perf_counter()
+    used_lags = [adfuller(sample[column], autolag='AIC')[2] for column in sample.columns]
+    adfuller_seconds = (perf_counter() - start_time) / sample_size
+
+    start_time = perf_counter()
+    for column in sample.columns:
+        get_aug_dickey_fuller_autolag(sample[[column]])
+    series_seconds = (perf_counter() - start_time) / sample_size
+
+    start_time = perf_counter()
+    panel = get_aug_dickey_fuller_autolag(prices)
+    panel_seconds = (perf_counter() - start_time) / num_securities
+    assert panel['#Lags Used'].iloc[:sample_size].tolist() == used_lags
+
+    return pd.DataFrame({'seconds_per_series': [adfuller_seconds, series_seconds,
+                                                panel_seconds]},
+                        index=['adfuller', 'autolag_series', 'autolag_panel'])
+
+
+def run_rolling_benchmark(num_dates: int = 252 * 5,
+                          num_securities: int = 2000,
+                          window: int = 252,
+                          lags: int = 1,
+                          sample_size: int = 100) -> pd.DataFrame:
+    """
+    Time get_rolling_aug_dickey_fuller against adfuller rerun on every window (on
+    sample_size windows of one column, extrapolated to the panel), checking the test
+    statistics agree
+
+    Returns:
+        pd.DataFrame: seconds of each implementation for the panel
+    """
+    prices = pd.DataFrame(np.cumsum(np.random.randn(num_dates, num_securities), axis=0))
+    start_time = perf_counter()
+    test_stats, _ = get_rolling_aug_dickey_fuller(prices, window=window, lags=lags)
+    rolling_seconds = perf_counter() - start_time
+
+    dates = range(window - 1, window - 1 + sample_size)
+    start_time = perf_counter()
+    window_stats = [adfuller(prices[0].iloc[date - window + 1:date + 1], maxlag=lags,
+                             autolag=None)[0] for date in dates]
+    adfuller_seconds = (perf_counter() - start_time) / sample_size * \
+        (num_dates - window + 1) * num_securities
+    np.testing.assert_allclose(test_stats[0].iloc[list(dates)], window_stats)
+
+    return pd.DataFrame({'seconds': [adfuller_seconds, rolling_seconds]},
+                        index=['adfuller_per_window', 'rolling'])
+
+
+if __name__ == '__main__':
+    with pd.option_context('display.width', 200, 'display.max_columns', 10):
+        print(run_benchmark())
+        print(run_batch_benchmark())
+        print(run_autolag_benchmark())
+        print(run_rolling_benchmark())
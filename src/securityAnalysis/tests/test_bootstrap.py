@@ -0,0 +1,71 @@
+# Created on 16 Oct 2026
+import unittest
+
+import numpy as np
+import pandas as pd
+
+from securityAnalysis.bootstrap import (_bootstrap_batch, _init_worker,
+                                        bootstrap_performance_metrics, resample_counts)
+from securityAnalysis.utils_finance import PERFORMANCE_METRICS, calculate_performance_metrics
+
+
+class TestBootstrap(unittest.TestCase):
+    def setUp(self) -> None:
+        rng = np.random.default_rng(5)
+        self.prices = pd.DataFrame(
+            100 * np.exp(np.cumsum(rng.normal(0.0005, 0.01, (400, 3)), axis=0)),
+            columns=['stock_a', 'stock_b', 'stock_c'])
+
+    def test_block_counts(self):
+        rng = np.random.default_rng(0)
+        counts = resample_counts(rng, num_rows=10, num_paths=4, path_length=9, block_size=4)
+        self.assertTrue((counts.sum(axis=1) == 12).all())
+
+        starts = np.random.default_rng(0).multinomial(3, np.full(10, 0.1), size=4)
+        expected = np.zeros((4, 10), dtype=int)
+        for path, row in zip(*np.nonzero(starts)):
+            for offset in range(4):
+                expected[path, (row + offset) % 10] += starts[path, row]
+        np.testing.assert_array_equal(counts, expected)
+
+    def test_batch_matches_materialised_paths(self):
+        returns = self.prices.pct_change().values[1:]
+        row_stats = np.hstack([returns, returns ** 2, np.minimum(returns, 0) ** 2])
+        _init_worker(row_stats, 399, 5, 0.01, 252)
+        seed = np.random.SeedSequence(7)
+        metrics = _bootstrap_batch((seed, 3))
+
+        counts = resample_counts(np.random.default_rng(seed), num_rows=399, num_paths=3,
+                                 path_length=399, block_size=5)
+        for path in range(3):
+            path_returns = np.repeat(returns, counts[path], axis=0)
+            path_prices = pd.DataFrame(np.vstack([np.ones(3), np.cumprod(1 + path_returns,
+                                                                         axis=0)]))
+            expected = calculate_performance_metrics(path_prices, risk_free=0.01)
+            np.testing.assert_allclose(metrics[path], expected.T.values)
+
+    def test_confidence_intervals(self):
+        summary = bootstrap_performance_metrics(self.prices, num_paths=2000, batch_size=500,
+                                                max_workers=1, seed=1)
+        self.assertEqual(list(summary.index.levels[0]), sorted(PERFORMANCE_METRICS))
+        self.assertTrue((summary['lower'] <= summary['estimate']).all())
+        self.assertTrue((summary['estimate'] <= summary['upper']).all())
+
+        daily_std = self.prices.pct_change().std(ddof=0)
+        np.testing.assert_allclose(summary.loc['annualised_return', 'std'],
+                                   252 * daily_std / np.sqrt(399), rtol=0.1)
+
+        parallel = bootstrap_performance_metrics(self.prices, num_paths=2000, batch_size=500,
+                                                 max_workers=2, seed=1)
+        pd.testing.assert_frame_equal(summary, parallel)
+
+    def test_non_numeric_columns_ignored(self):
+        summary = bootstrap_performance_metrics(self.prices, num_paths=100, max_workers=1,
+                                                seed=3)
+        labelled = bootstrap_performance_metrics(self.prices.assign(sector='tech'),
+                                                 num_paths=100, max_workers=1, seed=3)
+        pd.testing.assert_frame_equal(labelled, summary)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,77 @@
+# Created on 16 Oct 2026
+import unittest
+
+import numpy as np
+import pandas as pd
+
+from securityAnalysis.covariance import (CovarianceEstimator, blockwise_covariance,
+                                         ledoit_wolf_covariance)
+
+
+class TestCovariance(unittest.TestCase):
+    def setUp(self) -> None:
+        rng = np.random.default_rng(2)
+        mixing = rng.normal(size=(7, 7))
+        self.returns = pd.DataFrame(rng.normal(0, 0.01, (300, 7)) @ mixing,
+                                    columns=[f"stock_{i}" for i in range(7)])
+        self.returns.iloc[[10, 200], [2, 5]] = np.nan
+
+    def test_blockwise_covariance(self):
+        expected = self.returns.dropna().cov()
+        pd.testing.assert_frame_equal(
+            blockwise_covariance(self.returns, block_size=3, dtype=np.float64), expected)
+        float32 = blockwise_covariance(self.returns, block_size=2)
+        self.assertEqual(float32.values.dtype, np.float32)
+        np.testing.assert_allclose(float32, expected, rtol=1e-4)
+
+    def test_incremental_equal_weights(self):
+        estimator = CovarianceEstimator(columns=self.returns.columns, block_size=3)
+        for start in range(0, 300, 70):
+            estimator.update(self.returns.iloc[start:start + 70])
+        estimator.update(np.full(7, np.nan))
+        pd.testing.assert_frame_equal(estimator.covariance(), self.returns.dropna().cov())
+        pd.testing.assert_series_equal(estimator.mean(), self.returns.dropna().mean())
+        pd.testing.assert_frame_equal(estimator.correlation(), self.returns.dropna().corr())
+
+    def test_incremental_exponential(self):
+        estimator = CovarianceEstimator(columns=self.returns.columns, halflife=20)
+        estimator.update(self.returns.iloc[:150])
+        estimator.update(self.returns.iloc[150:])
+        expected = self.returns.dropna().ewm(halflife=20, adjust=False).cov(bias=True)
+        np.testing.assert_allclose(estimator.covariance(), expected.iloc[-7:], rtol=1e-10)
+        np.testing.assert_allclose(
+            estimator.mean(), self.returns.dropna().ewm(halflife=20, adjust=False).mean().iloc[-1])
+
+        # batches of any size, down to single rows, give the same moments
+        by_row = CovarianceEstimator(columns=self.returns.columns, halflife=20, block_size=3)
+        by_row.update(self.returns.iloc[:1])
+        for start in range(1, 300, 37):
+            by_row.update(self.returns.iloc[start:start + 37])
+        np.testing.assert_allclose(by_row.covariance(), expected.iloc[-7:], rtol=1e-10)
+
+        float32 = CovarianceEstimator(columns=self.returns.columns, halflife=20,
+                                      dtype=np.float32)
+        float32.update(self.returns)
+        self.assertEqual(float32.covariance().values.dtype, np.float32)
+        np.testing.assert_allclose(float32.covariance(), expected.iloc[-7:], rtol=1e-4)
+
+    def test_ledoit_wolf(self):
+        complete = self.returns.dropna().iloc[:20]
+        covariance, shrinkage = ledoit_wolf_covariance(complete, block_size=3)
+
+        # Ledoit and Wolf (2004), lemmas 3.2-3.4, with the outer products formed explicitly
+        x = complete.values - complete.values.mean(axis=0)
+        n, p = x.shape
+        sample = x.T @ x / n
+        mu = np.trace(sample) / p
+        delta = np.sum((sample - mu * np.eye(p)) ** 2) / p
+        beta = sum(np.sum((np.outer(row, row) - sample) ** 2) for row in x) / (n ** 2 * p)
+        expected_shrinkage = min(beta, delta) / delta
+
+        self.assertAlmostEqual(shrinkage, expected_shrinkage)
+        np.testing.assert_allclose(covariance, expected_shrinkage * mu * np.eye(p) +
+                                   (1 - expected_shrinkage) * sample)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,60 @@
+# Created on 16 Oct 2026
+import unittest
+
+import numpy as np
+import pandas as pd
+
+from securityAnalysis.efficient_frontier import (
+    PORTFOLIO_COLUMNS, calculate_portfolio_performance_metrics, calculate_return_statistics,
+    random_weights
+)
+
+
+class TestEfficientFrontier(unittest.TestCase):
+    def setUp(self) -> None:
+        rng = np.random.default_rng(0)
+        self.prices = pd.DataFrame(
+            100 * np.exp(np.cumsum(rng.normal(0.0005, 0.01, (500, 4)), axis=0)),
+            columns=['ORCL', 'NFLX', 'BP', 'TSLA'])
+        self.kwargs = dict(price_df=self.prices, num_portfolios=2500, risk_free_rate=0.01,
+                           top_k=5, batch_size=1000, seed=42)
+
+    def _loop_results(self) -> np.ndarray:
+        """Portfolio by portfolio, as in the notebook, over the same random weights"""
+        mean_returns, covariance = calculate_return_statistics(self.prices)
+        seeds = np.random.SeedSequence(42).spawn(3)
+        weights = np.vstack([random_weights(seed, size, 4)
+                             for seed, size in zip(seeds, [1000, 1000, 500])])
+        results = np.zeros((len(weights), 3))
+        for i, w in enumerate(weights):
+            portfolio_std = np.sqrt(np.dot(w.T, np.dot(covariance, w))) * np.sqrt(252)
+            portfolio_return = np.sum(mean_returns * w) * 252
+            results[i] = [portfolio_std, portfolio_return, (portfolio_return - 0.01) /
+                          portfolio_std]
+        return results
+
+    def test_matches_loop(self):
+        frontier, top = calculate_portfolio_performance_metrics(max_workers=1, **self.kwargs)
+        results = self._loop_results()
+
+        best = results[np.argsort(-results[:, 2])[:5]]
+        np.testing.assert_allclose(top[PORTFOLIO_COLUMNS].values, best)
+        np.testing.assert_allclose(top.iloc[:, 3:].sum(axis=1), 1)
+
+        np.testing.assert_allclose(frontier['Volatility'].iloc[0], results[:, 0].min())
+        self.assertTrue(frontier['Volatility'].is_monotonic_increasing)
+        self.assertTrue(frontier['Portfolio Return'].is_monotonic_increasing)
+        # no sampled portfolio beats the frontier
+        for std, rtn in results[:, :2]:
+            reachable = frontier['Volatility'] <= std + 1e-12
+            self.assertTrue(frontier.loc[reachable, 'Portfolio Return'].max() >= rtn - 1e-12)
+
+    def test_reproducible_across_workers(self):
+        serial = calculate_portfolio_performance_metrics(max_workers=1, **self.kwargs)
+        parallel = calculate_portfolio_performance_metrics(max_workers=2, **self.kwargs)
+        for serial_frame, parallel_frame in zip(serial, parallel):
+            pd.testing.assert_frame_equal(serial_frame, parallel_frame)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,64 @@
+# Created on 16 Oct 2026
+import unittest
+
+import numpy as np
+import pandas as pd
+
+from securityAnalysis.efficient_frontier import simulate_portfolios
+from securityAnalysis.frontier_solver import calculate_return_moments, solve_efficient_frontier
+
+
+class TestFrontierSolver(unittest.TestCase):
+    def setUp(self) -> None:
+        rng = np.random.default_rng(3)
+        prices = pd.DataFrame(
+            100 * np.exp(np.cumsum(rng.normal([0.0002, 0.0006, 0.0004, 0.0008], 0.01,
+                                              (750, 4)), axis=0)),
+            columns=['ORCL', 'NFLX', 'BP', 'TSLA'])
+        self.mean_returns, self.covariance = calculate_return_moments(prices)
+        pd.testing.assert_frame_equal(self.covariance, prices.pct_change().cov())
+
+    def test_closed_form_matches_optimiser(self):
+        closed_portfolios, closed_frontier = solve_efficient_frontier(
+            self.mean_returns, self.covariance, risk_free_rate=0.01, num_points=5,
+            long_only=False)
+        slsqp_portfolios, _ = solve_efficient_frontier(
+            self.mean_returns, self.covariance, risk_free_rate=0.01, num_points=0,
+            weight_bounds=(-10, 10))
+        pd.testing.assert_frame_equal(closed_portfolios, slsqp_portfolios, atol=1e-4)
+        np.testing.assert_allclose(closed_frontier.iloc[:, 3:].sum(axis=1), 1)
+        np.testing.assert_allclose(closed_frontier['Volatility'].iloc[0],
+                                   closed_portfolios.loc['min_variance', 'Volatility'])
+
+    def test_long_only_beats_sampling(self):
+        portfolios, frontier = solve_efficient_frontier(self.mean_returns, self.covariance,
+                                                        risk_free_rate=0.01, num_points=10)
+        sampled_frontier, sampled_top = simulate_portfolios(
+            self.mean_returns, self.covariance, num_portfolios=20000, risk_free_rate=0.01,
+            top_k=1, max_workers=1, seed=0)
+
+        self.assertLessEqual(portfolios.loc['min_variance', 'Volatility'],
+                             sampled_frontier['Volatility'].min() + 1e-9)
+        self.assertGreaterEqual(portfolios.loc['max_sharpe', 'Sharpe Ratio'],
+                                sampled_top['Sharpe Ratio'].iloc[0] - 1e-9)
+        self.assertTrue((frontier.iloc[:, 3:] >= 0).all().all())
+        self.assertTrue(frontier['Portfolio Return'].is_monotonic_increasing)
+        self.assertTrue(frontier['Volatility'].is_monotonic_increasing)
+        np.testing.assert_allclose(frontier['Portfolio Return'].iloc[-1],
+                                   self.mean_returns.max() * 252)
+
+    def test_weight_bounds(self):
+        portfolios, frontier = solve_efficient_frontier(self.mean_returns, self.covariance,
+                                                        num_points=5,
+                                                        weight_bounds=(0.1, 0.4))
+        weights = pd.concat([portfolios, frontier]).iloc[:, 3:]
+        self.assertTrue(((weights >= 0.1 - 1e-9) & (weights <= 0.4 + 1e-9)).all().all())
+        np.testing.assert_allclose(weights.sum(axis=1), 1)
+
+        with self.assertRaises(AssertionError):
+            solve_efficient_frontier(self.mean_returns, self.covariance,
+                                     weight_bounds=(0.3, 0.4))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,53 @@
+# Created on 16 Oct 2026
+import unittest
+
+import numpy as np
+import pandas as pd
+
+from securityAnalysis.online_metrics import OnlineMetricsAccumulator
+from securityAnalysis.utils_finance import calculate_performance_metrics
+
+
+class TestOnlineMetricsAccumulator(unittest.TestCase):
+    def setUp(self) -> None:
+        rng = np.random.default_rng(1)
+        self.prices = pd.DataFrame(100 * np.exp(np.cumsum(rng.normal(0, 0.01, (200, 3)),
+                                                          axis=0)),
+                                   columns=['stock_a', 'stock_b', 'stock_c'])
+        self.prices.iloc[[5, 6, 120], [1, 1, 2]] = np.nan
+        self.expected = pd.concat(
+            [calculate_performance_metrics(data=self.prices[[column]].dropna(),
+                                           risk_free=0.02, target_return=0.001)
+             for column in self.prices.columns])
+
+    def _accumulator(self) -> OnlineMetricsAccumulator:
+        return OnlineMetricsAccumulator(columns=self.prices.columns, risk_free=0.02,
+                                        target_return=0.001)
+
+    def test_tick_by_tick(self):
+        accumulator = self._accumulator()
+        for _, prices in self.prices.iterrows():
+            accumulator.update(prices)
+        pd.testing.assert_frame_equal(accumulator.metrics(), self.expected)
+
+    def test_batches_and_ticks(self):
+        accumulator = self._accumulator()
+        accumulator.update(self.prices.iloc[:50])
+        for i in range(50, 60):
+            accumulator.update(self.prices.iloc[i].values)
+        accumulator.update(self.prices.iloc[60:130])
+        accumulator.update(self.prices.iloc[130:])
+        pd.testing.assert_frame_equal(accumulator.metrics(), self.expected)
+
+    def test_state_roundtrip(self):
+        accumulator = self._accumulator()
+        accumulator.update(self.prices.iloc[:100])
+        restored = OnlineMetricsAccumulator.from_json(accumulator.to_json())
+        for target in (accumulator, restored):
+            target.update(self.prices.iloc[100:])
+        pd.testing.assert_frame_equal(restored.metrics(), accumulator.metrics())
+        pd.testing.assert_frame_equal(restored.metrics(), self.expected)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,178 @@
+# Created on 16 Oct 2026
+import io
+import unittest
+from contextlib import redirect_stdout
+from unittest import mock
+
+import numpy as np
+import pandas as pd
+
+from scipy.stats import kurtosis, skew
+from statsmodels.tsa.stattools import adfuller
+
+from securityAnalysis.stationarity import (calculate_moments, get_aug_dickey_fuller_autolag,
+                                           get_aug_dickey_fuller_batch,
+                                           get_aug_dickey_fuller_result,
+                                           get_aug_dickey_fuller_results, get_descriptive_stats,
+                                           get_rolling_aug_dickey_fuller)
+
+
+class TestStationarity(unittest.TestCase):
+    def setUp(self) -> None:
+        rng = np.random.default_rng(4)
+        noise = rng.normal(0, 0.01, (300, 6))
+        # alternate stationary (returns) and non-stationary (random walk) columns
+        noise[:, 1::2] = np.cumsum(noise[:, 1::2], axis=0)
+        self.data = pd.DataFrame(noise, columns=[f"stock_{i}" for i in range(6)])
+
+    def test_parallel_matches_serial(self):
+        expected = pd.Series([get_aug_dickey_fuller_result(self.data[column], verbose=False)
+                              for column in self.data.columns], index=self.data.columns)
+        self.assertEqual(expected.tolist(), [True, False] * 3)
+
+        serial = get_aug_dickey_fuller_results(self.data, max_workers=1, verbose=False)
+        parallel = get_aug_dickey_fuller_results(self.data, max_workers=2, columns_per_task=2,
+                                                 verbose=False)
+        pd.testing.assert_series_equal(serial, expected)
+        pd.testing.assert_series_equal(parallel, expected)
+
+    def test_few_columns_run_in_process(self):
+        with mock.patch('securityAnalysis.stationarity.ProcessPoolExecutor') as pool:
+            results = get_aug_dickey_fuller_results(self.data, verbose=False)
+        pool.assert_not_called()
+        self.assertEqual(results.tolist(), [True, False] * 3)
+
+    def test_quiet_descriptive_stats(self):
+        output = io.StringIO()
+        with redirect_stdout(output):
+            stats = get_descriptive_stats(self.data, max_workers=2, columns_per_task=4,
+                                          verbose=False)
+        self.assertEqual(output.getvalue(), "")
+        self.assertEqual(list(stats.index), list(self.data.columns))
+        self.assertEqual(stats['Aug Dickey-Fuller Test'].tolist(), [True, False] * 3)
+        self.assertEqual(stats['Size'].dtype, np.int64)
+        self.assertEqual(stats['Skewness reject H_0 at 5.0% sig level'].dtype, bool)
+
+    def test_batch_matches_adfuller(self):
+        # a linear series has constant differences, so its regressions are rank deficient
+        data = self.data.assign(stock_constant=1.,
+                                stock_linear=np.arange(len(self.data), dtype=float))
+        for regression, lags in [('c', 3), ('n', 0), ('ct', None), ('ctt', 1)]:
+            results = get_aug_dickey_fuller_batch(data, lags=lags, regression=regression,
+                                                  block_size=4, p_values=True)
+            for column in self.data.columns:
+                test_stat, p_value, used_lags, num_obs, critical_values = adfuller(
+                    self.data[column], maxlag=lags, regression=regression, autolag=None)
+                result = results.loc[column]
+                self.assertAlmostEqual(result['Test Statistic'], test_stat, places=8)
+                self.assertAlmostEqual(result['p-value'], p_value, places=8)
+                self.assertEqual(result['#Lags Used'], used_lags)
+                self.assertEqual(result['Number of Observations Used'], num_obs)
+                for level, critical_value in critical_values.items():
+                    self.assertEqual(result[f'Critical Value ({level})'], critical_value)
+                self.assertEqual(result['Stationary'],
+                                 test_stat < critical_values['5%'])
+            self.assertTrue(np.isnan(results.loc['stock_constant', 'Test Statistic']))
+            self.assertFalse(results.loc['stock_constant', 'Stationary'])
+            if lags == 0:  # Δy on y_{t-1} alone is still well posed
+                self.assertAlmostEqual(
+                    results.loc['stock_linear', 'Test Statistic'],
+                    adfuller(data['stock_linear'], maxlag=0, regression=regression,
+                             autolag=None)[0], places=8)
+            else:
+                self.assertTrue(np.isnan(results.loc['stock_linear', 'Test Statistic']))
+                self.assertFalse(results.loc['stock_linear', 'Stationary'])
+
+    def test_autolag_matches_adfuller(self):
+        # AR(3) differences, so the selected lags vary across the columns
+        rng = np.random.default_rng(1)
+        coefficients = rng.uniform(-0.5, 0.5, (3, 8))
+        diff = rng.normal(size=(300, 8))
+        for t in range(3, 300):
+            diff[t] += np.sum(coefficients * diff[t - 3:t][::-1], axis=0)
+        data = pd.DataFrame(50 + np.cumsum(diff, axis=0)).join(self.data)
+        linear = pd.Series(np.arange(len(data), dtype=float), index=data.index)
+
+        for regression, autolag in [('c', 'AIC'), ('ct', 'BIC'), ('n', 't-stat')]:
+            results = get_aug_dickey_fuller_autolag(data.assign(stock_linear=linear),
+                                                    regression=regression,
+                                                    autolag=autolag, block_size=5)
+            # the rank deficient regressions of the linear series do not fail the others
+            self.assertTrue(results.loc['stock_linear', ['Test Statistic',
+                                                         'Best Information Criterion']]
+                            .isna().all())
+            self.assertFalse(results.loc['stock_linear', 'Stationary'])
+            for column in data.columns:
+                test_stat, _, used_lags, num_obs, critical_values, best_criterion = adfuller(
+                    data[column], regression=regression, autolag=autolag)
+                result = results.loc[column]
+                self.assertEqual(result['#Lags Used'], used_lags)
+                self.assertEqual(result['Number of Observations Used'], num_obs)
+                self.assertAlmostEqual(result['Best Information Criterion'], best_criterion,
+                                       places=8)
+                self.assertAlmostEqual(result['Test Statistic'], test_stat, places=8)
+                self.assertEqual(result['Critical Value (5%)'], critical_values['5%'])
+            self.assertGreater(results['#Lags Used'].nunique(), 1)
+
+    def test_rolling_matches_adfuller(self):
+        data = self.data.copy()
+        data.iloc[:40, 1] = np.nan
+        for window, min_periods, regression in [(60, None, 'c'), (None, 30, 'ct')]:
+            test_stats, is_stationary = get_rolling_aug_dickey_fuller(
+                data, window=window, lags=2, regression=regression, min_periods=min_periods,
+                block_size=4)
+            self.assertTrue(test_stats.iloc[:(window or min_periods) - 1].isna().all().all())
+            for date in [59, 60, 150, 299]:
+                start = 0 if window is None else date - window + 1
+                for column in data.columns:
+                    history = data[column].iloc[start:date + 1].dropna()
+                    if len(history) < (min_periods or window):
+                        self.assertTrue(np.isnan(test_stats.loc[date, column]))
+                        continue
+                    test_stat, _, _, _, critical_values = adfuller(
+                        history, maxlag=2, regression=regression, autolag=None)
+                    self.assertAlmostEqual(test_stats.loc[date, column], test_stat, places=8)
+                    self.assertEqual(is_stationary.loc[date, column],
+                                     test_stat < critical_values['5%'])
+
+        series_stats, _ = get_rolling_aug_dickey_fuller(self.data['stock_0'], window=60)
+        pd.testing.assert_series_equal(
+            series_stats, get_rolling_aug_dickey_fuller(self.data, window=60)[0]['stock_0'])
+
+    def test_moments(self):
+        data = self.data.assign(stock_constant=1.)
+        expected = pd.DataFrame({'Size': data.count(),
+                                 'Mean': data.mean(),
+                                 'Std Dev': data.std(ddof=0),
+                                 'Skewness': skew(data),
+                                 'Excess Kurtosis': kurtosis(data),
+                                 'Min': data.min(),
+                                 'Max': data.max()})
+        pd.testing.assert_frame_equal(calculate_moments(data), expected)
+        pd.testing.assert_frame_equal(calculate_moments(data, chunk_size=7), expected)
+
+        data.iloc[::4, 0] = np.nan
+        data['stock_empty'] = np.nan
+        moments = calculate_moments(data.iloc[start:start + 50] for start in range(0, 300, 50))
+        history = data['stock_0'].dropna()
+        self.assertEqual(moments.loc['stock_0', 'Size'], 225)
+        self.assertAlmostEqual(moments.loc['stock_0', 'Skewness'], skew(history))
+        self.assertAlmostEqual(moments.loc['stock_0', 'Excess Kurtosis'], kurtosis(history))
+        self.assertAlmostEqual(moments.loc['stock_0', 'Std Dev'], history.std(ddof=0))
+        self.assertEqual(moments.loc['stock_empty', 'Size'], 0)
+        self.assertTrue(moments.loc['stock_empty'].drop('Size').isna().all())
+
+    def test_moments_near_constant_and_empty(self):
+        # a spread of a few ulps around the mean is rounding noise, as in scipy
+        data = pd.DataFrame({'near_constant': 1e6 * (1 + np.tile([0., 1e-15, 0., 2e-15], 25)),
+                             'stock_0': self.data['stock_0'].iloc[:100].to_numpy()})
+        moments = calculate_moments(data)
+        self.assertTrue(moments.loc['near_constant', ['Skewness', 'Excess Kurtosis']].isna().all())
+        self.assertFalse(moments.loc['stock_0', ['Skewness', 'Excess Kurtosis']].isna().any())
+
+        with self.assertRaises(ValueError):
+            calculate_moments(iter([]))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,4 +1,6 @@
 # Created on 20 Sep 2020
+import os
+import tempfile
 import unittest
 
 import numpy as np
@@ -6,7 +8,10 @@ import pandas as pd
 
 from securityAnalysis.utils_finance import (
     calculate_relative_return_from_array, calculate_return_df,
-    calculate_annualised_return_df
+    calculate_annualised_return_df, calculate_return_from_chunks, calculate_return_array,
+    calculate_performance_metrics, calculate_annual_volatility_df, return_info_ratio,
+    return_sharpe_ratio, calculate_rolling_metrics, read_bloomberg_export,
+    read_bloomberg_exports
 )
 
 np.random.seed(1)  # set the random seed so the unit tests use synthetic data
@@ -90,12 +95,122 @@ class TestFinanceUtils(unittest.TestCase):
             )
         )
 
+    def test_calculate_return_from_chunks(self):
+        chunks = [self.data.iloc[:2], self.data.iloc[2:3], self.data.iloc[3:]]
+        pd.testing.assert_frame_equal(
+            pd.concat(calculate_return_from_chunks(chunks, is_log_return=True)),
+            calculate_return_df(data=self.data, is_log_return=True)
+        )
+
+    def test_calculate_return_array__matches_shift(self):
+        prices = pd.DataFrame(np.random.random_sample((50, 4)) + 1)
+        prices.iloc[[3, 10, 11], [0, 2, 2]] = np.nan
+        expected = {'relative': prices / prices.shift(1) - 1,
+                    'log': np.log(prices / prices.shift(1)),
+                    'absolute': prices - prices.shift(1)}
+        for return_type, frame in expected.items():
+            np.testing.assert_array_equal(
+                calculate_return_array(prices.values, return_type=return_type),
+                frame.values[1:])
+
+    def test_calculate_return_array__options(self):
+        prices = np.random.random_sample((20, 3)) + 1
+        prices[5, 1] = np.nan
+        np.testing.assert_allclose(
+            calculate_return_array(prices, fill_gaps=True),
+            pd.DataFrame(prices).pct_change().values[1:])
+
+        out = np.empty((19, 3), dtype=np.float32)
+        result = calculate_return_array(prices, return_type='log', out=out)
+        self.assertIs(result, out)
+        np.testing.assert_allclose(out, np.log(prices[1:] / prices[:-1]), rtol=1e-6)
+        returns = calculate_return_df(self.data, is_relative_return=True, dtype=np.float32)
+        self.assertTrue((returns.dtypes == np.float32).all())
+
+        with self.assertRaises(ValueError):
+            calculate_return_df(self.data)
+
     def test_calculate_annualised_return_df(self):
         pd.testing.assert_series_equal(
             calculate_annualised_return_df(data=self.data),
             pd.Series({'stock_a': -0.34537152900184453, 'stock_b': 1.8952787319995616})
         )
 
+    def test_calculate_performance_metrics(self):
+        metrics = calculate_performance_metrics(data=self.data, risk_free=0.01)
+        pd.testing.assert_series_equal(metrics['annualised_return'],
+                                       calculate_annualised_return_df(data=self.data),
+                                       check_names=False)
+        pd.testing.assert_series_equal(metrics['annualised_volatility'],
+                                       calculate_annual_volatility_df(data=self.data),
+                                       check_names=False)
+        pd.testing.assert_series_equal(metrics['sharpe_ratio'],
+                                       return_sharpe_ratio(data=self.data, risk_free=0.01),
+                                       check_names=False)
+        pd.testing.assert_series_equal(metrics['info_ratio'], return_info_ratio(self.data),
+                                       check_names=False)
+
+        daily_rtn = self.data.pct_change().iloc[1:]
+        downside_dev = np.sqrt((np.minimum(daily_rtn, 0) ** 2).mean() * 252)
+        pd.testing.assert_series_equal(metrics['sortino_ratio'],
+                                       (daily_rtn.mean() * 252 - 0.01) / downside_dev,
+                                       check_names=False)
+
+        relative = calculate_performance_metrics(data=self.data,
+                                                 benchmark=self.data['stock_b'])
+        self.assertTrue(np.isnan(relative.loc['stock_b', 'info_ratio']))
+        self.assertTrue(np.isfinite(relative.loc['stock_a', 'info_ratio']))
+
+    def test_calculate_rolling_metrics(self):
+        prices = pd.DataFrame(100 + np.random.randn(300, 3).cumsum(axis=0),
+                              index=pd.bdate_range('2020-01-01', periods=300),
+                              columns=['a', 'b', 'c'])
+        prices.iloc[100, 1] = np.nan
+        rolling = calculate_rolling_metrics(data=prices, windows=(20, 63), risk_free=0.01)
+        self.assertEqual(rolling.shape, (299, 2 * 4 * 3))
+
+        daily_rtn = prices / prices.shift(1) - 1
+        for window in (20, 63):
+            expected_vol = daily_rtn.rolling(window).std(ddof=0).iloc[1:] * np.sqrt(252)
+            expected_rtn = daily_rtn.rolling(window).mean().iloc[1:] * 252
+            pd.testing.assert_frame_equal(rolling[window]['annualised_volatility'],
+                                          expected_vol, check_names=False, check_freq=False)
+            pd.testing.assert_frame_equal(rolling[window]['annualised_return'],
+                                          expected_rtn, check_names=False, check_freq=False)
+
+        # the last window agrees with the full sample metrics of that window
+        last = calculate_performance_metrics(data=prices.iloc[-64:], risk_free=0.01)
+        for metric in ['sharpe_ratio', 'sortino_ratio']:
+            np.testing.assert_allclose(rolling[63][metric].iloc[-1], last[metric])
+
+    def test_read_bloomberg_export(self):
+        export = ("TSLA US Equity,,,AAPL US Equity,\n"
+                  "Date,PX_LAST,,Date,PX_LAST\n"
+                  "03/06/2019,325.7,,03/06/2019,857.0\n"
+                  "43620,323.3,,04/06/2019,861.0\n"
+                  "05/06/2019,325.5,,05/06/2019,#N/A N/A\n"
+                  "06/06/2019,#N/A Invalid Security,,06/06/2019,862.5\n")
+        expected = pd.DataFrame(
+            {'product': ['TSLA US Equity'] * 3 + ['AAPL US Equity'] * 3,
+             'date': pd.to_datetime(['2019-06-03', '2019-06-04', '2019-06-05',
+                                     '2019-06-03', '2019-06-04', '2019-06-06']),
+             'price': [325.7, 323.3, 325.5, 857.0, 861.0, 862.5]})
+
+        with tempfile.TemporaryDirectory() as directory:
+            for name in ['a.csv', 'b.csv']:
+                with open(os.path.join(directory, name), 'w') as fp:
+                    fp.write(export)
+            pd.testing.assert_frame_equal(
+                read_bloomberg_export(os.path.join(directory, 'a.csv')), expected)
+            pd.testing.assert_frame_equal(
+                read_bloomberg_exports(directory, max_workers=2),
+                pd.concat([expected, expected], ignore_index=True))
+
+            with open(os.path.join(directory, 'bad.csv'), 'w') as fp:
+                fp.write("TSLA US Equity,\nDate,PX_OPEN\n03/06/2019,325.7\n")
+            with self.assertRaises(TypeError):
+                read_bloomberg_export(os.path.join(directory, 'bad.csv'))
+
 
 if __name__ == '__main__':
     unittest.main()
@@ -2,6 +2,11 @@
 Created: 17 June 2020
 Utils specific for financial security data
 """
+import glob
+import os
+from concurrent.futures import ProcessPoolExecutor
+from typing import Iterable, Iterator, List
+
 import numpy as np
 import pandas as pd
 
@@ -9,43 +14,153 @@ from decorators import deprecated
 from utils_date import excel_date_to_np
 
 
+RETURN_TYPES = ("relative", "log", "absolute")
+
+
 # array methods
 def calculate_relative_return_from_array(a: np.array) -> np.array:
     """Calculate relative return of an array"""
     return a[1:] / a[:-1] - 1
 
 
+def forward_fill_array(a: np.ndarray) -> np.ndarray:
+    """Carry the last non-NaN value of each column forward over NaNs (leading NaNs are kept)"""
+    a = np.asarray(a)
+    valid = ~np.isnan(a)
+    if valid.all():
+        return a
+    shape = (-1,) + (1,) * (a.ndim - 1)
+    last_valid = np.where(valid, np.arange(a.shape[0]).reshape(shape), 0)
+    np.maximum.accumulate(last_valid, axis=0, out=last_valid)
+    return np.take_along_axis(a, last_valid, axis=0)
+
+
+def calculate_return_array(a: np.ndarray,
+                           return_type: str = "relative",
+                           dtype: np.dtype = None,
+                           out: np.ndarray = None,
+                           fill_gaps: bool = False) -> np.ndarray:
+    """Calculate returns down the rows of a 1-D or 2-D array of prices (rows are dates,
+    columns securities) in one vectorized pass
+
+    Parameters
+        a: Array of prices
+        return_type: One of "relative" (p_t / p_t-1 - 1), "log" (log(p_t / p_t-1)) or
+            "absolute" (p_t - p_t-1)
+        dtype: dtype of the returns, e.g. np.float32 to halve the memory of a large panel
+            (computed in the precision of the prices, then stored), default that of a
+        out: Optional preallocated array of shape (len(a) - 1, ...) written in place
+        fill_gaps: If True, a NaN price is replaced by the last valid price, so a gap does
+            not turn the return after it into NaN (as pd.DataFrame.pct_change). Otherwise a
+            NaN price gives NaN returns on either side of it
+
+    Returns
+        np.ndarray: returns, one row shorter than a
+    """
+    if return_type not in RETURN_TYPES:
+        raise ValueError(f"not a valid return type: {return_type}, choose from {RETURN_TYPES}")
+
+    a = np.asarray(a)
+    if not np.issubdtype(a.dtype, np.floating):
+        a = a.astype(np.float64)
+    if fill_gaps:
+        a = forward_fill_array(a)
+
+    shape = (max(a.shape[0] - 1, 0),) + a.shape[1:]
+    if out is None:
+        out = np.empty(shape, dtype=a.dtype if dtype is None else dtype)
+    else:
+        assert out.shape == shape, f"out must have shape {shape}, not {out.shape}"
+
+    current, previous = a[1:], a[:-1]
+    with np.errstate(divide="ignore", invalid="ignore"):
+        if return_type == "absolute":
+            np.subtract(current, previous, out=out)
+        else:
+            # the ratio is kept in the precision of the prices, only the result is downcast
+            ratio = np.divide(current, previous, out=out if out.dtype == a.dtype else None)
+            if return_type == "relative":
+                np.subtract(ratio, 1, out=out)
+            else:
+                np.log(ratio, out=out)
+    return out
+
+
 # dataframe methods
+def select_numeric_columns(data: pd.DataFrame) -> pd.DataFrame:
+    """Drop string/object columns; a frame without any is returned as is (select_dtypes
+    would copy it, e.g. a panel read from dataload.price_matrix over a memory map)"""
+    if any(pd.api.types.is_object_dtype(dtype) or pd.api.types.is_string_dtype(dtype)
+           for dtype in data.dtypes):
+        return data.select_dtypes(exclude=['string', 'object'])
+    return data
+
+
 def calculate_return_df(data: pd.DataFrame,
                         is_relative_return: bool = False,
                         is_log_return: bool = False,
-                        is_absolute_return: bool = False):
-    """Method to calculate different types of return from dataframe
+                        is_absolute_return: bool = False,
+                        dtype: np.dtype = None,
+                        out: np.ndarray = None) -> pd.DataFrame:
+    """Method to calculate different types of return from dataframe, computed over the
+    whole array at once with calculate_return_array
 
     Parameters
         df: Dataframe containing columns as securities, with all columns as float
         is_relative_return
         is_log_return
         is_absolute_return
+        dtype: Optional dtype of the returns, e.g. np.float32
+        out: Optional preallocated array of shape (len(data) - 1, num columns) to write into
 
     Returns
         pd.DataFrame:  a dataframe with returns shifted as instructed
     """
-    data = data.select_dtypes(exclude=['string', 'object'])
+    data = select_numeric_columns(data)
 
     if is_log_return:
-        print("Calculating log returns...")
-        return_df = data.apply(lambda x: np.log(x / x.shift(1)))[1:]
+        return_type = "log"
     elif is_relative_return:
-        print("Calculating relative returns...")
-        return_df = data.apply(lambda x: (x / x.shift(1)) - 1)[1:]
+        return_type = "relative"
     elif is_absolute_return:
-        print("Calculating absolute returns...")
-        return_df = data.apply(lambda x: x - x.shift(1))[1:]
+        return_type = "absolute"
     else:
-        print("not a valid return type")
+        raise ValueError("not a valid return type")
+
+    returns = calculate_return_array(data.to_numpy(), return_type=return_type, dtype=dtype,
+                                     out=out)
+    return pd.DataFrame(returns, index=data.index[1:], columns=data.columns, copy=False)
+
+
+def calculate_return_from_chunks(chunks: Iterable[pd.DataFrame],
+                                 is_relative_return: bool = False,
+                                 is_log_return: bool = False,
+                                 is_absolute_return: bool = False) -> Iterator[pd.DataFrame]:
+    """Calculate returns over a stream of consecutive price chunks (e.g. from
+    dataload.database.db_arctic_iterator), carrying the last price of each chunk into the
+    next, so the concatenated output equals calculate_return_df on the full history
+
+    Parameters
+        chunks: Iterable of dataframes with the same numeric columns, in index order
+        is_relative_return
+        is_log_return
+        is_absolute_return
 
-    return return_df
+    Returns
+        Iterator[pd.DataFrame]: returns for each chunk
+    """
+    previous = None
+    for chunk in chunks:
+        if chunk.empty:
+            continue
+        data = chunk if previous is None else pd.concat([previous, chunk])
+        previous = chunk.iloc[-1:]
+        if len(data) < 2:
+            continue
+        yield calculate_return_df(data=data,
+                                  is_relative_return=is_relative_return,
+                                  is_log_return=is_log_return,
+                                  is_absolute_return=is_absolute_return)
 
 
 def calculate_annualised_return_df(data: pd.DataFrame) -> pd.Series:
@@ -139,7 +254,139 @@ def return_sortino_ratio(data: pd.DataFrame,
     return sortino
 
 
-@deprecated
+PERFORMANCE_METRICS = ["annualised_return", "annualised_volatility", "sharpe_ratio",
+                       "sortino_ratio", "info_ratio"]
+
+
+def calculate_performance_metrics(data: pd.DataFrame,
+                                  risk_free: float = 0,
+                                  target_return: float = 0,
+                                  benchmark: pd.Series = None,
+                                  annualisation_factor: int = 252,
+                                  fill_gaps: bool = False) -> pd.DataFrame:
+    """
+    Annualised return, volatility, Sharpe, Sortino and information ratio of every column,
+    from a single computation of the period returns (instead of one per metric, as with
+    return_sharpe_ratio, return_sortino_ratio and return_info_ratio). NaN returns are skipped.
+
+    Parameters:
+        data: Input dataframe with numeric columns as the security prices, and the date
+            being the index
+        risk_free: Risk free rate, annualised, as a decimal
+        target_return: Target return per period, below which returns count as downside
+        benchmark: Optional benchmark prices (same index as data); the information ratio is
+            then measured on the returns in excess of the benchmark, otherwise it is the
+            annualised return over the annualised volatility (as return_info_ratio)
+        annualisation_factor: Number of periods in a year, 252 for daily data
+        fill_gaps: If True carry the last valid price over NaN prices, see
+            calculate_return_array
+
+    Returns:
+        pd.DataFrame: one row per security, columns as PERFORMANCE_METRICS. The Sortino
+        ratio is annualised like the Sharpe ratio: (annualised return - risk_free) over the
+        target downside deviation times sqrt(annualisation_factor)
+    """
+    data = select_numeric_columns(data)
+    returns = calculate_return_array(data.to_numpy(dtype=np.float64), return_type="relative",
+                                     fill_gaps=fill_gaps)
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        valid = ~np.isnan(returns)
+        count = valid.sum(axis=0)
+        mean = np.nansum(returns, axis=0) / count
+        variance = np.nansum(np.square(returns - mean), axis=0) / count
+        downside = np.minimum(returns - target_return, 0)
+        downside_dev = np.sqrt(np.nansum(np.square(downside), axis=0) / count)
+
+        ann_return = mean * annualisation_factor
+        ann_vol = np.sqrt(variance * annualisation_factor)
+        metrics = {"annualised_return": ann_return,
+                   "annualised_volatility": ann_vol,
+                   "sharpe_ratio": (ann_return - risk_free) / ann_vol,
+                   "sortino_ratio": (ann_return - risk_free) /
+                   (downside_dev * np.sqrt(annualisation_factor))}
+
+        if benchmark is None:
+            metrics["info_ratio"] = ann_return / ann_vol
+        else:
+            benchmark_returns = calculate_return_array(
+                benchmark.reindex(data.index).to_numpy(dtype=np.float64),
+                return_type="relative", fill_gaps=fill_gaps)
+            active = returns - benchmark_returns[:, None]
+            metrics["info_ratio"] = np.sqrt(annualisation_factor) * \
+                np.nanmean(active, axis=0) / np.nanstd(active, axis=0)
+
+    return pd.DataFrame(metrics, index=data.columns, columns=PERFORMANCE_METRICS)
+
+
+def calculate_rolling_metrics(data: pd.DataFrame,
+                              windows: Iterable[int] = (63, 252),
+                              risk_free: float = 0,
+                              target_return: float = 0,
+                              annualisation_factor: int = 252,
+                              fill_gaps: bool = False) -> pd.DataFrame:
+    """
+    Rolling annualised return, volatility, Sharpe and Sortino ratio (as in
+    calculate_performance_metrics) of every column, for several window lengths at once.
+    Cumulative sums of the returns, squared returns and squared downside returns are built
+    once over the whole panel, so every window costs O(n) rather than recomputing each window.
+
+    Parameters:
+        data: Input dataframe with numeric columns as the security prices, and the date
+            being the index
+        windows: Window lengths, in number of returns
+        risk_free: Risk free rate, annualised, as a decimal
+        target_return: Target return per period, below which returns count as downside
+        annualisation_factor: Number of periods in a year, 252 for daily data
+        fill_gaps: If True carry the last valid price over NaN prices, see
+            calculate_return_array
+
+    Returns:
+        pd.DataFrame: indexed by the return dates, with columns (window, metric, security).
+        A window is NaN until it holds window non-NaN returns (as pd.DataFrame.rolling)
+    """
+    data = select_numeric_columns(data)
+    returns = calculate_return_array(data.to_numpy(dtype=np.float64), return_type="relative",
+                                     fill_gaps=fill_gaps)
+    valid = ~np.isnan(returns)
+    # the variance is shift invariant; centring first keeps the sums of squares small
+    centre = np.nansum(returns, axis=0) / np.maximum(valid.sum(axis=0), 1)
+    with np.errstate(invalid="ignore"):
+        centred = np.where(valid, returns - centre, 0.)
+        downside = np.where(valid, np.minimum(returns - target_return, 0), 0.)
+
+    def cumulative(a: np.ndarray) -> np.ndarray:
+        out = np.zeros((a.shape[0] + 1, a.shape[1]))
+        np.cumsum(a, axis=0, out=out[1:])
+        return out
+
+    sums = [cumulative(a) for a in (valid, centred, np.square(centred), np.square(downside))]
+
+    frames = {}
+    for window in windows:
+        assert window > 0, "windows must be positive integers"
+        count, total, total_sq, downside_sq = (a[window:] - a[:-window] for a in sums)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            full = count == window
+            mean = np.where(full, total / window, np.nan)
+            ann_return = (mean + centre) * annualisation_factor
+            ann_vol = np.sqrt(np.maximum(total_sq / window - np.square(mean), 0) *
+                              annualisation_factor)
+            downside_dev = np.sqrt(downside_sq / window * annualisation_factor)
+            metrics = {"annualised_return": ann_return,
+                       "annualised_volatility": ann_vol,
+                       "sharpe_ratio": (ann_return - risk_free) / ann_vol,
+                       "sortino_ratio": (ann_return - risk_free) / downside_dev}
+        for metric, values in metrics.items():
+            padded = np.full(returns.shape, np.nan)
+            padded[window - 1:] = values
+            frames[(window, metric)] = pd.DataFrame(padded, index=data.index[1:],
+                                                    columns=data.columns)
+
+    return pd.concat(frames, axis=1, names=["window", "metric", "security"])
+
+
+@deprecated(print_msg="Use read_bloomberg_export")
 def clean_bloomberg_security_data(input_file):
     """
     Params:
@@ -167,7 +414,7 @@ def clean_bloomberg_security_data(input_file):
     return data
 
 
-@deprecated
+@deprecated(print_msg="Use read_bloomberg_export")
 def return_melted_df(input_file):
     """
     Read csv file with Bloomberg data (in format below with or without blank columns) and create
@@ -222,6 +469,85 @@ def return_melted_df(input_file):
         raise TypeError("The dataframe is not in the format expected with columns: [Date, PX_LAST]")
 
 
+def _parse_bloomberg_dates(dates: np.ndarray, date_format: str) -> np.ndarray:
+    """Parse date strings, repairing the entries exported as Excel serial numbers"""
+    serials = pd.to_numeric(pd.Series(dates), errors='coerce').to_numpy()
+    is_serial = ~np.isnan(serials)
+    parsed = np.empty(len(dates), dtype='datetime64[ns]')
+    parsed[is_serial] = excel_date_to_np(serials[is_serial].astype('int64'))
+    parsed[~is_serial] = pd.to_datetime(dates[~is_serial], format=date_format).to_numpy()
+    return parsed
+
+
+def read_bloomberg_export(input_file: str, date_format: str = "%d/%m/%Y") -> pd.DataFrame:
+    """
+    Read a Bloomberg export of Date/PX_LAST column pairs (with or without blank columns in
+    between) into a long dataframe, in one vectorized pass over all the securities.
+    Dates exported as Excel serial numbers are repaired with excel_date_to_np, and
+    Bloomberg error strings in place of a price (e.g. "#N/A Invalid Security") are skipped
+    like blank cells.
+
+    bb ticker | (empty)   | bb ticker | (empty)
+    Date      | PX_LAST   | Date      | PX_LAST
+    dd/mm/yyyy| float     | dd/mm/yyyy| float
+
+    Parameters:
+        input_file: Path of the csv export
+        date_format: Format of the dates that are not Excel serials
+
+    Returns:
+        pd.DataFrame: columns [product, date, price], one row per security and date
+    """
+    raw = pd.read_csv(input_file, header=None, dtype=str)
+    raw = raw.dropna(axis=1, how='all').to_numpy()
+
+    headers = raw[1].reshape(-1, 2) if raw.shape[1] % 2 == 0 else None
+    if headers is None or not (headers == ["Date", "PX_LAST"]).all():
+        raise TypeError(f"{input_file} is not in the format expected with column pairs: "
+                        f"[Date, PX_LAST]")
+
+    body = raw[2:]
+    products = np.repeat(raw[0, 0::2], body.shape[0])
+    dates = body[:, 0::2].ravel(order='F')
+    prices = pd.to_numeric(body[:, 1::2].ravel(order='F'), errors='coerce')
+
+    is_filled = ~(pd.isna(dates) | np.isnan(prices))
+    return pd.DataFrame({'product': products[is_filled],
+                         'date': _parse_bloomberg_dates(dates[is_filled], date_format),
+                         'price': prices[is_filled]})
+
+
+def read_bloomberg_exports(directory: str,
+                           pattern: str = "*.csv",
+                           max_workers: int = None,
+                           date_format: str = "%d/%m/%Y") -> pd.DataFrame:
+    """
+    Read every Bloomberg export in a directory (see read_bloomberg_export), the files
+    parsed in parallel across processes, and combined with a single concat
+
+    Parameters:
+        directory: Folder containing the exports
+        pattern: Glob pattern of the export files in the folder
+        max_workers: Number of processes, default None uses the number of CPUs
+        date_format: Format of the dates that are not Excel serials
+
+    Returns:
+        pd.DataFrame: columns [product, date, price], in file (sorted by name) order
+    """
+    files: List[str] = sorted(glob.glob(os.path.join(directory, pattern)))
+    if not files:
+        return pd.DataFrame({'product': pd.Series(dtype=object),
+                             'date': pd.Series(dtype='datetime64[ns]'),
+                             'price': pd.Series(dtype=float)})
+    if max_workers == 1 or len(files) == 1:
+        frames = [read_bloomberg_export(file, date_format=date_format) for file in files]
+    else:
+        with ProcessPoolExecutor(max_workers=max_workers) as pool:
+            frames = list(pool.map(read_bloomberg_export, files,
+                                   [date_format] * len(files)))
+    return pd.concat(frames, ignore_index=True)
+
+
 if __name__ == '__main__':
     # get real stock price data using yfinance (yahoo finance API)
     # import yfinance